@@ -0,0 +1,364 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from app.core.events import EVENT_ERROR, EVENT_PROGRESS
+from app.core.gmail_monitor import GmailMonitor
+from app.core.job_store import JobStore, job_from_email, job_from_posting
+from app.core.ziprecruiter_client import ZipRecruiterClient
+from app.utils.http import HttpTransport
+from app.utils.rate_limit import TokenBucket
+
+
+class AccountState:
+    """Scheduling state and status of one monitored account."""
+
+    def __init__(self, name, kind, client, interval, quota_per_minute):
+        """
+        Initialize the account state.
+
+        Args:
+            name: Unique account name
+            kind: 'gmail' or 'ziprecruiter'
+            client: GmailMonitor or ZipRecruiterClient for the account
+            interval: Seconds between scans
+            quota_per_minute: Work units the account may run per minute (0 = unlimited)
+        """
+        self.name = name
+        self.kind = kind
+        self.client = client
+        self.interval = interval
+        self.quota = TokenBucket(quota_per_minute / 60.0 if quota_per_minute else 0)
+        self.pending = deque()
+        self.in_flight = 0
+        self.next_run = 0.0
+        self.status = {
+            'state': 'idle',
+            'last_scan': None,
+            'processed': 0,
+            'jobs_found': 0,
+            'errors': 0,
+            'last_error': None
+        }
+
+
+class AccountManager:
+    """
+    Monitors several Gmail and ZipRecruiter accounts on shared resources.
+
+    All accounts share one worker pool, one pooled HTTP transport per host
+    and one JobStore. Each scan is split into small work units (a batch of messages
+    or one search query) that are queued per account. A single scheduler
+    thread hands units to the pool round-robin, with at most one unit in
+    flight per account, so a huge mailbox cannot starve the others. Per-account
+    quotas limit how many units an account may run per minute.
+    """
+
+    def __init__(self, config, logger, store=None):
+        """
+        Initialize the account manager.
+
+        Args:
+            config: Application configuration
+            logger: Application logger
+            store: Shared JobStore (created from the 'storage' section if omitted)
+        """
+        self.config = config
+        self.logger = logger
+        self.event_callback = None
+
+        pool_config = config.get('account_pool', {})
+        self.max_workers = pool_config.get('worker_threads', 4)
+
+        if store is None:
+            storage_config = config.get('storage', {})
+            store = JobStore(storage_config.get('database', 'app/resources/job_assistant.db'))
+        self.store = store
+
+        self.accounts = OrderedDict()
+        self.transports = {}
+        self.executor = None
+        self.scheduler_thread = None
+        self.stop_event = threading.Event()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._next_index = 0
+
+        for account_config in config.get('accounts', []):
+            self.add_account(account_config)
+
+    def transport_for(self, url, section=None):
+        """
+        Return the shared HTTP transport for the host of a URL.
+
+        Args:
+            url: Any URL on the host
+            section: Configuration section with timeout and retry settings,
+                used when the transport is created
+
+        Returns:
+            HttpTransport: Transport whose connection pool is sized for the worker pool
+        """
+        host = urlparse(url).netloc
+        transport = self.transports.get(host)
+        if transport is None:
+            section = section or {}
+            pool_size = self.max_workers
+            auto_apply = section.get('auto_apply') or {}
+            if auto_apply.get('enabled'):
+                # Each account's application workers may run next to the worker pool
+                pool_size += auto_apply.get('workers', 8)
+            transport = HttpTransport.from_config(section, self.logger, pool_size=pool_size)
+            self.transports[host] = transport
+        return transport
+
+    def session_for(self, url):
+        """
+        Return the shared HTTP session for the host of a URL.
+
+        Args:
+            url: Any URL on the host
+
+        Returns:
+            requests.Session: Session of the host's transport (see transport_for)
+        """
+        return self.transport_for(url).session
+
+    def transport_stats(self):
+        """
+        Return connection reuse and retry counters per host.
+
+        Returns:
+            dict: Host -> HttpTransport.stats()
+        """
+        return {host: transport.stats() for host, transport in self.transports.items()}
+
+    def add_account(self, account_config):
+        """
+        Register an account.
+
+        Account settings override the matching top-level section ('gmail' or
+        'ziprecruiter'), so only credentials and differences need to be given.
+
+        Args:
+            account_config: Dict with 'type', 'name', credentials and optional overrides
+
+        Returns:
+            AccountState: The registered account
+        """
+        kind = account_config.get('type', 'gmail')
+        name = account_config.get('name') or f"{kind}:{account_config.get('email')}"
+        if name in self.accounts:
+            raise ValueError(f"Duplicate account name: {name}")
+
+        section = dict(self.config.get(kind, {}))
+        section.update({k: v for k, v in account_config.items() if k not in ('type', 'name')})
+        # Every account resumes from its own checkpoint
+        section['checkpoint_name'] = account_config.get('checkpoint_name', name)
+
+        if kind == 'gmail':
+            client = GmailMonitor({'gmail': section}, self.logger)
+            interval = section.get('scan_interval', 300)
+        elif kind == 'ziprecruiter':
+            client = ZipRecruiterClient({'ziprecruiter': section}, self.logger)
+            client.transport = self.transport_for(client.api_base_url, section)
+            interval = section.get('search_interval', 3600)
+        else:
+            raise ValueError(f"Unknown account type: {kind}")
+
+        client.event_callback = self._make_event_forwarder(name)
+        state = AccountState(name, kind, client, interval, section.get('quota_per_minute', 0))
+        if kind == 'ziprecruiter':
+            # A sweep finished before a restart is not repeated early
+            state.next_run = time.monotonic() + client.seconds_until_next_sweep(interval)
+        with self._cond:
+            self.accounts[name] = state
+            self._cond.notify()
+        return state
+
+    def _make_event_forwarder(self, name):
+        """Return an event callback that tags client events with the account name."""
+        def forward(kind, source, **data):
+            if self.event_callback is not None:
+                self.event_callback(kind, f"{source}:{name}", **data)
+        return forward
+
+    def start(self):
+        """Start the scheduler and the shared worker pool."""
+        if self.scheduler_thread and self.scheduler_thread.is_alive():
+            self.logger.warning("Account manager is already running")
+            return
+
+        self.stop_event.clear()
+        for state in self.accounts.values():
+            state.client.stop_event.clear()
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='account-worker')
+        self.scheduler_thread = threading.Thread(target=self._schedule_loop, name='account-scheduler', daemon=True)
+        self.scheduler_thread.start()
+        self.logger.info(f"Started account manager with {len(self.accounts)} accounts and {self.max_workers} workers")
+
+    def stop(self, timeout=None):
+        """
+        Stop scheduling, drain running work units and close connections.
+
+        Running units get until the deadline to finish; whatever they have
+        not finished by then is left in the accounts' checkpoints. Queued
+        units are dropped and planned again from the checkpoints on the
+        next start.
+
+        Args:
+            timeout: Seconds allowed for draining (defaults to ``account_pool.shutdown_timeout``)
+        """
+        if not self.scheduler_thread or not self.scheduler_thread.is_alive():
+            self.logger.warning("Account manager is not running")
+            return
+
+        if timeout is None:
+            timeout = self.config.get('account_pool', {}).get('shutdown_timeout', 10.0)
+        for state in self.accounts.values():
+            state.client.begin_shutdown(timeout)
+        self.stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        self.scheduler_thread.join(timeout=5.0)
+
+        # At most max_workers units are ever submitted, so this returns promptly
+        self.executor.shutdown(wait=True)
+        for state in self.accounts.values():
+            state.pending.clear()
+            if state.kind == 'gmail':
+                state.client._disconnect()
+                state.client.message_parser.shutdown()
+        for host, transport in self.transports.items():
+            stats = transport.stats()
+            self.logger.info(f"HTTP {host}: {stats['requests']} requests over {stats['connections']} connections, "
+                             f"{stats['retries']} retries")
+            transport.close()
+        self.logger.info("Stopped account manager")
+
+    def get_status(self):
+        """
+        Return a snapshot of every account's status.
+
+        Returns:
+            dict: Account name -> status dict
+        """
+        with self._cond:
+            return {
+                name: dict(state.status, pending_tasks=len(state.pending), in_flight=state.in_flight)
+                for name, state in self.accounts.items()
+            }
+
+    def _schedule_loop(self):
+        """Plan due scans and dispatch work units until stopped."""
+        with self._cond:
+            while not self.stop_event.is_set():
+                now = time.monotonic()
+                self._plan_due_accounts(now)
+                self._dispatch()
+
+                # Wake up for the next due scan, or soon if work is waiting on a quota
+                next_run = min((s.next_run for s in self.accounts.values()), default=now + 1.0)
+                self._cond.wait(min(1.0, max(0.05, next_run - now)))
+
+    def _plan_due_accounts(self, now):
+        """Queue the first work unit of every account whose scan is due."""
+        for state in self.accounts.values():
+            if state.pending or state.in_flight or state.next_run > now:
+                continue
+            state.next_run = now + state.interval
+            state.status['state'] = 'scanning'
+            if state.kind == 'gmail':
+                state.pending.append(lambda state=state: self._plan_gmail_scan(state))
+            else:
+                client = state.client
+                # Each scan is one sweep with its own retry budget
+                client.retry_budget.reset()
+                for keyword, location in client.sweep_queries():
+                    state.pending.append(
+                        lambda state=state, k=keyword, l=location: self._run_search_query(state, k, l)
+                    )
+
+    def _dispatch(self):
+        """Submit work units round-robin across accounts until the pool is full."""
+        names = list(self.accounts)
+        count = len(names)
+        while self._in_flight < self.max_workers:
+            for offset in range(count):
+                index = (self._next_index + offset) % count
+                state = self.accounts[names[index]]
+                if state.pending and not state.in_flight and state.quota.try_acquire():
+                    task = state.pending.popleft()
+                    state.in_flight += 1
+                    self._in_flight += 1
+                    self.executor.submit(self._run_task, state, task)
+                    self._next_index = (index + 1) % count
+                    break
+            else:
+                return
+
+    def _run_task(self, state, task):
+        """Run one work unit and record its outcome."""
+        try:
+            task()
+        except Exception as e:
+            self.logger.exception(f"Error in account {state.name}: {e}")
+            with self._cond:
+                state.status['errors'] += 1
+                state.status['last_error'] = str(e)
+                # Abandon the rest of this scan; the next one starts from the last processed message
+                state.pending.clear()
+            if state.kind == 'gmail':
+                state.client._disconnect()
+            if self.event_callback is not None:
+                self.event_callback(EVENT_ERROR, f"{state.kind}:{state.name}", message=str(e))
+        finally:
+            with self._cond:
+                state.in_flight -= 1
+                self._in_flight -= 1
+                if not state.pending and not state.in_flight:
+                    state.status['state'] = 'idle'
+                    state.status['last_scan'] = time.time()
+                self._cond.notify()
+
+    def _plan_gmail_scan(self, state):
+        """Finish checkpointed work, then list new messages for a Gmail account and queue them in batches."""
+        client = state.client
+        jobs = client.resume_pending()
+        if jobs:
+            self.store.add_jobs([job_from_email(state.name, job) for job in jobs])
+        uids = client.fetch_new_message_uids()
+        batch_size = client.gmail_config.get('fetch_batch_size', 100)
+        # The threshold applies to the whole backlog, the batches stay small for round-robin scheduling
+        use_pool = client.message_parser.use_pool(len(uids))
+        if use_pool:
+            self.logger.info(f"Parsing backlog of {len(uids)} messages of {state.name} in a process pool")
+        with self._cond:
+            for start in range(0, len(uids), batch_size):
+                chunk = uids[start:start + batch_size]
+                state.pending.append(
+                    lambda state=state, chunk=chunk, use_pool=use_pool: self._run_gmail_batch(state, chunk, use_pool)
+                )
+
+    def _run_gmail_batch(self, state, uids, use_pool=None):
+        """Process one batch of messages for a Gmail account."""
+        jobs = state.client.process_message_batch(uids, use_pool)
+        self.store.add_jobs([job_from_email(state.name, job) for job in jobs])
+        with self._cond:
+            state.status['processed'] += len(uids)
+            state.status['jobs_found'] += len(jobs)
+            remaining = len(state.pending)
+        if self.event_callback is not None:
+            self.event_callback(EVENT_PROGRESS, f"gmail:{state.name}",
+                                message=f"{state.status['processed']} messages processed, {remaining} batches queued")
+
+    def _run_search_query(self, state, keyword, location):
+        """Run one search query for a ZipRecruiter account and apply to its matches."""
+        jobs = state.client.search_query(keyword, location)
+        self.store.add_jobs([job_from_posting(state.name, job) for job in jobs])
+        state.client.apply_to_jobs(jobs)
+        with self._cond:
+            state.status['processed'] += 1
+            state.status['jobs_found'] += len(jobs)
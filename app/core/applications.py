@@ -0,0 +1,500 @@
+import base64
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+from app.core.companies import normalize_company
+from app.core.geo import normalize_place_name
+from app.core.pay import annualize
+from app.utils.http import RetryBudget
+from app.utils.rate_limit import TokenBucket
+
+# Ledger states
+PENDING = 'pending'      # reserved, the application may be in flight
+RETRY = 'retry'          # the last attempt failed transiently
+APPLIED = 'applied'
+REJECTED = 'rejected'    # refused by the site or given up on, never retried
+
+_NON_WORD_RE = re.compile(r'[^a-z0-9]+')
+
+# Fingerprints per SQL query, below SQLite's bound-parameter limit
+_QUERY_CHUNK = 500
+
+
+def posting_fingerprint(posting):
+    """
+    Fingerprint the job a posting advertises.
+
+    The fingerprint depends on the normalized company, title and location,
+    not on the posting ID, so a job reposted under a new ID or found by
+    several searches has one fingerprint.
+
+    Args:
+        posting: Posting returned by the ZipRecruiter jobs API
+
+    Returns:
+        str: Hex digest
+    """
+    company = normalize_company((posting.get('hiring_company') or {}).get('name'))
+    title = ' '.join(_NON_WORD_RE.sub(' ', (posting.get('name') or '').lower()).split())
+    if company or title:
+        key = f"{company}|{title}|{normalize_place_name(posting.get('location') or '')}"
+    else:
+        key = f"id|{posting.get('id')}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def rank_postings(postings):
+    """
+    Order postings by annualized pay, best first; postings without pay come last.
+
+    Args:
+        postings: Postings returned by the ZipRecruiter jobs API
+
+    Returns:
+        list: The postings, ranked
+    """
+    def key(posting):
+        annual_min, annual_max = annualize(posting.get('salary_min'), posting.get('salary_max'),
+                                           posting.get('salary_interval'))
+        return (-(annual_max if annual_max is not None else -math.inf),
+                -(annual_min if annual_min is not None else -math.inf))
+    return sorted(postings, key=key)
+
+
+class ApplicationLedger:
+    """
+    SQLite ledger of job applications, keyed by account and posting fingerprint.
+
+    A fingerprint is reserved in the ledger, and the reservation committed,
+    before its application is sent, so concurrent workers and later sweeps
+    never apply to the same job twice. Reservations left behind by a crash
+    are taken over by the next run, which resends them with the same
+    idempotency key so the site can recognize a repeat. The posting is
+    stored with each entry so unfinished applications can be resent even
+    though the search will not report the posting again.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the ledger.
+
+        Args:
+            path: Database file path (':memory:' for a temporary ledger)
+        """
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        # Reservations made by other owners are leftovers of an earlier run
+        self.owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        # A reservation must be on disk before its application is sent
+        self._conn.execute('PRAGMA synchronous=FULL')
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS applications (
+                    account TEXT,
+                    fingerprint TEXT,
+                    state TEXT,
+                    owner TEXT,
+                    job_id TEXT,
+                    company TEXT,
+                    title TEXT,
+                    application_id TEXT,
+                    error TEXT,
+                    updated_at REAL,
+                    posting TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (account, fingerprint)
+                ) WITHOUT ROWID
+            ''')
+            columns = {row[1] for row in self._conn.execute('PRAGMA table_info(applications)')}
+            if 'attempts' not in columns:
+                # Ledger written before attempts were counted
+                self._conn.execute('ALTER TABLE applications ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0')
+
+    def reserve(self, account, fingerprint, posting):
+        """
+        Claim a fingerprint for an application.
+
+        Args:
+            account: Applying account
+            fingerprint: Posting fingerprint
+            posting: The posting, kept for resending
+
+        Returns:
+            bool: True if the caller should send the application
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'INSERT OR IGNORE INTO applications (account, fingerprint, state, owner, job_id, company, title, '
+                'updated_at, posting) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (account, fingerprint, PENDING, self.owner, posting.get('id'),
+                 (posting.get('hiring_company') or {}).get('name'), posting.get('name'), now, json.dumps(posting))
+            )
+            if cursor.rowcount:
+                return True
+            cursor = self._conn.execute(
+                'UPDATE applications SET state = ?, owner = ?, updated_at = ? WHERE account = ? AND fingerprint = ? '
+                'AND (state = ? OR (state = ? AND owner != ?))',
+                (PENDING, self.owner, now, account, fingerprint, RETRY, PENDING, self.owner)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, account, fingerprint, application_id=None):
+        """Record a submitted application."""
+        self._finish(account, fingerprint, APPLIED, application_id=application_id)
+
+    def reject(self, account, fingerprint, error):
+        """Record an application the site refused; it is never sent again."""
+        self._finish(account, fingerprint, REJECTED, error=error)
+
+    def release(self, account, fingerprint, error, max_attempts=None):
+        """
+        Record a transient failure of a sent application.
+
+        The application is resent by a later sweep, unless it has now failed
+        ``max_attempts`` times; then it is rejected and never sent again.
+
+        Args:
+            account: Applying account
+            fingerprint: Posting fingerprint
+            error: Description of the failure
+            max_attempts: Failed attempts after which to give up (None for no limit)
+
+        Returns:
+            int: Failed attempts so far, including this one
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                'SELECT attempts FROM applications WHERE account = ? AND fingerprint = ? AND owner = ?',
+                (account, fingerprint, self.owner)
+            ).fetchone()
+            if row is None:
+                return 0
+            attempts = row[0] + 1
+            state = REJECTED if max_attempts and attempts >= max_attempts else RETRY
+            self._conn.execute(
+                'UPDATE applications SET state = ?, attempts = ?, error = ?, updated_at = ? '
+                'WHERE account = ? AND fingerprint = ? AND owner = ?',
+                (state, attempts, error, time.time(), account, fingerprint, self.owner)
+            )
+        return attempts
+
+    def postpone(self, account, fingerprint, reason):
+        """Return a reservation whose application was not sent; it does not count as an attempt."""
+        self._finish(account, fingerprint, RETRY, error=reason)
+
+    def withdraw(self, account, fingerprint, reason):
+        """
+        Give up on an unfinished application, whoever reserved it.
+
+        Args:
+            account: Applying account
+            fingerprint: Posting fingerprint
+            reason: Why the application is not resent
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                'UPDATE applications SET state = ?, error = ?, updated_at = ? '
+                'WHERE account = ? AND fingerprint = ? AND state IN (?, ?)',
+                (REJECTED, reason, time.time(), account, fingerprint, RETRY, PENDING)
+            )
+
+    def _finish(self, account, fingerprint, state, application_id=None, error=None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                'UPDATE applications SET state = ?, application_id = COALESCE(?, application_id), error = ?, '
+                'updated_at = ? WHERE account = ? AND fingerprint = ? AND owner = ?',
+                (state, application_id, error, time.time(), account, fingerprint, self.owner)
+            )
+
+    def settled(self, account, fingerprints):
+        """
+        Return the fingerprints that were applied to or rejected.
+
+        Args:
+            account: Applying account
+            fingerprints: Fingerprints to check
+
+        Returns:
+            set: The settled fingerprints
+        """
+        fingerprints = list(fingerprints)
+        settled = set()
+        with self._lock:
+            for start in range(0, len(fingerprints), _QUERY_CHUNK):
+                chunk = fingerprints[start:start + _QUERY_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT fingerprint FROM applications WHERE account = ? AND state IN (?, ?) "
+                    f"AND fingerprint IN ({','.join('?' * len(chunk))})",
+                    [account, APPLIED, REJECTED] + chunk
+                )
+                settled.update(row[0] for row in rows)
+        return settled
+
+    def unfinished(self, account):
+        """
+        Return the postings whose application has to be resent.
+
+        These are transient failures and reservations left behind by an
+        earlier run.
+
+        Args:
+            account: Applying account
+
+        Returns:
+            list: Postings
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT posting FROM applications WHERE account = ? AND (state = ? OR (state = ? AND owner != ?))',
+                (account, RETRY, PENDING, self.owner)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def applied_companies(self, account):
+        """Return the companies the account has applied to."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT DISTINCT company FROM applications WHERE account = ? AND state = ? AND company IS NOT NULL',
+                (account, APPLIED)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def counts(self, account=None):
+        """
+        Count ledger entries by state.
+
+        Args:
+            account: Only count this account's entries
+
+        Returns:
+            dict: State -> count
+        """
+        with self._lock:
+            if account is None:
+                rows = self._conn.execute('SELECT state, COUNT(*) FROM applications GROUP BY state')
+            else:
+                rows = self._conn.execute(
+                    'SELECT state, COUNT(*) FROM applications WHERE account = ? GROUP BY state', (account,)
+                )
+            return dict(rows.fetchall())
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class ApplicationPipeline:
+    """
+    Applies to job postings through a bounded worker pool.
+
+    Postings are ranked by pay and deduplicated by fingerprint. Up to
+    ``workers`` applications are then sent at once over the shared HTTP
+    transport. Each target host has its own token bucket, so no site
+    receives more than ``rate_per_host`` applications per second. The
+    ApplicationLedger makes sure each job is applied to at most once, and
+    an application that keeps failing is given up after ``max_attempts``.
+    """
+
+    def __init__(self, transport, ledger, logger, account, apply_url, applicant,
+                 resume_path=None, workers=8, rate_per_host=2.0, max_per_sweep=200,
+                 retry_budget=20, one_per_company=False, max_attempts=5):
+        """
+        Initialize the pipeline.
+
+        Args:
+            transport: HttpTransport used to send applications
+            ledger: ApplicationLedger
+            logger: Application logger
+            account: Account name the ledger entries belong to
+            apply_url: Endpoint applications are posted to, unless a posting has its own 'apply_url'
+            applicant: Dict with the applicant's 'name', 'email' and 'phone'
+            resume_path: Resume sent with every application (optional)
+            workers: Applications sent concurrently
+            rate_per_host: Applications per second per host (0 = unlimited)
+            max_per_sweep: Maximum applications per call to apply()
+            retry_budget: Retries of rate-limited applications per call to apply()
+            one_per_company: Apply to at most one job per company
+            max_attempts: Transiently failed sends after which an application is given up
+        """
+        self.transport = transport
+        self.ledger = ledger
+        self.logger = logger
+        self.account = account
+        self.apply_url = apply_url
+        self.applicant = applicant
+        self.resume_path = resume_path
+        self.workers = workers
+        self.rate_per_host = rate_per_host
+        self.max_per_sweep = max_per_sweep
+        self.retry_budget = RetryBudget(retry_budget)
+        self.one_per_company = one_per_company
+        self.max_attempts = max_attempts
+
+        # Optional callable(posting) called for every submitted application
+        self.on_applied = None
+
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._resume = None
+
+    def _bucket(self, host):
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate_per_host)
+            return bucket
+
+    def _resume_payload(self):
+        """Return the base64 resume, read once (or None)."""
+        if self._resume is None and self.resume_path and os.path.exists(self.resume_path):
+            with open(self.resume_path, 'rb') as f:
+                self._resume = base64.b64encode(f.read()).decode('ascii')
+        return self._resume
+
+    def select(self, postings, criteria=None):
+        """
+        Choose the postings to apply to, best paid first.
+
+        Args:
+            postings: Candidate postings
+            criteria: Optional JobCriteria. Unfinished applications of earlier
+                sweeps are checked against it again and withdrawn if they no
+                longer match; other postings are only checked for companies
+                excluded since they were found.
+
+        Returns:
+            list: (fingerprint, posting) tuples, at most ``max_per_sweep``
+        """
+        # Unfinished applications of earlier sweeps go first
+        resumed = []
+        for posting in self.ledger.unfinished(self.account):
+            if criteria is not None and not criteria.matches_posting(posting):
+                self.logger.info(f"Not resending the application to {posting.get('id')}, "
+                                 f"it no longer meets the criteria")
+                self.ledger.withdraw(self.account, posting_fingerprint(posting), 'no longer meets the criteria')
+                continue
+            resumed.append(posting)
+
+        candidates = {}
+        companies = set()
+        for posting in resumed + rank_postings(postings):
+            fingerprint = posting_fingerprint(posting)
+            if fingerprint in candidates:
+                continue
+            company = (posting.get('hiring_company') or {}).get('name')
+            if criteria is not None and not criteria.company_ok(company):
+                continue
+            if self.one_per_company and company:
+                key = normalize_company(company)
+                if key in companies:
+                    continue
+                companies.add(key)
+            candidates[fingerprint] = posting
+
+        settled = self.ledger.settled(self.account, candidates)
+        selected = [(fp, posting) for fp, posting in candidates.items() if fp not in settled]
+        return selected[:self.max_per_sweep]
+
+    def apply(self, postings, stop_event=None, criteria=None):
+        """
+        Apply to postings, including unfinished applications of earlier sweeps.
+
+        Args:
+            postings: Postings that met the criteria
+            stop_event: Optional threading.Event that stops sending further applications
+            criteria: Optional JobCriteria the postings are checked against again (see select())
+
+        Returns:
+            dict: Outcome -> count ('applied', 'duplicate', 'rejected', 'failed', 'skipped')
+        """
+        selected = self.select(postings, criteria)
+        if not selected:
+            return {}
+        self.retry_budget.reset()
+
+        def run(item):
+            return self._apply_one(*item, stop_event)
+
+        workers = max(1, min(self.workers, len(selected)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ziprecruiter-apply') as executor:
+            outcomes = Counter(executor.map(run, selected))
+        return dict(outcomes)
+
+    def _idempotency_key(self, fingerprint):
+        """Key of an application, the same for every resend but distinct per account."""
+        return hashlib.sha1(f"{self.account}|{fingerprint}".encode('utf-8')).hexdigest()
+
+    def _apply_one(self, fingerprint, posting, stop_event):
+        """Send one application; returns its outcome."""
+        if stop_event is not None and stop_event.is_set():
+            return 'skipped'
+        if not self.ledger.reserve(self.account, fingerprint, posting):
+            # Applied to by another worker or an earlier sweep
+            return 'duplicate'
+
+        url = posting.get('apply_url') or self.apply_url
+        if not self._bucket(urlparse(url).netloc).acquire(stop_event=stop_event):
+            self.ledger.postpone(self.account, fingerprint, 'stopped')
+            return 'skipped'
+
+        payload = dict(self.applicant, job_id=posting.get('id'))
+        resume = self._resume_payload()
+        if resume is not None:
+            payload['resume'] = resume
+            payload['resume_filename'] = os.path.basename(self.resume_path)
+
+        try:
+            # The key lets the site recognize a resend after a crash
+            response = self.transport.post(url, json=payload,
+                                           headers={'Idempotency-Key': self._idempotency_key(fingerprint)},
+                                           budget=self.retry_budget, stop_event=stop_event)
+        except requests.RequestException as e:
+            return self._failed(fingerprint, posting, str(e))
+
+        if response.status_code in (200, 201, 409):
+            # 409: the site already has an application for this job
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            application_id = body.get('application_id') if isinstance(body, dict) else None
+            self.ledger.complete(self.account, fingerprint, application_id)
+            if self.on_applied is not None:
+                self.on_applied(posting)
+            return 'applied'
+        if response.status_code == 429 or response.status_code >= 500:
+            return self._failed(fingerprint, posting, f"HTTP {response.status_code}")
+        self.logger.error(f"Application to {posting.get('id')} rejected with {response.status_code}")
+        self.ledger.reject(self.account, fingerprint, f"HTTP {response.status_code}: {response.text[:200]}")
+        return 'rejected'
+
+    def _failed(self, fingerprint, posting, error):
+        """Record a transient failure; returns 'rejected' once the attempts are used up, else 'failed'."""
+        attempts = self.ledger.release(self.account, fingerprint, error, self.max_attempts)
+        if self.max_attempts and attempts >= self.max_attempts:
+            self.logger.error(f"Application to {posting.get('id')} failed {attempts} times, giving up: {error}")
+            return 'rejected'
+        self.logger.warning(f"Application to {posting.get('id')} failed, will retry: {error}")
+        return 'failed'
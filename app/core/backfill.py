@@ -0,0 +1,268 @@
+"""
+Offline backfill of job emails from a Google Takeout mbox or a Maildir.
+
+Usage:
+    python -m app.core.backfill ~/Takeout/Mail/All\\ mail.mbox
+    python -m app.core.backfill ~/Maildir --account work --batch-size 5000
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import re
+import sys
+import time
+
+from app.core.classifier import shared_classifier
+from app.core.email_parser import JobEmailParser
+from app.core.job_store import JobStore, job_from_email
+from app.core.parse_pool import ParallelMessageParser
+
+_MESSAGE_ID_RE = re.compile(rb'^Message-ID:[ \t]*(<[^>\r\n]*>)', re.IGNORECASE | re.MULTILINE)
+_HEADER_END_RE = re.compile(rb'\r?\n\r?\n')
+# Lines starting with 'From ' are escaped as '>From ', and those already quoted get another '>' (mboxrd)
+_FROM_ESCAPE_RE = re.compile(rb'^>(>*From )', re.MULTILINE)
+
+
+def iter_mbox_messages(path):
+    """
+    Yield the raw messages of an mbox file.
+
+    The file is memory-mapped and split by scanning for ``From `` separator
+    lines, so only the message being yielded is copied into memory. The
+    ``>From `` escaping of body lines is undone.
+
+    Args:
+        path: Path of the mbox file
+
+    Yields:
+        bytes: Raw message without its ``From `` separator line
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+
+            size = len(mm)
+            start = 0 if mm[:5] == b'From ' else mm.find(b'\nFrom ')
+            while 0 <= start < size:
+                if mm[start:start + 1] == b'\n':
+                    start += 1
+                body_start = mm.find(b'\n', start)
+                if body_start < 0:
+                    return
+                end = mm.find(b'\nFrom ', body_start)
+                if end < 0:
+                    end = size
+                message = mm[body_start + 1:end]
+                if b'>From ' in message:
+                    message = _FROM_ESCAPE_RE.sub(rb'\1', message)
+                yield message
+                start = end
+
+
+def iter_maildir_messages(path):
+    """
+    Yield the raw messages of a Maildir.
+
+    Args:
+        path: Maildir root containing cur/ and new/
+
+    Yields:
+        bytes: Raw message
+    """
+    for sub in ('cur', 'new'):
+        directory = os.path.join(path, sub)
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            with open(os.path.join(directory, name), 'rb') as f:
+                yield f.read()
+
+
+def message_id_of(raw):
+    """
+    Read the Message-ID header without parsing the whole message.
+
+    Messages without one get a stable ID derived from their headers.
+
+    Args:
+        raw: Raw message bytes
+
+    Returns:
+        str: Message ID
+    """
+    header_end = _HEADER_END_RE.search(raw)
+    headers = raw[:header_end.start()] if header_end else raw
+    match = _MESSAGE_ID_RE.search(headers)
+    if match:
+        return match.group(1).decode('ascii', errors='replace')
+    return f"<sha1-{hashlib.sha1(headers).hexdigest()}@backfill>"
+
+
+class Backfill:
+    """
+    Streams an mbox or Maildir export through the job email pipeline.
+
+    Messages are read in batches. Already-seen Message-IDs are dropped before
+    parsing, the rest are parsed (in a process pool for full batches),
+    classified with the same JobEmailParser and trained model GmailMonitor
+    uses, and the results are written to the JobStore in one transaction
+    per batch.
+    """
+
+    def __init__(self, store, account, logger=None, batch_size=2000, parse_workers=None,
+                 classifier=None, threshold=0.5):
+        """
+        Initialize the backfill.
+
+        Args:
+            store: JobStore receiving jobs and seen message IDs
+            account: Account name the messages belong to
+            logger: Application logger (optional)
+            batch_size: Messages per batch
+            parse_workers: Parser processes (defaults to the CPU count)
+            classifier: Trained JobEmailClassifier (keywords classify if omitted)
+            threshold: Probability from which the classifier calls a message a job email
+        """
+        self.store = store
+        self.account = account
+        self.logger = logger
+        self.batch_size = batch_size
+        self.parser = JobEmailParser()
+        self.classifier = classifier
+        self.threshold = threshold
+        self.message_parser = ParallelMessageParser(
+            threshold=min(batch_size, 1000), max_workers=parse_workers
+        )
+        self.stats = {'messages': 0, 'skipped': 0, 'failed': 0, 'jobs': 0, 'seconds': 0.0}
+
+    def run(self, path):
+        """
+        Backfill from a path.
+
+        Args:
+            path: mbox file or Maildir directory
+
+        Returns:
+            dict: Counts of messages read, skipped (already seen), failed (unparsable)
+                and jobs found, and the elapsed time
+        """
+        start = time.perf_counter()
+        messages = iter_maildir_messages(path) if os.path.isdir(path) else iter_mbox_messages(path)
+
+        batch = []
+        try:
+            for raw in messages:
+                batch.append(raw)
+                if len(batch) >= self.batch_size:
+                    self._process_batch(batch)
+                    batch = []
+            if batch:
+                self._process_batch(batch)
+        finally:
+            self.message_parser.shutdown()
+
+        self.stats['seconds'] = round(time.perf_counter() - start, 3)
+        return self.stats
+
+    def _process_batch(self, raw_messages):
+        """Skip seen messages, then parse, classify and store one batch."""
+        ids = [message_id_of(raw) for raw in raw_messages]
+        unseen = set(self.store.filter_unseen(self.account, ids))
+
+        fresh = []
+        fresh_ids = []
+        for message_id, raw in zip(ids, raw_messages):
+            # Also drops duplicates within the batch
+            if message_id in unseen:
+                unseen.discard(message_id)
+                fresh.append(raw)
+                fresh_ids.append(message_id)
+
+        messages = []
+        for message_id, message in zip(fresh_ids, self.message_parser.parse_many(fresh)):
+            if message is None:
+                # Skipped for good: it is marked as seen with the rest of the batch
+                self.stats['failed'] += 1
+                if self.logger:
+                    self.logger.warning(f"Backfill: skipping message {message_id}, it could not be parsed")
+            else:
+                messages.append(message)
+
+        if self.classifier is not None:
+            labels = self.classifier.predict(self.classifier.texts(messages), self.threshold).tolist()
+        else:
+            labels = [None] * len(messages)
+
+        jobs = []
+        for message, is_job in zip(messages, labels):
+            analysis = self.parser.analyze(message['subject'], message['body'], is_job, message.get('reply_to'))
+            if analysis['is_job']:
+                result = dict(message)
+                result.update(analysis)
+                jobs.append(job_from_email(self.account, result))
+
+        self.store.add_jobs(jobs)
+        self.store.mark_seen(self.account, fresh_ids)
+
+        self.stats['messages'] += len(raw_messages)
+        self.stats['skipped'] += len(raw_messages) - len(fresh)
+        self.stats['jobs'] += len(jobs)
+        if self.logger:
+            self.logger.info(f"Backfill: {self.stats['messages']} messages read, {self.stats['jobs']} jobs found")
+
+
+def main(argv=None):
+    """Run a backfill from the command line."""
+    from app.utils.config import Config
+    from app.utils.logger import Logger
+    from app.utils.profiling import Profiler
+
+    parser = argparse.ArgumentParser(description="Backfill job emails from an mbox or Maildir export")
+    parser.add_argument('path', help="mbox file or Maildir directory")
+    parser.add_argument('--account', help="Account name (defaults to the configured Gmail address)")
+    parser.add_argument('--database', help="Job store path (defaults to storage.database)")
+    parser.add_argument('--batch-size', type=int, default=2000, help="Messages per batch")
+    parser.add_argument('--workers', type=int, help="Parser processes (defaults to the CPU count)")
+    args = parser.parse_args(argv)
+
+    config = Config()
+    logger = Logger(config)
+
+    # kill -USR1 <pid> toggles CPU profiling, -USR2 writes a memory snapshot
+    Profiler(config, logger).install_signal_handlers()
+
+    database = args.database or config.get('storage', {}).get('database', 'app/resources/job_assistant.db')
+    account = args.account or config.get('gmail', {}).get('email') or 'default'
+
+    classifier_config = config.get('gmail', {}).get('classifier', {})
+    classifier = None
+    if classifier_config.get('enabled', True):
+        try:
+            classifier = shared_classifier(classifier_config.get('model_path'))
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not load the email classifier, classifying by keywords: {e}")
+        if classifier is not None and not classifier.is_trained(classifier_config.get('min_labels', 10)):
+            classifier = None
+
+    pay_range_min = config.get('gmail', {}).get('criteria', {}).get('pay_range_min')
+    store = JobStore(database)
+    try:
+        stats = Backfill(store, account, logger, args.batch_size, args.workers,
+                         classifier, classifier_config.get('threshold', 0.5)).run(args.path)
+        paying = len(store.jobs_paying_at_least(pay_range_min)) if pay_range_min else None
+    finally:
+        store.close()
+
+    print(f"Read {stats['messages']} messages ({stats['skipped']} already seen, {stats['failed']} unparsable), "
+          f"found {stats['jobs']} jobs in {stats['seconds']} seconds")
+    if paying is not None:
+        print(f"{paying} stored jobs state pay that can reach {pay_range_min:,} a year")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
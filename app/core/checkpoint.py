@@ -0,0 +1,84 @@
+import json
+import os
+import re
+import threading
+from pathlib import Path
+
+DEFAULT_CHECKPOINT_DIR = Path(__file__).parent.parent / 'resources' / 'checkpoints'
+
+
+class Checkpoint:
+    """
+    Crash-safe JSON file holding the progress of one pipeline.
+
+    The whole state is rewritten on every save: it is written to a
+    temporary file, flushed to disk and renamed over the previous
+    checkpoint, so a crash at any point leaves either the old or the new
+    state, never a partial one.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            path: Checkpoint file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_account(cls, section, kind, account):
+        """
+        Return the checkpoint of an account.
+
+        Args:
+            section: Configuration section of the client, may set 'checkpoint_dir'
+            kind: 'gmail' or 'ziprecruiter'
+            account: Account email or name
+
+        Returns:
+            Checkpoint: The account's checkpoint
+        """
+        directory = Path(section.get('checkpoint_dir') or DEFAULT_CHECKPOINT_DIR)
+        name = re.sub(r'[^A-Za-z0-9@._-]+', '_', account or 'default')
+        return cls(directory / f"{kind}_{name}.json")
+
+    def load(self):
+        """
+        Read the saved state.
+
+        Returns:
+            dict: The state, or an empty dict if there is no readable checkpoint
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def save(self, state):
+        """
+        Replace the saved state.
+
+        Args:
+            state: JSON-serializable dict
+        """
+        data = json.dumps(state, separators=(',', ':'))
+        with self._lock:
+            os.makedirs(self.path.parent, exist_ok=True)
+            temp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+
+    def clear(self):
+        """Delete the checkpoint."""
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,331 @@
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_MODEL_PATH = Path(__file__).parent.parent / 'resources' / 'classifier.npz'
+
+# Labels
+NOT_JOB = 0
+JOB = 1
+
+_FORMAT_VERSION = 1
+
+# Letters, digits, '$' and the bytes of non-ASCII characters form words
+_WORD_BYTES = np.zeros(256, dtype=bool)
+_WORD_BYTES[np.frombuffer(b'abcdefghijklmnopqrstuvwxyz0123456789$', dtype=np.uint8)] = True
+_WORD_BYTES[128:] = True
+
+# Polynomial token hash modulo 2**64; the base is odd, hence invertible
+_BASE = 0x100000001B3
+_BASE_INVERSE = pow(_BASE, -1, 2 ** 64)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_BIGRAM = np.uint64(0xC2B2AE3D27D4EB4F)
+
+# Characters hashed per pass; small enough for the temporary arrays to stay in cache
+_CHUNK_CHARS = 1 << 16
+
+_powers = (np.ones(1, dtype=np.uint64), np.ones(1, dtype=np.uint64))
+_powers_lock = threading.Lock()
+
+
+def _power_tables(size):
+    """Return arrays of base**i and base**-i (mod 2**64) for i < size, grown on demand."""
+    global _powers
+    powers, inverses = _powers
+    if len(powers) >= size:
+        return powers, inverses
+    with _powers_lock:
+        if len(_powers[0]) < size:
+            size = max(size, 2 * len(_powers[0]))
+            powers = np.empty(size, dtype=np.uint64)
+            inverses = np.empty(size, dtype=np.uint64)
+            powers[0] = inverses[0] = 1
+            np.cumprod(np.full(size - 1, _BASE, dtype=np.uint64), out=powers[1:])
+            np.cumprod(np.full(size - 1, _BASE_INVERSE, dtype=np.uint64), out=inverses[1:])
+            _powers = (powers, inverses)
+        return _powers
+
+
+def message_text(message, max_chars=4000):
+    """
+    Return the text of a parsed message the classifier looks at.
+
+    Args:
+        message: Record with 'from', 'subject' and 'body' keys
+        max_chars: Characters of the body to keep
+
+    Returns:
+        str: Sender, subject and the start of the body
+    """
+    return f"{message.get('from') or ''}\n{message.get('subject') or ''}\n{(message.get('body') or '')[:max_chars]}"
+
+
+def hash_ngrams(texts, n_bits):
+    """
+    Hash the word unigrams and bigrams of many texts into a fixed feature space.
+
+    Texts are lower-cased and encoded a chunk at a time, then hashed with
+    NumPy: token boundaries come from a byte class table and token hashes
+    from a prefix sum of a polynomial hash, so no Python code runs per token.
+
+    Args:
+        texts: Sequence of strings
+        n_bits: Size of the feature space as a power of two
+
+    Returns:
+        tuple: (documents, features) int64 arrays with one entry per n-gram
+            occurrence: the index of its text and its feature index
+    """
+    texts = list(texts)
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    chunk_ids = np.cumsum(lengths + 1) // _CHUNK_CHARS
+    bounds = [0] + (np.flatnonzero(np.diff(chunk_ids)) + 1).tolist() + [len(texts)]
+
+    documents = []
+    features = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if start == end:
+            continue
+        chunk_documents, chunk_features = _hash_chunk(texts[start:end], n_bits)
+        documents.append(chunk_documents + start)
+        features.append(chunk_features)
+
+    if not documents:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(documents), np.concatenate(features)
+
+
+def _hash_chunk(texts, n_bits):
+    """Hash the n-grams of a few texts; see hash_ngrams()."""
+    # Texts are separated (and the last one ended) by NUL, which is not a word byte
+    data = np.frombuffer(('\0'.join(texts) + '\0').lower().encode('utf-8', 'ignore'), dtype=np.uint8)
+    separators = np.flatnonzero(data == 0)
+    if len(separators) != len(texts):
+        # Some text contains NUL itself
+        texts = [text.replace('\0', ' ') for text in texts]
+        data = np.frombuffer(('\0'.join(texts) + '\0').lower().encode('utf-8', 'ignore'), dtype=np.uint8)
+        separators = np.flatnonzero(data == 0)
+
+    # Word runs start at +1 and end at -1 edges, which alternate
+    edges = np.flatnonzero(np.diff(_WORD_BYTES[data].view(np.int8), prepend=np.int8(0)))
+    starts = edges[0::2]
+    ends = edges[1::2]
+    if not len(starts):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    powers, inverses = _power_tables(len(data) + 1)
+    prefix = np.zeros(len(data) + 1, dtype=np.uint64)
+    np.multiply(data, powers[:len(data)], out=prefix[1:])
+    np.cumsum(prefix[1:], out=prefix[1:])
+    # Shifted back to position 0, so a token hashes the same wherever it occurs
+    tokens = (prefix[ends] - prefix[starts]) * inverses[starts]
+    token_documents = np.searchsorted(separators, starts)
+
+    # Bigrams of consecutive tokens of the same text
+    same = token_documents[1:] == token_documents[:-1]
+    bigrams = tokens[:-1][same] * _BIGRAM + tokens[1:][same]
+
+    hashes = np.concatenate((tokens, bigrams))
+    hashes ^= hashes >> np.uint64(29)
+    hashes *= _GOLDEN
+    features = (hashes >> np.uint64(64 - n_bits)).astype(np.int64)
+    return np.concatenate((token_documents, token_documents[:-1][same])), features
+
+
+class JobEmailClassifier:
+    """
+    Multinomial naive Bayes classifier telling job emails from other mail.
+
+    Messages are represented by their hashed word unigrams and bigrams in a
+    feature space of fixed size, so the model needs no vocabulary and is
+    trained incrementally: every labeled message only adds to the per-class
+    feature counts. Scoring a batch is a vectorized hash, one gather of the
+    per-feature log-likelihood ratios and one bincount.
+
+    learn() and predict_proba() may be called from different threads.
+    """
+
+    def __init__(self, n_bits=18, alpha=0.5, max_chars=4000):
+        """
+        Initialize an untrained classifier.
+
+        Args:
+            n_bits: Size of the hashed feature space as a power of two
+            alpha: Additive smoothing of the feature counts
+            max_chars: Characters of each message body that are looked at
+        """
+        self.n_bits = n_bits
+        self.alpha = alpha
+        self.max_chars = max_chars
+        self.feature_counts = np.zeros((2, 1 << n_bits), dtype=np.uint32)
+        self.message_counts = np.zeros(2, dtype=np.int64)
+        self._lock = threading.Lock()
+        self._update_model()
+
+    @property
+    def label_counts(self):
+        """(job, other) numbers of messages learned."""
+        return int(self.message_counts[JOB]), int(self.message_counts[NOT_JOB])
+
+    def is_trained(self, min_labels=1):
+        """True once at least ``min_labels`` messages of each class were learned."""
+        return int(self.message_counts.min()) >= min_labels
+
+    def texts(self, messages):
+        """Return the classifier texts of parsed messages (see message_text())."""
+        return [message_text(message, self.max_chars) for message in messages]
+
+    def learn(self, texts, labels):
+        """
+        Add labeled messages to the model.
+
+        Args:
+            texts: Message texts (see message_text())
+            labels: JOB or NOT_JOB for each text (or truthy for job emails)
+        """
+        labels = np.asarray(labels, dtype=bool).astype(np.int64)
+        if len(labels) != len(texts):
+            raise ValueError("Expected one label per text")
+        documents, features = hash_ngrams(texts, self.n_bits)
+        counts = np.zeros((2, 1 << self.n_bits), dtype=np.int64)
+        for label in (NOT_JOB, JOB):
+            counts[label] = np.bincount(features[labels[documents] == label], minlength=1 << self.n_bits)
+
+        with self._lock:
+            self.feature_counts = (self.feature_counts + counts).astype(np.uint32)
+            self.message_counts = self.message_counts + np.bincount(labels, minlength=2)
+            self._update_model()
+
+    def _update_model(self):
+        """Recompute the scoring weights from the counts."""
+        counts = self.feature_counts.astype(np.float64) + self.alpha
+        log_likelihood = np.log(counts) - np.log(counts.sum(axis=1, keepdims=True))
+        weights = (log_likelihood[JOB] - log_likelihood[NOT_JOB]).astype(np.float32)
+        messages = self.message_counts + 1
+        bias = float(np.log(messages[JOB]) - np.log(messages[NOT_JOB]))
+        # Swapped in one assignment so a concurrent prediction sees a consistent model
+        self._model = (weights, bias)
+
+    def decision_function(self, texts):
+        """
+        Score messages; positive scores favor job emails.
+
+        Args:
+            texts: Message texts (see message_text())
+
+        Returns:
+            numpy.ndarray: Log-odds of each text being a job email
+        """
+        weights, bias = self._model
+        documents, features = hash_ngrams(texts, self.n_bits)
+        return np.bincount(documents, weights=weights[features], minlength=len(texts)) + bias
+
+    def predict_proba(self, texts):
+        """
+        Estimate the probability that messages are job emails.
+
+        Args:
+            texts: Message texts (see message_text())
+
+        Returns:
+            numpy.ndarray: Probabilities, one per text
+        """
+        scores = np.clip(self.decision_function(texts), -500.0, 500.0)
+        return 1.0 / (1.0 + np.exp(-scores))
+
+    def predict(self, texts, threshold=0.5):
+        """
+        Classify messages.
+
+        Args:
+            texts: Message texts (see message_text())
+            threshold: Probability from which a message is a job email
+
+        Returns:
+            numpy.ndarray: Boolean array, True for job emails
+        """
+        return self.predict_proba(texts) >= threshold
+
+    def save(self, path):
+        """
+        Write the model atomically.
+
+        Args:
+            path: Model file (.npz)
+        """
+        path = Path(path)
+        with self._lock:
+            os.makedirs(path.parent, exist_ok=True)
+            temp_path = path.with_name(path.name + '.tmp')
+            with open(temp_path, 'wb') as f:
+                np.savez_compressed(
+                    f, version=_FORMAT_VERSION, n_bits=self.n_bits, alpha=self.alpha, max_chars=self.max_chars,
+                    feature_counts=self.feature_counts, message_counts=self.message_counts
+                )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a model written by save().
+
+        Args:
+            path: Model file (.npz)
+
+        Returns:
+            JobEmailClassifier: The model
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a valid model
+        """
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['version']) != _FORMAT_VERSION:
+                    raise ValueError(f"Unsupported model version {int(data['version'])}")
+                classifier = cls(int(data['n_bits']), float(data['alpha']), int(data['max_chars']))
+                feature_counts = data['feature_counts']
+                message_counts = data['message_counts']
+        except KeyError as e:
+            raise ValueError(f"Missing {e} in model file") from None
+        if feature_counts.shape != classifier.feature_counts.shape or message_counts.shape != (2,):
+            raise ValueError("Model file does not match its feature space")
+        classifier.feature_counts = feature_counts.astype(np.uint32)
+        classifier.message_counts = message_counts.astype(np.int64)
+        classifier._update_model()
+        return classifier
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def shared_classifier(path=None):
+    """
+    Return the classifier stored at a path, loaded once per process.
+
+    Monitors of several accounts and the UI thus learn into and predict with
+    the same model.
+
+    Args:
+        path: Model file (defaults to DEFAULT_MODEL_PATH); an untrained
+            model is returned if it does not exist yet
+
+    Returns:
+        JobEmailClassifier: The model
+
+    Raises:
+        OSError: If the file exists but cannot be read
+        ValueError: If the file is not a valid model
+    """
+    key = os.path.abspath(path or DEFAULT_MODEL_PATH)
+    with _shared_lock:
+        classifier = _shared.get(key)
+        if classifier is None:
+            classifier = JobEmailClassifier.load(key) if os.path.exists(key) else JobEmailClassifier()
+            _shared[key] = classifier
+        return classifier
@@ -0,0 +1,159 @@
+import math
+import re
+import unicodedata
+
+# Legal-form words dropped from the end of company names
+COMPANY_SUFFIXES = {
+    'inc', 'incorporated', 'llc', 'llp', 'lp', 'pllc', 'ltd', 'limited', 'corp', 'corporation',
+    'co', 'company', 'plc', 'gmbh', 'ag', 'sa', 'nv', 'bv', 'pc', 'holdings', 'intl',
+}
+
+_NON_WORD_RE = re.compile(r'[^a-z0-9]+')
+
+# Bound on the number of distinct names kept in the match cache
+CACHE_SIZE = 100000
+
+
+def normalize_company(name):
+    """
+    Normalize a company name for comparison.
+
+    Case, accents, punctuation, a leading 'the' and trailing legal forms
+    (Inc., LLC, Corporation, ...) are removed, so 'ACME Corporation' and
+    'Acme, Inc.' both become 'acme'.
+
+    Args:
+        name: Company name
+
+    Returns:
+        str: Normalized name ('' if nothing is left)
+    """
+    if not name:
+        return ''
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii').lower()
+    name = name.replace('&', ' and ')
+    # 'L.L.C.' -> 'llc' before the remaining punctuation becomes spaces
+    name = re.sub(r'\b((?:[a-z]\.){2,})', lambda m: m.group(1).replace('.', ''), name)
+    words = _NON_WORD_RE.sub(' ', name).split()
+    if len(words) > 1 and words[0] == 'the':
+        words = words[1:]
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CompanyMatcher:
+    """
+    Matches company names against a large list of names.
+
+    Names are normalized with normalize_company and found through an exact
+    hash lookup first. Otherwise, a trigram index proposes the candidates
+    that share enough trigrams to reach the similarity threshold (Dice
+    coefficient), only probing the rarest trigrams of the query (prefix
+    filtering), so a lookup touches a few short posting lists even with
+    tens of thousands of names. Results are cached per name.
+    """
+
+    def __init__(self, names=None, threshold=0.85):
+        """
+        Initialize the matcher.
+
+        Args:
+            names: Company names to match against
+            threshold: Minimum trigram Dice similarity for a fuzzy match (1.0 = exact only)
+        """
+        self.threshold = threshold
+        self.names = []
+        self._exact = {}
+        self._grams = []
+        self._postings = {}
+        self._cache = {}
+        for name in names or []:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __bool__(self):
+        return bool(self.names)
+
+    def add(self, name):
+        """
+        Add a company name.
+
+        Args:
+            name: Company name
+        """
+        key = normalize_company(name)
+        if not key or key in self._exact:
+            return
+        entry = len(self.names)
+        self.names.append(name)
+        self._exact[key] = entry
+        grams = _trigrams(key)
+        self._grams.append(grams)
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(entry)
+        # A new name can turn earlier misses into matches
+        self._cache.clear()
+
+    def match(self, name):
+        """
+        Find the listed company a name refers to.
+
+        Args:
+            name: Company name to look up
+
+        Returns:
+            str: The matching listed name, or None
+        """
+        if not name or not self.names:
+            return None
+        if name in self._cache:
+            return self._cache[name]
+        if len(self._cache) >= CACHE_SIZE:
+            self._cache.clear()
+        result = self._match(normalize_company(name))
+        self._cache[name] = result
+        return result
+
+    def __contains__(self, name):
+        return self.match(name) is not None
+
+    def _match(self, key):
+        if not key:
+            return None
+        entry = self._exact.get(key)
+        if entry is not None:
+            return self.names[entry]
+        if self.threshold >= 1.0:
+            return None
+
+        grams = _trigrams(key)
+        size = len(grams)
+        t = self.threshold
+        # Any name with Dice >= t shares at least this many trigrams with the query
+        needed = math.ceil(t * size / (2.0 - t))
+        min_size = t * size / (2.0 - t)
+        max_size = size * (2.0 - t) / t
+
+        # Probing the size - needed + 1 rarest trigrams is enough to meet every such name
+        probe = sorted(grams, key=lambda g: len(self._postings.get(g, ())))[:size - needed + 1]
+        candidates = set()
+        for gram in probe:
+            candidates.update(self._postings.get(gram, ()))
+
+        best, best_score = None, t
+        for entry in candidates:
+            other = self._grams[entry]
+            if not min_size <= len(other) <= max_size:
+                continue
+            score = 2.0 * len(grams & other) / (size + len(other))
+            if score >= best_score:
+                best, best_score = entry, score
+        return None if best is None else self.names[best]
@@ -0,0 +1,149 @@
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+
+class CredentialManager:
+    """
+    Loads, caches and refreshes the OAuth credentials for the Gmail API.
+
+    The token file is read once and the Gmail service object is built once,
+    from the discovery document bundled with google-api-python-client, so no
+    discovery request is made. A background thread refreshes the access
+    token ``refresh_margin`` seconds before it expires and writes it back
+    atomically, so API calls never have to wait for a refresh.
+    """
+
+    def __init__(self, token_file, scopes, logger, refresh_margin=600):
+        """
+        Initialize the credential manager.
+
+        Args:
+            token_file: Path of the authorized-user token (token.json)
+            scopes: OAuth scopes the token must cover
+            logger: Application logger
+            refresh_margin: Seconds before expiry at which the token is refreshed
+        """
+        self.token_file = token_file
+        self.scopes = scopes
+        self.logger = logger
+        self.refresh_margin = refresh_margin
+
+        self._credentials = None
+        self._service = None
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self._stop_event = threading.Event()
+
+    def load(self):
+        """
+        Load the credentials from the token file (only the first call reads the file).
+
+        Returns:
+            Credentials: The credentials, or None if no token file exists
+        """
+        with self._lock:
+            if self._credentials is None and self.token_file and os.path.exists(self.token_file):
+                self._credentials = Credentials.from_authorized_user_file(self.token_file, self.scopes)
+                self.logger.info(f"Loaded Gmail API token from {self.token_file}")
+            return self._credentials
+
+    def get_service(self):
+        """
+        Return the cached Gmail API service, building it on first use.
+
+        Returns:
+            googleapiclient.discovery.Resource: Gmail service, or None without credentials
+        """
+        credentials = self.load()
+        if credentials is None:
+            return None
+
+        with self._lock:
+            if self._service is None:
+                if not credentials.valid:
+                    self._refresh_locked()
+                self._service = build(
+                    'gmail', 'v1', credentials=credentials,
+                    cache_discovery=False, static_discovery=True
+                )
+            return self._service
+
+    def start(self):
+        """Start refreshing the token in the background."""
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        if self.load() is None:
+            return
+
+        self._stop_event.clear()
+        self._refresh_thread = threading.Thread(target=self._refresh_loop, name='token-refresh', daemon=True)
+        self._refresh_thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread."""
+        self._stop_event.set()
+        if self._refresh_thread:
+            self._refresh_thread.join(timeout=5.0)
+            self._refresh_thread = None
+
+    def seconds_until_refresh(self):
+        """
+        Seconds until the token should be refreshed.
+
+        Returns:
+            float: 0 if a refresh is due now
+        """
+        credentials = self._credentials
+        if credentials is None:
+            return float(self.refresh_margin)
+        if credentials.expiry is None:
+            # Unknown lifetime: refresh now to learn it
+            return 0.0
+        # google-auth stores expiry as a naive UTC datetime
+        remaining = (credentials.expiry - datetime.utcnow()).total_seconds()
+        return max(0.0, remaining - self.refresh_margin)
+
+    def _refresh_loop(self):
+        """Refresh the token ahead of its expiry until stopped."""
+        retry_delay = 30
+        while not self._stop_event.wait(self.seconds_until_refresh()):
+            try:
+                with self._lock:
+                    self._refresh_locked()
+                retry_delay = 30
+            except Exception as e:
+                self.logger.error(f"Gmail API token refresh failed: {e}")
+                if self._stop_event.wait(retry_delay):
+                    break
+                retry_delay = min(retry_delay * 2, 600)
+
+    def _refresh_locked(self):
+        """Refresh the access token and persist it. The caller must hold the lock."""
+        credentials = self._credentials
+        if not credentials.refresh_token:
+            raise ValueError("Gmail API token has no refresh token; re-authorize the application")
+        credentials.refresh(Request())
+        self._save_token(credentials)
+        self.logger.info(f"Refreshed Gmail API token, valid until {credentials.expiry}")
+
+    def _save_token(self, credentials):
+        """Write the token file atomically so a crash never leaves it truncated."""
+        directory = os.path.dirname(os.path.abspath(self.token_file))
+        fd, temp_path = tempfile.mkstemp(prefix='.token-', suffix='.json', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(credentials.to_json())
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(temp_path, 0o600)
+            os.replace(temp_path, self.token_file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
@@ -0,0 +1,164 @@
+import numpy as np
+
+from app.core.companies import CompanyMatcher
+from app.core.geo import LocationFilter
+from app.core.pay import annualize
+
+
+class JobCriteria:
+    """
+    Applies the configured job criteria to jobs from any source.
+
+    Email analyses and ZipRecruiter postings are both checked through this
+    class, so a job is judged the same way wherever it was found. Details a
+    job does not state (no pay, employment type, location or company)
+    never disqualify it; neither does a location missing from the gazetteer
+    unless ``accept_unknown_locations`` is off.
+    """
+
+    def __init__(self, criteria=None, search_radius=25, logger=None):
+        """
+        Initialize the criteria.
+
+        Args:
+            criteria: The ``criteria`` section of the Gmail configuration
+            search_radius: Miles from a required location that still match
+            logger: Logger for locations missing from the gazetteer (optional)
+        """
+        criteria = criteria or {}
+        self.pay_range_min = criteria.get('pay_range_min')
+        self.employment_types = set(criteria.get('employment_types') or [])
+        self.locations = LocationFilter(
+            criteria.get('location_requirements'), criteria.get('search_radius', search_radius),
+            accept_unknown=criteria.get('accept_unknown_locations', True), logger=logger
+        )
+        # Also used for companies already applied to, see exclude_company()
+        self.excluded_companies = CompanyMatcher(criteria.get('excluded_companies'))
+
+    @classmethod
+    def from_config(cls, config, logger=None):
+        """
+        Create the criteria from the application configuration.
+
+        Args:
+            config: Application configuration
+            logger: Logger for locations missing from the gazetteer (optional)
+
+        Returns:
+            JobCriteria: The criteria
+        """
+        return cls(
+            config.get('gmail', {}).get('criteria', {}),
+            config.get('ziprecruiter', {}).get('search_radius', 25),
+            logger
+        )
+
+    def pay_ok(self, pay_min, pay_max, period):
+        """
+        Check whether a pay range can reach the minimum annual pay.
+
+        Args:
+            pay_min: Lower bound (may be None)
+            pay_max: Upper bound (may be None)
+            period: Pay period of the bounds (may be None)
+
+        Returns:
+            bool: True if the annualized upper bound reaches ``pay_range_min`` or pay is unknown
+        """
+        if not self.pay_range_min:
+            return True
+        _, annual_max = annualize(pay_min, pay_max, period)
+        return annual_max is None or annual_max >= self.pay_range_min
+
+    def employment_type_ok(self, employment_type):
+        """Check whether an employment type is wanted (unknown types pass)."""
+        return not self.employment_types or not employment_type or employment_type in self.employment_types
+
+    def company_ok(self, company):
+        """Check that a company is not excluded (unknown companies pass)."""
+        return not company or self.excluded_companies.match(company) is None
+
+    def exclude_company(self, company):
+        """Exclude another company, e.g. one that has already been applied to."""
+        self.excluded_companies.add(company)
+
+    def location_ok(self, location):
+        """Check whether a free-text location meets the location requirements."""
+        return self.locations.matches(location)
+
+    def matches(self, job):
+        """
+        Check a JobRecord against every criterion.
+
+        Args:
+            job: JobRecord
+
+        Returns:
+            bool: True if the job meets the criteria
+        """
+        return (self.employment_type_ok(job.employment_type)
+                and self.pay_ok(job.pay_min, job.pay_max, job.pay_period)
+                and self.location_ok(job.location)
+                and self.company_ok(job.company))
+
+    def matches_email(self, result):
+        """
+        Check an email analysis against every criterion.
+
+        Args:
+            result: Analysis returned by GmailMonitor.analyze_email
+
+        Returns:
+            bool: True if the job meets the criteria
+        """
+        pay = result.get('pay') or (None, None, None)
+        return (self.employment_type_ok(result.get('employment_type')) and self.pay_ok(*pay)
+                and self.location_ok(result.get('location'))
+                and self.company_ok(result.get('company')))
+
+    def matches_posting(self, posting):
+        """
+        Check a ZipRecruiter posting against every criterion.
+
+        Args:
+            posting: Posting returned by the ZipRecruiter jobs API
+
+        Returns:
+            bool: True if the job meets the criteria
+        """
+        return (self.employment_type_ok(posting.get('employment_type'))
+                and self.pay_ok(posting.get('salary_min'), posting.get('salary_max'), posting.get('salary_interval'))
+                and self.location_ok(posting.get('location'))
+                and self.company_ok((posting.get('hiring_company') or {}).get('name')))
+
+    def filter_batch(self, batch):
+        """
+        Check every job of a JobBatch at once.
+
+        Args:
+            batch: JobBatch
+
+        Returns:
+            numpy.ndarray: Indices of the jobs that meet the criteria
+        """
+        keep = np.ones(len(batch), dtype=bool)
+        if self.employment_types:
+            codes = np.frombuffer(batch.employment_type, dtype=np.int32)
+            # Types no job has are skipped rather than added to the batch's table
+            allowed = [code for code in map(batch.strings.find, self.employment_types) if code is not None] + [-1]
+            keep &= np.isin(codes, allowed)
+        if self.pay_range_min:
+            _, annual_max = batch.annual_pay()
+            keep &= np.isnan(annual_max) | (annual_max >= self.pay_range_min)
+        if self.locations.requirements:
+            # Each distinct location is checked once
+            codes = np.frombuffer(batch.location, dtype=np.int32)
+            distinct, inverse = np.unique(codes, return_inverse=True)
+            allowed = np.array([self.location_ok(batch.strings.lookup(int(c))) for c in distinct], dtype=bool)
+            keep &= allowed[inverse]
+        if self.excluded_companies:
+            codes = np.frombuffer(batch.company, dtype=np.int32)
+            distinct, inverse = np.unique(codes, return_inverse=True)
+            allowed = np.array([self.company_ok(batch.strings.lookup(int(c))) for c in distinct], dtype=bool)
+            keep &= allowed[inverse]
+        return np.flatnonzero(keep)
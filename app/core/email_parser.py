@@ -0,0 +1,383 @@
+import re
+import email
+from email.header import Header, decode_header, make_header
+from email.utils import parseaddr
+from html.parser import HTMLParser
+
+# Employment-related keywords for identifying job emails
+JOB_KEYWORDS = [
+    # Job titles and positions
+    'job', 'position', 'role', 'career', 'opportunity', 'vacancy', 'opening',
+
+    # Application process
+    'application', 'interview', 'recruiter', 'hiring', 'apply',
+    'resume', 'cv', 'cover letter',
+
+    # Job details
+    'compensation', 'salary', 'pay rate', 'benefits', 'bonus',
+    'full-time', 'part-time', 'contract', 'permanent', 'temporary',
+    'remote', 'hybrid', 'on-site', 'on site', 'location',
+
+    # Requirements
+    'qualifications', 'requirements', 'responsibilities', 'duties',
+    'skills', 'experience', 'education', 'degree', 'certification',
+
+    # Company info
+    'company', 'employer', 'team', 'department', 'division'
+]
+
+# Regular expressions for extracting information.
+# PAY_REGEX groups: (min amount, min period, max amount, max period)
+PAY_REGEX = r'(?:salary|compensation|pay)(?:\s+is|\s+range)?(?:\s*:)?\s*(?:\$|USD)?\s*(\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?)\s*(?:\/|\s*(?:per|an?)\s*)?(hour|hr|yr|year|annum|month|mo|week|wk)?(?:\s*(?:-|to)\s*(?:\$|USD)?\s*(\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?))?\s*(?:\/|\s*(?:per|an?)\s*)?(hour|hr|yr|year|annum|month|mo|week|wk)?'
+EMPLOYMENT_TYPE_REGEX = r'(?:position|job|employment|work)\s+(?:type|status)(?:\s+is)?(?:\s*:)?\s*(full[ -]time|part[ -]time|contract|permanent|temporary|temp|freelance|intern|internship)'
+BENEFITS_REGEX = r'benefits(?:\s+include|\s+offered)?(?:\s*:)?\s*([^.]*)'
+# '<role> opportunity at <company>' and similar recruiter subjects
+ROLE_AT_COMPANY_REGEX = r'^(?:(?:re|fwd?)\s*:\s*)*(?P<role>.+?)\s+(?:opportunity|position|role|opening|job)\s+(?:at|with)\s+(?P<company>.+?)\s*$'
+# 'recruiter at <Company>' and similar introductions; the name runs to the end of the sentence
+COMPANY_REGEX = r'\b(?i:recruiter|recruiting|talent acquisition|hiring manager|hiring)\s+(?i:at|for|with)\s+([A-Z][^\n,;:!?()]{0,60}?)(?=\.\s|\.?$|[,;:!?()\n])'
+
+# 'Location: Austin, TX', 'based in Denver', '<role> position (Remote)' or 'remote role'.
+# A free-text location runs to the end of its sentence: a period ends it only when the
+# line ends or a capitalized word follows, and never after an abbreviation ('St. Louis', 'D.C.').
+LOCATION_REGEX = (
+    r'(?:\blocation(?:\s+is)?\s*:?|\bbased\s+in|\blocated\s+in)[ \t]*'
+    r'((?:\b(?-i:[A-Z][a-z]?)\.|[^\n.;()]|\.(?![ \t]*(?:\n|$)|\s+(?-i:[A-Z]))){2,60})'
+    r'|\b(?:position|role|job|opening)\s*\(([^()\n]{2,60})\)'
+    r'|\b((?:fully\s+)?remote|hybrid)\s+(?:position|role|job|opportunity|opening)'
+)
+
+# Mail providers whose domain says nothing about the sender's company
+FREE_MAIL_DOMAINS = {
+    'gmail.com', 'googlemail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'live.com',
+    'aol.com', 'icloud.com', 'me.com', 'protonmail.com', 'proton.me', 'gmx.com', 'mail.com',
+}
+
+
+def company_from_address(sender):
+    """
+    Guess a company from the domain of a sender address.
+
+    Args:
+        sender: Email address, with or without a display name (may be None)
+
+    Returns:
+        str: e.g. 'Globex' for recruiter@jobs.globex.com, or None for free mail providers
+    """
+    address = parseaddr(sender or '')[1]
+    if '@' not in address:
+        return None
+    domain = address.rsplit('@', 1)[1].lower()
+    if not domain or domain in FREE_MAIL_DOMAINS:
+        return None
+    return domain.split('.')[-2].capitalize() if '.' in domain else domain.capitalize()
+
+
+class JobEmailParser:
+    """
+    Classifies messages as job-related and extracts job details.
+
+    All patterns are compiled once. Keyword matching uses a single
+    alternation regex instead of one substring search per keyword, so the
+    cost of a scan is one pass over the text regardless of keyword count.
+    """
+
+    def __init__(self, job_keywords=None, min_keyword_matches=2):
+        """
+        Initialize the parser.
+
+        Args:
+            job_keywords: Keywords identifying job emails (defaults to JOB_KEYWORDS)
+            min_keyword_matches: Distinct keywords required to classify a message as job-related
+        """
+        self.job_keywords = list(job_keywords or JOB_KEYWORDS)
+        self.min_keyword_matches = min_keyword_matches
+
+        # Longest keywords first so multi-word phrases win over their prefixes
+        alternation = '|'.join(
+            re.escape(k) for k in sorted(self.job_keywords, key=len, reverse=True)
+        )
+        self.keyword_pattern = re.compile(r'\b(?:' + alternation + r')\b', re.IGNORECASE)
+        self.pay_pattern = re.compile(PAY_REGEX, re.IGNORECASE)
+        self.employment_type_pattern = re.compile(EMPLOYMENT_TYPE_REGEX, re.IGNORECASE)
+        self.benefits_pattern = re.compile(BENEFITS_REGEX, re.IGNORECASE)
+        self.role_at_company_pattern = re.compile(ROLE_AT_COMPANY_REGEX, re.IGNORECASE)
+        self.company_pattern = re.compile(COMPANY_REGEX)
+        self.location_pattern = re.compile(LOCATION_REGEX, re.IGNORECASE)
+
+    def match_keywords(self, text):
+        """
+        Find the job keywords present in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            set: Lower-cased keywords found in the text
+        """
+        return {m.lower() for m in self.keyword_pattern.findall(text)}
+
+    def is_job_email(self, subject, body):
+        """
+        Decide whether a message looks job-related.
+
+        Args:
+            subject: Message subject
+            body: Plain-text message body
+
+        Returns:
+            bool: True if enough distinct job keywords are present
+        """
+        found = set()
+        for m in self.keyword_pattern.finditer(f"{subject}\n{body}"):
+            found.add(m.group(0).lower())
+            if len(found) >= self.min_keyword_matches:
+                return True
+        return False
+
+    def extract_pay(self, text):
+        """
+        Extract a pay range from a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            tuple: (min_amount, max_amount, period) or None if no pay was found.
+                max_amount and period may be None.
+        """
+        match = self.pay_pattern.search(text)
+        if not match:
+            return None
+
+        low, low_period, high, high_period = match.groups()
+        period = (high_period or low_period)
+        return (
+            float(low.replace(',', '')),
+            float(high.replace(',', '')) if high else None,
+            period.lower() if period else None
+        )
+
+    def extract_employment_type(self, text):
+        """
+        Extract the employment type (e.g. 'full-time') from a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            str: Normalized employment type or None
+        """
+        match = self.employment_type_pattern.search(text)
+        if not match:
+            return None
+        return match.group(1).lower().replace(' ', '-')
+
+    def extract_benefits(self, text):
+        """
+        Extract the benefits sentence from a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            str: Benefits description or None
+        """
+        match = self.benefits_pattern.search(text)
+        if not match:
+            return None
+        return match.group(1).strip() or None
+
+    def extract_company(self, subject, body, sender=None):
+        """
+        Extract the hiring company of a job email.
+
+        The subject ('<role> opportunity at <company>') is tried first, then
+        the body ('recruiter at <Company>'), then the sender's domain.
+
+        Args:
+            subject: Message subject
+            body: Plain-text message body
+            sender: Sender address (optional)
+
+        Returns:
+            str: Company name or None
+        """
+        match = self.role_at_company_pattern.match(subject or '')
+        if match:
+            return match.group('company')
+        match = self.company_pattern.search(body or '')
+        if match:
+            return match.group(1).strip()
+        return company_from_address(sender)
+
+    def extract_location(self, text):
+        """
+        Extract the job location from a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            str: Free-text location (e.g. 'Austin, TX' or 'Remote') or None
+        """
+        match = self.location_pattern.search(text)
+        if not match:
+            return None
+        location = next(group for group in match.groups() if group is not None)
+        return location.strip() or None
+
+    def analyze(self, subject, body, is_job=None, sender=None):
+        """
+        Classify a message and extract job details.
+
+        Args:
+            subject: Message subject
+            body: Plain-text message body
+            is_job: Classification made elsewhere (e.g. by JobEmailClassifier);
+                keywords decide if omitted
+            sender: Sender address, used to guess the company (optional)
+
+        Returns:
+            dict: Analysis with 'is_job', 'pay', 'employment_type', 'benefits', 'company'
+                and 'location' keys
+        """
+        if is_job is None:
+            is_job = self.is_job_email(subject, body)
+        if not is_job:
+            return {'is_job': False, 'pay': None, 'employment_type': None, 'benefits': None,
+                    'company': None, 'location': None}
+
+        return {
+            'is_job': True,
+            'pay': self.extract_pay(body),
+            'employment_type': self.extract_employment_type(body),
+            'benefits': self.extract_benefits(body),
+            'company': self.extract_company(subject, body, sender),
+            'location': self.extract_location(f"{subject}\n{body}")
+        }
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """Collects the visible text of an HTML document."""
+
+    BLOCK_TAGS = {'p', 'div', 'br', 'li', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+    SKIP_TAGS = {'script', 'style', 'head'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_to_text(html):
+    """
+    Convert an HTML document to plain text.
+
+    Args:
+        html: HTML source
+
+    Returns:
+        str: Visible text with block elements separated by newlines
+    """
+    extractor = _HTMLTextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    text = ''.join(extractor.parts)
+    return re.sub(r'\n\s*\n+', '\n\n', re.sub(r'[ \t]+', ' ', text)).strip()
+
+
+def _decode_bytes(data):
+    """Decode header bytes of unknown charset: UTF-8 if valid, else Latin-1."""
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data.decode('latin-1')
+
+
+def _decode_header(value):
+    """Decode RFC 2047 encoded words in a header value."""
+    if value is None:
+        return ''
+    if isinstance(value, Header):
+        # compat32 returns headers with raw 8-bit bytes as Header objects
+        value = ''.join(
+            chunk if isinstance(chunk, str) else _decode_bytes(chunk)
+            for chunk, _ in decode_header(value)
+        )
+    if '=?' not in value:
+        return value
+    try:
+        return str(make_header(decode_header(value)))
+    except (LookupError, UnicodeDecodeError, ValueError):
+        return value
+
+
+def _part_text(part):
+    """Decode the payload of a text part using its declared charset."""
+    payload = part.get_payload(decode=True) or b''
+    charset = part.get_content_charset() or 'utf-8'
+    try:
+        return payload.decode(charset, errors='replace')
+    except LookupError:
+        return payload.decode('utf-8', errors='replace')
+
+
+def parse_raw_message(raw):
+    """
+    Parse an RFC 822 message into a compact record.
+
+    The plain-text part is preferred; if the message only has an HTML body
+    it is converted to text. The legacy compat32 policy is used because it
+    is roughly ten times faster than the modern policy; headers are decoded
+    explicitly instead.
+
+    Args:
+        raw: Raw message bytes
+
+    Returns:
+        dict: Record with 'message_id', 'from', 'reply_to', 'subject', 'date' and 'body' keys
+    """
+    message = email.message_from_bytes(raw)
+
+    plain = None
+    html = None
+    for part in message.walk():
+        if part.is_multipart() or _decode_header(part.get('Content-Disposition')).lower().startswith('attachment'):
+            continue
+        content_type = part.get_content_type()
+        if content_type == 'text/plain' and plain is None:
+            plain = part
+            break
+        if content_type == 'text/html' and html is None:
+            html = part
+
+    if plain is not None:
+        body = _part_text(plain)
+    elif html is not None:
+        body = html_to_text(_part_text(html))
+    else:
+        body = ''
+
+    sender = _decode_header(message.get('From'))
+    return {
+        'message_id': _decode_header(message.get('Message-ID')).strip(),
+        'from': sender,
+        'reply_to': parseaddr(_decode_header(message.get('Reply-To')) or sender)[1],
+        'subject': _decode_header(message.get('Subject')),
+        'date': _decode_header(message.get('Date')),
+        'body': body.replace('\r\n', '\n')
+    }
@@ -0,0 +1,37 @@
+"""
+Worker event definitions shared by the background services and the UI.
+
+Background threads (Gmail monitoring, job search) report what they are doing
+by calling an ``event_callback`` with one of the event kinds below. The
+callback is expected to be cheap and thread-safe; the UI installs
+``EventBridge.post`` so that events are queued and delivered to the Qt
+thread in batches.
+"""
+import time
+from collections import namedtuple
+
+# Event kinds
+EVENT_NEW_JOB = 'new_job'
+EVENT_REPLY_SENT = 'reply_sent'
+EVENT_APPLIED = 'applied'
+EVENT_ERROR = 'error'
+EVENT_PROGRESS = 'progress'
+EVENT_CLASSIFIER_UPDATED = 'classifier_updated'
+EVENT_PROFILING = 'profiling'
+
+WorkerEvent = namedtuple('WorkerEvent', ['kind', 'source', 'data', 'timestamp'])
+
+
+def make_event(kind, source, **data):
+    """
+    Create a worker event stamped with the current time.
+
+    Args:
+        kind: One of the EVENT_* constants
+        source: Name of the emitting service (e.g. 'gmail', 'ziprecruiter')
+        **data: Event payload
+
+    Returns:
+        WorkerEvent: The new event
+    """
+    return WorkerEvent(kind, source, data, time.time())
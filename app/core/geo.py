@@ -0,0 +1,366 @@
+import csv
+import math
+import os
+import re
+from collections import Counter, namedtuple
+
+import numpy as np
+
+DEFAULT_GAZETTEER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'resources', 'gazetteer.csv')
+
+EARTH_RADIUS_MILES = 3958.8
+
+REMOTE_RE = re.compile(r'\b(?:remote|work from home|wfh|telecommute|anywhere)\b', re.IGNORECASE)
+HYBRID_RE = re.compile(r'\bhybrid\b', re.IGNORECASE)
+ZIP_RE = re.compile(r'\b(\d{5})(?:-\d{4})?\b')
+_TAG_RE = re.compile(r'\b(?:remote|hybrid|work from home|wfh|telecommute|anywhere|on-?site|in office)\b', re.IGNORECASE)
+_PUNCTUATION_RE = re.compile(r'[^\w\s,]')
+_SPACE_RE = re.compile(r'\s+')
+
+STATE_ABBREVIATIONS = {
+    'alabama': 'al', 'alaska': 'ak', 'arizona': 'az', 'arkansas': 'ar', 'california': 'ca',
+    'colorado': 'co', 'connecticut': 'ct', 'delaware': 'de', 'district of columbia': 'dc',
+    'florida': 'fl', 'georgia': 'ga', 'hawaii': 'hi', 'idaho': 'id', 'illinois': 'il',
+    'indiana': 'in', 'iowa': 'ia', 'kansas': 'ks', 'kentucky': 'ky', 'louisiana': 'la',
+    'maine': 'me', 'maryland': 'md', 'massachusetts': 'ma', 'michigan': 'mi', 'minnesota': 'mn',
+    'mississippi': 'ms', 'missouri': 'mo', 'montana': 'mt', 'nebraska': 'ne', 'nevada': 'nv',
+    'new hampshire': 'nh', 'new jersey': 'nj', 'new mexico': 'nm', 'new york': 'ny',
+    'north carolina': 'nc', 'north dakota': 'nd', 'ohio': 'oh', 'oklahoma': 'ok', 'oregon': 'or',
+    'pennsylvania': 'pa', 'rhode island': 'ri', 'south carolina': 'sc', 'south dakota': 'sd',
+    'tennessee': 'tn', 'texas': 'tx', 'utah': 'ut', 'vermont': 'vt', 'virginia': 'va',
+    'washington': 'wa', 'west virginia': 'wv', 'wisconsin': 'wi', 'wyoming': 'wy',
+}
+
+# Common short forms of city names
+CITY_ALIASES = {
+    'nyc': 'new york', 'manhattan': 'new york', 'sf': 'san francisco', 'la': 'los angeles',
+    'dc': 'washington', 'philly': 'philadelphia', 'saint louis': 'st louis', 'saint paul': 'st paul',
+    'saint petersburg': 'st petersburg',
+}
+
+# Bound on the number of distinct location strings kept in a resolve cache
+CACHE_SIZE = 100000
+
+Place = namedtuple('Place', ['index', 'city', 'state', 'zip', 'latitude', 'longitude'])
+
+# remote/hybrid tags of a location string and the place it names (None if unknown)
+LocationInfo = namedtuple('LocationInfo', ['remote', 'hybrid', 'place'])
+
+
+def normalize_place_name(text):
+    """
+    Normalize a free-text place name for lookup.
+
+    Args:
+        text: Place name, e.g. 'St. Louis, Missouri'
+
+    Returns:
+        tuple: (city, state abbreviation or None), e.g. ('st louis', 'mo')
+    """
+    text = _PUNCTUATION_RE.sub(' ', text.lower())
+    parts = [_SPACE_RE.sub(' ', part).strip() for part in text.split(',')]
+    parts = [part for part in parts if part]
+    if not parts:
+        return '', None
+
+    city = CITY_ALIASES.get(parts[0], parts[0])
+    state = None
+    if len(parts) > 1:
+        # 'Austin, TX 78701' and 'Austin, TX, US' both end up as 'tx'
+        words = parts[1].split()
+        candidate = ' '.join(w for w in words if not w.isdigit())
+        state = STATE_ABBREVIATIONS.get(candidate, candidate if len(candidate) == 2 else None)
+    return city, state
+
+
+def _unit_vector(latitude, longitude):
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def _chord_length(miles):
+    """Straight-line distance on the unit sphere for a great-circle distance."""
+    return 2.0 * math.sin(min(miles / EARTH_RADIUS_MILES, math.pi) / 2.0)
+
+
+def haversine_miles(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance between two points.
+
+    Returns:
+        float: Distance in miles
+    """
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+class KDTree:
+    """
+    Static 3-d tree over points on the unit sphere.
+
+    Points are stored as unit vectors, so a great-circle radius becomes a
+    plain Euclidean (chord) radius and no special handling of the date line
+    or the poles is needed.
+    """
+
+    def __init__(self, points):
+        """
+        Build the tree.
+
+        Args:
+            points: (n, 3) array of unit vectors
+        """
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self._root = self._build(np.arange(len(self.points)), 0)
+
+    def _build(self, rows, depth):
+        if len(rows) == 0:
+            return None
+        axis = depth % 3
+        rows = rows[np.argsort(self.points[rows, axis], kind='stable')]
+        middle = len(rows) // 2
+        return (rows[middle], axis,
+                self._build(rows[:middle], depth + 1),
+                self._build(rows[middle + 1:], depth + 1))
+
+    def query_radius(self, point, radius):
+        """
+        Find the points within ``radius`` of ``point``.
+
+        Args:
+            point: Unit vector
+            radius: Chord radius
+
+        Returns:
+            list: Indices of the points found
+        """
+        found = []
+        squared = radius * radius
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            row, axis, left, right = node
+            delta = self.points[row] - point
+            if float(delta @ delta) <= squared:
+                found.append(int(row))
+            offset = point[axis] - self.points[row, axis]
+            near, far = (left, right) if offset < 0 else (right, left)
+            stack.append(near)
+            if abs(offset) <= radius:
+                stack.append(far)
+        return found
+
+
+class Gazetteer:
+    """
+    Offline lookup of US places by name or ZIP code.
+
+    Places come from a bundled CSV (city, state, ZIP, latitude, longitude).
+    Location strings are resolved to a place once and cached, and a KDTree
+    over the places answers radius queries without any geocoding service.
+    """
+
+    def __init__(self, path=DEFAULT_GAZETTEER):
+        """
+        Load the gazetteer.
+
+        Args:
+            path: CSV file with city, state, zip, latitude and longitude columns
+        """
+        self.places = []
+        self.by_zip = {}
+        self.by_zip3 = {}
+        self.by_name = {}
+        self.by_city = {}
+        self._cache = {}
+
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                place = Place(len(self.places), row['city'], row['state'], row['zip'],
+                              float(row['latitude']), float(row['longitude']))
+                self.places.append(place)
+                city, state = normalize_place_name(f"{place.city}, {place.state}")
+                self.by_name[(city, state)] = place
+                # Ambiguous names without a state go to the first (largest) listed place
+                self.by_city.setdefault(city, place)
+                self.by_zip[place.zip] = place
+                self.by_zip3.setdefault(place.zip[:3], place)
+
+        self.tree = KDTree([_unit_vector(p.latitude, p.longitude) for p in self.places])
+
+    def lookup(self, text):
+        """
+        Find the place a location string names.
+
+        Args:
+            text: Location string with remote/hybrid tags removed
+
+        Returns:
+            Place: The place, or None if unknown
+        """
+        zip_match = ZIP_RE.search(text)
+        if zip_match:
+            code = zip_match.group(1)
+            place = self.by_zip.get(code) or self.by_zip3.get(code[:3])
+            if place:
+                return place
+
+        city, state = normalize_place_name(text)
+        if not city:
+            return None
+        if state:
+            place = self.by_name.get((city, state))
+            if place:
+                return place
+        return self.by_city.get(city)
+
+    def resolve(self, text):
+        """
+        Resolve a free-text job location (cached).
+
+        Args:
+            text: Location such as 'Austin, TX', 'Remote' or 'Hybrid - Atlanta, GA'
+
+        Returns:
+            LocationInfo: remote/hybrid tags and the place, if known
+        """
+        info = self._cache.get(text)
+        if info is None:
+            if len(self._cache) >= CACHE_SIZE:
+                self._cache.clear()
+            remote = bool(REMOTE_RE.search(text))
+            hybrid = bool(HYBRID_RE.search(text))
+            remainder = _TAG_RE.sub(' ', text).strip(' -/()|,')
+            info = LocationInfo(remote, hybrid, self.lookup(remainder) if remainder else None)
+            self._cache[text] = info
+        return info
+
+    def places_within(self, place, miles):
+        """
+        Find the places within a distance of a place.
+
+        Args:
+            place: Center Place
+            miles: Radius in miles
+
+        Returns:
+            list: Places within the radius, including ``place`` itself
+        """
+        center = np.array(_unit_vector(place.latitude, place.longitude))
+        return [self.places[i] for i in self.tree.query_radius(center, _chord_length(miles))]
+
+
+_default_gazetteer = None
+
+
+def get_gazetteer():
+    """Return the gazetteer loaded from the bundled CSV (loaded on first use)."""
+    global _default_gazetteer
+    if _default_gazetteer is None:
+        _default_gazetteer = Gazetteer()
+    return _default_gazetteer
+
+
+class LocationFilter:
+    """
+    Checks job locations against ``location_requirements``.
+
+    Requirements are 'remote', 'hybrid' and place names or ZIP codes. A job
+    passes if it is remote and 'remote' is required, if it is hybrid and
+    'hybrid' is required (and it is near a required place, when places are
+    given), or if it is within ``radius_miles`` of any required place. Jobs
+    whose location is not in the gazetteer pass unless ``accept_unknown`` is
+    off; either way each such location is counted in ``unresolved`` and
+    logged once, so gaps in the gazetteer show up.
+
+    The places near the required ones are computed once with the KDTree, so
+    checking a job is a cached lookup and a set membership test.
+    """
+
+    def __init__(self, requirements, radius_miles=25, gazetteer=None, accept_unknown=True, logger=None):
+        """
+        Initialize the filter.
+
+        Args:
+            requirements: List of 'remote', 'hybrid' and place names / ZIP codes
+            radius_miles: Distance from a required place that still matches
+            gazetteer: Gazetteer to use (defaults to the bundled one)
+            accept_unknown: Whether jobs at places missing from the gazetteer pass
+            logger: Logger for locations missing from the gazetteer (optional)
+        """
+        self.requirements = [r for r in (requirements or []) if r]
+        self.radius_miles = radius_miles
+        self.accept_unknown = accept_unknown
+        self.logger = logger
+        # Location string -> number of checks of it, for places the gazetteer does not know
+        self.unresolved = Counter()
+        self.allow_remote = False
+        self.allow_hybrid = False
+        self.home_places = []
+        self._nearby = set()
+        self._cache = {}
+
+        if not self.requirements:
+            return
+        self.gazetteer = gazetteer or get_gazetteer()
+
+        for requirement in self.requirements:
+            info = self.gazetteer.resolve(requirement)
+            self.allow_remote |= info.remote
+            self.allow_hybrid |= info.hybrid
+            if info.place:
+                self.home_places.append(info.place)
+            elif not (info.remote or info.hybrid) and self.logger:
+                self.logger.warning(f"Location requirement {requirement!r} is not in the gazetteer and is ignored")
+        for place in self.home_places:
+            self._nearby.update(p.index for p in self.gazetteer.places_within(place, radius_miles))
+
+    def matches(self, location):
+        """
+        Check a job location.
+
+        Args:
+            location: Free-text job location (may be None)
+
+        Returns:
+            bool: True if the location meets the requirements
+        """
+        if not self.requirements or not location:
+            return True
+        cached = self._cache.get(location)
+        if cached is None:
+            if len(self._cache) >= CACHE_SIZE:
+                self._cache.clear()
+            info = self.gazetteer.resolve(location)
+            # A bare 'Hybrid' names no place, so there is nothing to look up
+            named = bool(_TAG_RE.sub(' ', location).strip(' -/()|,'))
+            cached = (self._evaluate(info), info.place is None and not info.remote and named)
+            self._cache[location] = cached
+        result, unknown = cached
+        if unknown:
+            self._count_unresolved(location, result)
+        return result
+
+    def _count_unresolved(self, location, accepted):
+        if location not in self.unresolved:
+            if len(self.unresolved) >= CACHE_SIZE:
+                return
+            if self.logger:
+                self.logger.info(f"Job location {location!r} is not in the gazetteer, "
+                                 f"{'accepting' if accepted else 'rejecting'} it")
+        self.unresolved[location] += 1
+
+    def _evaluate(self, info):
+        if info.remote:
+            return self.allow_remote
+        if info.place is None:
+            near = self.accept_unknown
+        else:
+            near = info.place.index in self._nearby
+        if info.hybrid and self.allow_hybrid:
+            return near or not self.home_places
+        return near
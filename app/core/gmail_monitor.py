@@ -5,6 +5,9 @@ import email
 import re
 import threading
 import smtplib
+import imaplib
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 from email.mime.text import MIMEText
@@ -18,6 +21,17 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from app.core.events import EVENT_NEW_JOB, EVENT_REPLY_SENT, EVENT_ERROR, EVENT_PROGRESS, EVENT_CLASSIFIER_UPDATED
+from app.core.email_parser import JobEmailParser, PAY_REGEX, EMPLOYMENT_TYPE_REGEX, BENEFITS_REGEX
+from app.core.classifier import JOB, NOT_JOB, DEFAULT_MODEL_PATH, shared_classifier
+from app.core.responder import ReplyBuilder
+from app.core.templates import TemplateError, reply_context
+from app.core.checkpoint import Checkpoint
+from app.core.parse_pool import ParallelMessageParser
+from app.core.credentials import CredentialManager
+from app.core.criteria import JobCriteria
+from app.utils import profiling
+
 class GmailMonitor:
     """
     Gmail monitoring and automated response class.
@@ -47,9 +61,14 @@ class GmailMonitor:
         self.config = config
         self.logger = logger
         self.service = None
+        self.imap = None
+        self.smtp = None
         self.monitor_thread = None
         self.stop_event = threading.Event()
         
+        # Optional callable(kind, source, **data) used to report progress to the UI
+        self.event_callback = None
+        
         # Load Gmail configuration
         self.gmail_config = config.get('gmail', {})
         
@@ -57,32 +76,71 @@ class GmailMonitor:
         self.email = self.gmail_config.get('email')
         self.password = self.gmail_config.get('password')
         
-        # Employment-related keywords for identifying job emails
-        self.job_keywords = [
-            # Job titles and positions
-            'job', 'position', 'role', 'career', 'opportunity', 'vacancy', 'opening',
-            
-            # Application process
-            'application', 'interview', 'recruiter', 'hiring', 'apply',
-            'resume', 'cv', 'cover letter',
-            
-            # Job details
-            'compensation', 'salary', 'pay rate', 'benefits', 'bonus',
-            'full-time', 'part-time', 'contract', 'permanent', 'temporary',
-            'remote', 'hybrid', 'on-site', 'on site', 'location',
-            
-            # Requirements
-            'qualifications', 'requirements', 'responsibilities', 'duties',
-            'skills', 'experience', 'education', 'degree', 'certification',
-            
-            # Company info
-            'company', 'employer', 'team', 'department', 'division'
-        ]
+        # Job email classification and detail extraction
+        self.parser = JobEmailParser()
+        self.job_keywords = self.parser.job_keywords
+        self.pay_regex = PAY_REGEX
+        self.employment_type_regex = EMPLOYMENT_TYPE_REGEX
+        self.benefits_regex = BENEFITS_REGEX
+        
+        # Model trained from the messages the user labels in the UI. It
+        # replaces keyword matching once it has learned 'min_labels'
+        # messages of each class.
+        self.classifier_config = self.gmail_config.get('classifier', {})
+        self.classifier_path = self.classifier_config.get('model_path') or DEFAULT_MODEL_PATH
+        self.classifier = self._load_classifier()
+        
+        # Recently classified messages, offered in the UI for labeling. The
+        # monitor thread appends while the UI reads, so both hold the lock.
+        self.recent_messages = deque(maxlen=self.classifier_config.get('review_size', 200))
+        self._recent_lock = threading.Lock()
+        
+        # Pay, employment type, ... requirements a job must meet to be answered
+        self.criteria = JobCriteria.from_config(config, self.logger)
+        
+        # Reply construction (template compiled and resume encoded once)
+        template = self.gmail_config.get('response_template', '')
+        try:
+            self.reply_builder = ReplyBuilder(self.email, template, self.gmail_config.get('resume_path'))
+        except TemplateError as e:
+            self.logger.error(f"Invalid response template, sending it without personalization: {e}")
+            escaped = template.replace('{', '{{').replace('}', '}}')
+            self.reply_builder = ReplyBuilder(self.email, escaped, self.gmail_config.get('resume_path'))
+        
+        # MIME parsing, moved to a process pool for large backlogs
+        self.message_parser = ParallelMessageParser(
+            threshold=self.gmail_config.get('parse_pool_threshold', 1000),
+            chunk_size=self.gmail_config.get('parse_chunk_size', 50),
+            max_workers=self.gmail_config.get('parse_workers')
+        )
         
-        # Regular expressions for extracting information
-        self.pay_regex = r'(?:salary|compensation|pay)(?:\s+is|\s+range)?(?:\s*:)?\s*(?:\$|USD)?\s*(\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?)\s*(?:\/|\s*(?:per|an?)\s*)?(?:hour|hr|yr|year|annum|month|mo|week|wk)?(?:\s*(?:-|to)\s*(?:\$|USD)?\s*(\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?))?\s*(?:\/|\s*(?:per|an?)\s*)?(?:hour|hr|yr|year|annum|month|mo|week|wk)?'
-        self.employment_type_regex = r'(?:position|job|employment|work)\s+(?:type|status)(?:\s+is)?(?:\s*:)?\s*(full[ -]time|part[ -]time|contract|permanent|temporary|temp|freelance|intern|internship)'
-        self.benefits_regex = r'benefits(?:\s+include|\s+offered)?(?:\s*:)?\s*([^.]*)'
+        # OAuth token and Gmail API service, loaded once and refreshed ahead of expiry
+        self.credential_manager = CredentialManager(
+            self.gmail_config.get('token_file'),
+            self.SCOPES,
+            logger,
+            refresh_margin=self.gmail_config.get('token_refresh_margin', 600)
+        )
+        
+        # (email, password, host) of the last successful SMTP login
+        self._smtp_verified = None
+        
+        # Highest IMAP UID processed so far
+        self.last_uid = 0
+        
+        # Fetched messages left unclassified and replies not sent yet at shutdown.
+        # Both are kept in the checkpoint with the UID cursor, so a restart
+        # resumes where the previous run stopped.
+        self.pending_messages = []
+        self.queued_replies = []
+        self.checkpoint = Checkpoint.for_account(
+            self.gmail_config, 'gmail', self.gmail_config.get('checkpoint_name') or self.email
+        )
+        self._drain_deadline = None
+        self._restore_checkpoint()
+        
+        # Per-stage timings: stage name -> [count, total seconds]
+        self.stage_stats = {}
         
     def authenticate(self):
         """
@@ -97,38 +155,41 @@ class GmailMonitor:
                 return False
                 
             self.logger.info(f"Authenticating with Gmail using email: {self.email}")
+            self.reply_builder.sender = self.email
+            
+            # For SMTP-based email interactions. A successful login is remembered
+            # so that restarting monitoring with the same credentials is instant.
+            smtp_key = (self.email, self.password, self.gmail_config.get('smtp_host', 'smtp.gmail.com'))
+            if self._smtp_verified != smtp_key:
+                try:
+                    # Log authentication attempt
+                    self.logger.info(f"Attempting SMTP login for {self.email}")
+                    
+                    # Try authentication - for Gmail this requires an app password if 2FA is enabled
+                    # Regular password will not work with 2FA enabled
+                    smtp_server = self._open_smtp()
+                    smtp_server.quit()
+                    self._smtp_verified = smtp_key
+                    self.logger.info("SMTP Authentication successful")
+                except smtplib.SMTPAuthenticationError as auth_err:
+                    self.logger.error(f"SMTP Authentication failed: {auth_err}")
+                    self.logger.info("If you have 2FA enabled on your Google account, please use an App Password instead of your regular password.")
+                    self.logger.info("You can generate an App Password at: https://myaccount.google.com/apppasswords")
+                    return False
+                except Exception as e:
+                    self.logger.error(f"SMTP connection error: {e}")
+                    return False
             
-            # For SMTP-based email interactions
+            # For API-based operations, use the cached OAuth token and service.
+            # The token is loaded and the service built only once; afterwards the
+            # token is refreshed in the background before it expires.
             try:
-                smtp_server = smtplib.SMTP('smtp.gmail.com', 587)
-                smtp_server.starttls()
-                
-                # Log authentication attempt
-                self.logger.info(f"Attempting SMTP login for {self.email}")
-                
-                # Try authentication - for Gmail this requires an app password if 2FA is enabled
-                # Regular password will not work with 2FA enabled
-                smtp_server.login(self.email, self.password)
-                smtp_server.quit()
-                self.logger.info("SMTP Authentication successful")
-            except smtplib.SMTPAuthenticationError as auth_err:
-                self.logger.error(f"SMTP Authentication failed: {auth_err}")
-                self.logger.info("If you have 2FA enabled on your Google account, please use an App Password instead of your regular password.")
-                self.logger.info("You can generate an App Password at: https://myaccount.google.com/apppasswords")
-                return False
+                self.service = self.credential_manager.get_service()
+                if self.service is not None:
+                    self.credential_manager.start()
+                    self.logger.info("Gmail API access ready")
             except Exception as e:
-                self.logger.error(f"SMTP connection error: {e}")
-                return False
-                
-            # For API-based operations, continue with the Google API flow
-            # This would use the provided OAuth credentials file too
-            credentials_file = self.gmail_config.get('credentials_file')
-            token_file = self.gmail_config.get('token_file')
-            
-            # Initialize for API access as well if credentials file is available
-            if credentials_file and os.path.exists(credentials_file):
-                self.logger.info("Setting up Gmail API access")
-                # This would be expanded in a production environment
+                self.logger.error(f"Gmail API setup failed, continuing with IMAP/SMTP only: {e}")
             
             return True
             
@@ -149,6 +210,7 @@ class GmailMonitor:
         
         # Reset stop event
         self.stop_event.clear()
+        self._drain_deadline = None
         
         # Start monitoring in a separate thread
         self.monitor_thread = threading.Thread(
@@ -164,35 +226,614 @@ class GmailMonitor:
         scan_interval = self.gmail_config.get('scan_interval', 300)  # Default 5 minutes
         
         self.logger.info(f"Gmail monitor running with scan interval of {scan_interval} seconds")
-        
+        if self.classifier_active():
+            job_labels, other_labels = self.classifier.label_counts
+            self.logger.info(f"Classifying emails with the trained model ({job_labels} job / {other_labels} other labels)")
+
         while not self.stop_event.is_set():
             try:
                 self.logger.info("Scanning emails for job opportunities...")
+                self._emit_event(EVENT_PROGRESS, message="Scanning emails for job opportunities...")
                 
-                # Actual email scanning code would go here
-                # This is where we would use the Gmail API or IMAP to check emails
+                jobs = self.scan_emails()
+                
+                self._emit_event(EVENT_PROGRESS, message=f"Scan complete: {len(jobs)} job emails found")
                 
                 # Wait for the next scan interval or until stop is requested
                 self.stop_event.wait(scan_interval)
                 
             except Exception as e:
                 self.logger.exception(f"Error in email monitoring loop: {e}")
+                self._emit_event(EVENT_ERROR, message=str(e))
+                # Drop connections so the next attempt reconnects
+                self._disconnect()
                 # Wait for a short time before retrying
                 self.stop_event.wait(60)
+        
+        self._disconnect()
+        self.message_parser.shutdown()
+    
+    def _open_smtp(self):
+        """
+        Open an authenticated SMTP connection.
+        
+        Returns:
+            smtplib.SMTP: Logged-in SMTP connection
+        """
+        smtp_server = smtplib.SMTP(
+            self.gmail_config.get('smtp_host', 'smtp.gmail.com'),
+            self.gmail_config.get('smtp_port', 587)
+        )
+        if self.gmail_config.get('smtp_starttls', True):
+            smtp_server.starttls()
+        smtp_server.login(self.email, self.password)
+        return smtp_server
+    
+    def _get_smtp(self):
+        """
+        Return an open SMTP connection, reusing the previous one when it is still alive.
+        
+        Returns:
+            smtplib.SMTP: Logged-in SMTP connection
+        """
+        if self.smtp is not None:
+            try:
+                if self.smtp.noop()[0] == 250:
+                    return self.smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+        self.smtp = self._open_smtp()
+        return self.smtp
+    
+    def _connect_imap(self):
+        """
+        Return an IMAP connection with the inbox selected, reusing the previous one when possible.
+        
+        Returns:
+            imaplib.IMAP4: Logged-in IMAP connection
+        """
+        if self.imap is not None:
+            try:
+                self.imap.noop()
+                return self.imap
+            except (imaplib.IMAP4.error, OSError):
+                self.imap = None
+        
+        host = self.gmail_config.get('imap_host', 'imap.gmail.com')
+        port = self.gmail_config.get('imap_port', 993)
+        if self.gmail_config.get('imap_ssl', True):
+            imap = imaplib.IMAP4_SSL(host, port)
+        else:
+            imap = imaplib.IMAP4(host, port)
+        imap.login(self.email, self.password)
+        imap.select('INBOX')
+        self.imap = imap
+        return imap
+    
+    def _disconnect(self):
+        """Close the IMAP and SMTP connections, ignoring errors."""
+        if self.imap is not None:
+            try:
+                self.imap.logout()
+            except (imaplib.IMAP4.error, OSError):
+                pass
+            self.imap = None
+        if self.smtp is not None:
+            try:
+                self.smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.smtp = None
+    
+    @contextmanager
+    def _timed(self, stage):
+        """Accumulate the duration of a pipeline stage in stage_stats."""
+        profiling.checkpoint()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats = self.stage_stats.setdefault(stage, [0, 0.0])
+            stats[0] += 1
+            stats[1] += time.perf_counter() - start
+    
+    def fetch_new_message_uids(self):
+        """
+        List the UIDs of messages that arrived since the last scan.
+        
+        The UID range is searched in windows of ``search_window`` UIDs so that
+        large mailboxes never produce a single huge SEARCH response. On the
+        first scan only messages from the last ``initial_sync_days`` days are listed.
+        
+        Returns:
+            list: Message UIDs in ascending order
+        """
+        imap = self._connect_imap()
+        window = self.gmail_config.get('search_window', 50000)
+        
+        status, data = imap.status('INBOX', '(UIDNEXT)')
+        if status != 'OK':
+            raise imaplib.IMAP4.error(f"STATUS failed: {data}")
+        uid_next = int(re.search(rb'UIDNEXT (\d+)', data[0]).group(1))
+        
+        criteria = ''
+        if not self.last_uid:
+            days = self.gmail_config.get('initial_sync_days', 7)
+            since = (datetime.now() - timedelta(days=days)).strftime('%d-%b-%Y')
+            criteria = f' SINCE {since}'
+        
+        uids = []
+        for low in range(self.last_uid + 1, uid_next, window):
+            high = min(low + window - 1, uid_next - 1)
+            status, data = imap.uid('search', None, f'UID {low}:{high}{criteria}')
+            if status != 'OK':
+                raise imaplib.IMAP4.error(f"UID SEARCH failed: {data}")
+            uids.extend(int(uid) for uid in data[0].split())
+        
+        return sorted(uid for uid in uids if uid > self.last_uid)
+    
+    def fetch_messages(self, uids):
+        """
+        Download raw messages without marking them as read.
+        
+        Args:
+            uids: Message UIDs to fetch
+        
+        Returns:
+            list: (uid, raw bytes) tuples
+        """
+        if not uids:
+            return []
+        
+        imap = self._connect_imap()
+        status, data = imap.uid('fetch', ','.join(str(uid) for uid in uids), '(UID BODY.PEEK[])')
+        if status != 'OK':
+            raise imaplib.IMAP4.error(f"UID FETCH failed: {data}")
+        
+        messages = []
+        for item in data:
+            if isinstance(item, tuple):
+                uid_match = re.search(rb'UID (\d+)', item[0])
+                if uid_match:
+                    messages.append((int(uid_match.group(1)), item[1]))
+        return messages
+    
+    def analyze_email(self, message, is_job=None):
+        """
+        Classify a parsed message and extract job details.
+        
+        Args:
+            message: Record returned by parse_raw_message
+            is_job: Classification by the model (keywords decide if omitted)
+        
+        Returns:
+            dict: The message record merged with the analysis
+        """
+        result = dict(message)
+        result.update(self.parser.analyze(message['subject'], message['body'], is_job, message.get('reply_to')))
+        return result
+    
+    def _load_classifier(self):
+        """Return the shared email classifier, or None if it is disabled or unreadable."""
+        if not self.classifier_config.get('enabled', True):
+            return None
+        try:
+            return shared_classifier(self.classifier_path)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Could not load the email classifier, classifying by keywords: {e}")
+            return None
+    
+    def classifier_active(self):
+        """True if the model has learned enough labeled messages to classify emails."""
+        return (self.classifier is not None
+                and self.classifier.is_trained(self.classifier_config.get('min_labels', 10)))
+    
+    def recent_snapshot(self):
+        """
+        Return the recently classified messages, safe to call from any thread.
+        
+        Returns:
+            list: Entries of recent_messages, oldest first
+        """
+        with self._recent_lock:
+            return list(self.recent_messages)
+    
+    def label_messages(self, records, is_job):
+        """
+        Teach the classifier the label of some messages and save the model.
+        
+        Args:
+            records: Entries of recent_messages
+            is_job: True if the messages are job emails
+        
+        Returns:
+            bool: False if there is no classifier
+        
+        Raises:
+            OSError: If the model cannot be saved
+        """
+        if self.classifier is None:
+            return False
+        if not records:
+            return True
+        self.classifier.learn([record['text'] for record in records], [JOB if is_job else NOT_JOB] * len(records))
+        with self._recent_lock:
+            for record in records:
+                try:
+                    self.recent_messages.remove(record)
+                except ValueError:
+                    pass
+        self.classifier.save(self.classifier_path)
+        job_labels, other_labels = self.classifier.label_counts
+        self.logger.info(f"Email classifier learned {len(records)} {'job' if is_job else 'other'} emails "
+                         f"({job_labels} job / {other_labels} other labels)")
+        return True
+    
+    def label_messages_async(self, records, is_job):
+        """
+        Run label_messages() in a background thread.
+        
+        Learning and saving the model take too long for the UI thread. When
+        done, an EVENT_CLASSIFIER_UPDATED event is emitted, preceded by an
+        EVENT_ERROR event if the model could not be saved.
+        
+        Args:
+            records: Entries of recent_messages
+            is_job: True if the messages are job emails
+        
+        Returns:
+            threading.Thread: The started thread
+        """
+        def run():
+            try:
+                self.label_messages(records, is_job)
+            except OSError as e:
+                self.logger.error(f"Error saving the email classifier: {e}")
+                self._emit_event(EVENT_ERROR, message=f"Could not save the email classifier: {e}")
+            self._emit_event(EVENT_CLASSIFIER_UPDATED, message=f"{len(records)} emails labeled")
+        
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+    
+    def send_response(self, message, body=None):
+        """
+        Reply to a job email with the configured template and resume.
+        
+        Args:
+            message: Record returned by parse_raw_message (or its analysis)
+            body: Rendered reply text (rendered from the message if omitted)
+        """
+        if body is None:
+            body = self.reply_builder.render(reply_context(message))
+        self._send_reply(self._queued_reply(message, body))
+    
+    @staticmethod
+    def _queued_reply(message, body):
+        """Return the checkpointable record of a reply."""
+        return {'to': message['reply_to'], 'subject': message['subject'],
+                'message_id': message['message_id'], 'body': body}
+    
+    def _send_reply(self, reply):
+        """Build and send a reply recorded by _queued_reply."""
+        message = self.reply_builder.build(reply['to'], reply['subject'], reply['message_id'], reply['body'])
+        self._get_smtp().send_message(message)
+    
+    def send_queued_replies(self):
+        """
+        Send the queued replies, checkpointing after each one.
+        
+        A reply leaves the queue once it is sent, or when the server refuses
+        it permanently (a 5xx response). A reply that fails transiently is
+        retried after an exponential backoff and dropped after
+        ``reply_max_attempts`` attempts. Delivery is at least once: a crash
+        between sending a reply and saving the checkpoint sends it again on
+        the next start.
+        
+        Stops early once the shutdown deadline has passed; the remaining
+        replies stay queued in the checkpoint.
+        """
+        for reply in list(self.queued_replies):
+            if self._past_deadline():
+                self.logger.info(f"Shutdown deadline reached, {len(self.queued_replies)} replies left queued")
+                return
+            if reply.get('retry_at', 0) > time.time():
+                continue
+            try:
+                with self._timed('reply'):
+                    self._send_reply(reply)
+            except smtplib.SMTPRecipientsRefused as e:
+                self._drop_reply(reply, f"recipient refused: {e}")
+            except smtplib.SMTPAuthenticationError as e:
+                # Not a problem of this reply; the others would fail the same way
+                self._retry_reply(reply, e)
+                return
+            except smtplib.SMTPResponseException as e:
+                if e.smtp_code >= 500:
+                    self._drop_reply(reply, f"{e.smtp_code} {e.smtp_error!r}")
+                else:
+                    self._retry_reply(reply, e)
+            except (smtplib.SMTPException, OSError) as e:
+                # Connection failures affect every reply, try again later
+                self._retry_reply(reply, e)
+                return
+            else:
+                self.queued_replies.remove(reply)
+                self.save_checkpoint()
+                self._emit_event(EVENT_REPLY_SENT, message=reply['to'])
+    
+    def _drop_reply(self, reply, reason):
+        """Remove a reply that cannot be delivered from the queue."""
+        self.logger.error(f"Reply to {reply['to']} failed permanently ({reason}), dropping it")
+        self.queued_replies.remove(reply)
+        self.save_checkpoint()
+    
+    def _retry_reply(self, reply, error):
+        """Schedule another attempt at a reply that failed transiently, or drop it after too many attempts."""
+        reply['attempts'] = reply.get('attempts', 0) + 1
+        if reply['attempts'] >= self.gmail_config.get('reply_max_attempts', 5):
+            self._drop_reply(reply, f"{reply['attempts']} attempts, last error: {error}")
+            return
+        delay = min(60 * 2 ** (reply['attempts'] - 1), 3600)
+        reply['retry_at'] = time.time() + delay
+        self.logger.warning(f"Reply to {reply['to']} failed ({error}), retrying in {delay} seconds")
+        self.save_checkpoint()
+    
+    def _handle_messages(self, uids, messages):
+        """
+        Classify parsed messages, replying to job emails that meet the criteria if auto-reply is enabled.
+        
+        Args:
+            uids: UIDs of the messages
+            messages: Records returned by parse_raw_message, in the same order
+                (None for messages that could not be parsed)
+        
+        Returns:
+            list: Analyses of the job emails found
+        """
+        auto_reply = self.gmail_config.get('auto_reply', False)
+        
+        # Unparsable messages are skipped for good; the UID cursor still moves past them
+        batch_uids = uids
+        unparsable = [uid for uid, message in zip(uids, messages) if message is None]
+        if unparsable:
+            self.logger.warning(f"Skipping {len(unparsable)} messages that could not be parsed "
+                                f"(UIDs {', '.join(map(str, unparsable[:10]))})")
+            parsed = [(uid, message) for uid, message in zip(uids, messages) if message is not None]
+            uids = [uid for uid, _ in parsed]
+            messages = [message for _, message in parsed]
+        
+        # The whole batch is scored by the model in one vectorized pass
+        texts = probabilities = None
+        if self.classifier is not None:
+            texts = self.classifier.texts(messages)
+            if self.classifier_active():
+                with self._timed('model'):
+                    probabilities = self.classifier.predict_proba(texts)
+        threshold = self.classifier_config.get('threshold', 0.5)
+        
+        jobs = []
+        to_answer = []
+        for index, message in enumerate(messages):
+            if self._past_deadline():
+                # Out of shutdown time: keep the rest for the next start
+                self.pending_messages.extend(zip(uids[index:], messages[index:]))
+                break
+            
+            with self._timed('classify'):
+                probability = None if probabilities is None else float(probabilities[index])
+                result = self.analyze_email(message, None if probability is None else probability >= threshold)
+            
+            if texts is not None:
+                with self._recent_lock:
+                    self.recent_messages.append({
+                        'from': message['from'], 'subject': message['subject'], 'text': texts[index],
+                        'is_job': result['is_job'], 'probability': probability,
+                    })
+            
+            if result['is_job']:
+                result['meets_criteria'] = self.criteria.matches_email(result)
+                jobs.append(result)
+                self._emit_event(EVENT_NEW_JOB, message=result['subject'])
+                
+                # Never answer our own messages
+                if (auto_reply and result['meets_criteria']
+                        and message['reply_to'] and message['reply_to'] != self.email):
+                    to_answer.append(result)
+        
+        if to_answer:
+            # Personalize the whole batch with one compiled template
+            with self._timed('render'):
+                bodies = self.reply_builder.render_many([reply_context(result) for result in to_answer])
+            self.queued_replies.extend(self._queued_reply(result, body) for result, body in zip(to_answer, bodies))
+        
+        # The batch is processed or held in the checkpoint from here on
+        if batch_uids:
+            self.last_uid = max(self.last_uid, max(batch_uids))
+        self.save_checkpoint()
+        
+        self.send_queued_replies()
+        return jobs
+    
+    def _past_deadline(self):
+        """True once a stop was requested and the time to drain in-flight work has run out."""
+        if not self.stop_event.is_set():
+            return False
+        return self._drain_deadline is None or time.monotonic() >= self._drain_deadline
+    
+    def _restore_checkpoint(self):
+        """Load the UID cursor, unclassified messages and queued replies of the previous run."""
+        state = self.checkpoint.load()
+        if not state:
+            return
+        self.last_uid = state.get('last_uid', 0)
+        self.pending_messages = [(uid, message) for uid, message in state.get('messages', [])]
+        self.queued_replies = state.get('replies', [])
+        self.logger.info(f"Resuming Gmail after UID {self.last_uid} with {len(self.pending_messages)} "
+                         f"unclassified messages and {len(self.queued_replies)} queued replies")
+    
+    def save_checkpoint(self):
+        """Persist the UID cursor, unclassified messages and queued replies."""
+        self.checkpoint.save({
+            'last_uid': self.last_uid,
+            'messages': [[uid, message] for uid, message in self.pending_messages],
+            'replies': self.queued_replies,
+        })
+    
+    def resume_pending(self):
+        """
+        Finish the work a previous run left in the checkpoint.
+        
+        Returns:
+            list: Analyses of the job emails among the unclassified messages
+        """
+        if not self.pending_messages:
+            self.send_queued_replies()
+            return []
+        pending, self.pending_messages = self.pending_messages, []
+        return self._handle_messages([uid for uid, _ in pending], [message for _, message in pending])
+    
+    def process_message_batch(self, uids, use_pool=None):
+        """
+        Fetch, parse and classify a batch of messages, replying to job emails if auto-reply is enabled.
+        
+        Args:
+            uids: Message UIDs to process
+            use_pool: Whether to parse in the process pool, e.g. because the batch
+                is part of a large backlog; decided from the batch size if None
+        
+        Returns:
+            list: Analyses of the job emails found
+        """
+        with self._timed('fetch'):
+            raw_messages = self.fetch_messages(uids)
+        
+        with self._timed('parse'):
+            messages = self.message_parser.parse_many([raw for _, raw in raw_messages], use_pool)
+        
+        return self._handle_messages([uid for uid, _ in raw_messages], messages)
+    
+    def _scan_backlog(self, uids):
+        """
+        Process a large backlog with parsing in the process pool.
+        
+        While the pool parses one batch, the next batch is fetched, so network
+        I/O overlaps with parsing on all cores.
+        
+        Args:
+            uids: Message UIDs to process
+        
+        Returns:
+            list: Analyses of the job emails found
+        """
+        batch_size = self.gmail_config.get('parse_pool_batch_size', 2000)
+        
+        jobs = []
+        pending = None
+        for start in range(0, len(uids), batch_size):
+            if self.stop_event.is_set():
+                break
+            
+            with self._timed('fetch'):
+                raw_messages = self.fetch_messages(uids[start:start + batch_size])
+            futures = self.message_parser.submit([raw for _, raw in raw_messages])
+            
+            if pending is not None:
+                jobs.extend(self._collect_parsed(*pending))
+            pending = ([uid for uid, _ in raw_messages], futures)
+            
+            self._emit_event(EVENT_PROGRESS, message=f"Fetched {min(start + batch_size, len(uids))} of {len(uids)} messages")
+        
+        if pending is not None:
+            jobs.extend(self._collect_parsed(*pending))
+        return jobs
+    
+    def _collect_parsed(self, uids, futures):
+        """Wait for a batch parsed in the process pool and classify it."""
+        with self._timed('parse_wait'):
+            messages = self.message_parser.collect(futures)
+        return self._handle_messages(uids, messages)
+    
+    def scan_emails(self):
+        """
+        Scan the inbox for new job emails and reply to them if auto-reply is enabled.
+        
+        Backlogs of at least ``parse_pool_threshold`` messages are parsed in a process pool.
+        
+        Returns:
+            list: Analyses of the job emails found
+        """
+        batch_size = self.gmail_config.get('fetch_batch_size', 100)
+        
+        jobs = self.resume_pending()
+        
+        with self._timed('list'):
+            uids = self.fetch_new_message_uids()
+        
+        if self.message_parser.use_pool(len(uids)):
+            self.logger.info(f"Parsing backlog of {len(uids)} messages in a process pool")
+            return jobs + self._scan_backlog(uids)
+        
+        for start in range(0, len(uids), batch_size):
+            if self.stop_event.is_set():
+                break
+            
+            jobs.extend(self.process_message_batch(uids[start:start + batch_size]))
+            
+            done = min(start + batch_size, len(uids))
+            self._emit_event(EVENT_PROGRESS, message=f"Processed {done} of {len(uids)} messages")
+        
+        return jobs
+    
+    def begin_shutdown(self, timeout=None):
+        """
+        Ask in-flight work to stop within a deadline.
+        
+        The current batch is drained until the deadline; messages not yet
+        classified and replies not yet sent by then are kept in the checkpoint.
+        
+        Args:
+            timeout: Seconds allowed for draining (defaults to ``shutdown_timeout``)
+        
+        Returns:
+            float: The timeout applied
+        """
+        if timeout is None:
+            timeout = self.gmail_config.get('shutdown_timeout', 10.0)
+        self._drain_deadline = time.monotonic() + timeout
+        self.stop_event.set()
+        return timeout
     
-    def stop_monitoring(self):
-        """Stop monitoring emails."""
+    def stop_monitoring(self, timeout=None):
+        """
+        Stop monitoring emails, draining or checkpointing in-flight work.
+        
+        Args:
+            timeout: Seconds allowed for draining (defaults to ``shutdown_timeout``)
+        """
         if not self.monitor_thread or not self.monitor_thread.is_alive():
             self.logger.warning("Email monitoring is not running")
             return
         
         # Set stop event to signal the thread to exit
-        self.stop_event.set()
+        timeout = self.begin_shutdown(timeout)
+        self.credential_manager.stop()
         
-        # Wait for the thread to finish
-        self.monitor_thread.join(timeout=5.0)
+        # Wait for the thread to finish; a blocking network call may add a little
+        self.monitor_thread.join(timeout=timeout + 5.0)
         if self.monitor_thread.is_alive():
             self.logger.warning("Email monitoring thread did not exit gracefully")
         else:
             self.logger.info("Stopped Gmail monitoring thread")
         return True
+    
+    def _emit_event(self, kind, **data):
+        """
+        Report an event to the registered event callback, if any.
+        
+        Args:
+            kind: One of the EVENT_* constants from app.core.events
+            **data: Event payload
+        """
+        if self.event_callback is not None:
+            self.event_callback(kind, 'gmail', **data)
@@ -0,0 +1,364 @@
+import json
+import math
+import sys
+import threading
+from array import array
+
+from app.core.pay import annualize_codes
+
+
+class StringTable:
+    """
+    Interns repeated strings and maps them to small integer codes.
+
+    Fields such as company, location and employment type take few distinct
+    values across thousands of postings. Interning makes every record share
+    one string object per value, and the integer codes let JobBatch store
+    those columns in compact arrays.
+
+    A table keeps every string it was given for as long as it lives, so it
+    is scoped to the records of one batch or sweep rather than kept for the
+    lifetime of the process.
+    """
+
+    def __init__(self):
+        self._codes = {}
+        self.strings = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.strings)
+
+    def code(self, value):
+        """
+        Return the code of a string, adding it to the table if needed.
+
+        Args:
+            value: String or None
+
+        Returns:
+            int: Code of the string, -1 for None
+        """
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self.strings)
+                    self.strings.append(value)
+                    self._codes[value] = code
+        return code
+
+    def find(self, value):
+        """
+        Return the code of a string without adding it to the table.
+
+        Args:
+            value: String or None
+
+        Returns:
+            int: Code of the string, -1 for None, or None if the string is not in the table
+        """
+        if value is None:
+            return -1
+        return self._codes.get(value)
+
+    def intern(self, value):
+        """
+        Return the shared instance of a string.
+
+        Args:
+            value: String or None
+
+        Returns:
+            str: The interned string, or None
+        """
+        if value is None:
+            return None
+        return self.strings[self.code(value)]
+
+    def lookup(self, code):
+        """
+        Return the string for a code.
+
+        Args:
+            code: Code returned by code()
+
+        Returns:
+            str: The string, or None for -1
+        """
+        return None if code < 0 else self.strings[code]
+
+
+def _intern(value):
+    """Intern a string with sys.intern, which only keeps it while it is referenced."""
+    return None if value is None else sys.intern(value)
+
+
+class JobRecord:
+    """
+    Compact representation of one job posting or job email.
+
+    Uses __slots__ instead of a per-instance dict, and interns the
+    categorical fields through a StringTable, or with sys.intern when no
+    table is given.
+    """
+
+    __slots__ = ('id', 'account', 'source', 'title', 'company', 'location',
+                 'employment_type', 'pay_min', 'pay_max', 'pay_period', 'url', 'data')
+
+    def __init__(self, id, account=None, source=None, title=None, company=None, location=None,
+                 employment_type=None, pay_min=None, pay_max=None, pay_period=None, url=None,
+                 data=None, strings=None):
+        """
+        Initialize the job record.
+
+        Args:
+            id: Unique job ID
+            account: Account the job was found by
+            source: 'gmail' or 'ziprecruiter'
+            title: Job title or email subject
+            company: Hiring company
+            location: Free-text location
+            employment_type: e.g. 'full-time'
+            pay_min: Lower pay bound
+            pay_max: Upper pay bound
+            pay_period: Pay period of the bounds (e.g. 'year', 'hour')
+            url: Posting URL
+            data: Optional dict of source-specific extras
+            strings: StringTable used for interning (sys.intern if None)
+        """
+        intern = _intern if strings is None else strings.intern
+        self.id = id
+        self.account = intern(account)
+        self.source = intern(source)
+        self.title = title
+        self.company = intern(company)
+        self.location = intern(location)
+        self.employment_type = intern(employment_type)
+        self.pay_min = pay_min
+        self.pay_max = pay_max
+        self.pay_period = intern(pay_period)
+        self.url = url
+        # Kept as JSON text: smaller than a dict and what the store writes anyway
+        self.data = json.dumps(data) if data else None
+
+    @classmethod
+    def from_posting(cls, posting, account=None, strings=None):
+        """
+        Create a record from a ZipRecruiter jobs API posting.
+
+        Args:
+            posting: Posting dict
+            account: Account name
+            strings: StringTable used for interning (sys.intern if None)
+
+        Returns:
+            JobRecord: The record
+        """
+        snippet = posting.get('snippet')
+        # Job board titles repeat across postings, unlike email subjects
+        title = posting.get('name')
+        return cls(
+            f"ziprecruiter:{posting['id']}", account, 'ziprecruiter',
+            _intern(title) if strings is None else strings.intern(title),
+            (posting.get('hiring_company') or {}).get('name'), posting.get('location'),
+            posting.get('employment_type'), posting.get('salary_min'), posting.get('salary_max'),
+            posting.get('salary_interval'), posting.get('url'),
+            {'snippet': snippet} if snippet else None, strings
+        )
+
+    @classmethod
+    def from_email(cls, result, account=None, strings=None):
+        """
+        Create a record from a GmailMonitor email analysis.
+
+        Args:
+            result: Analysis returned by GmailMonitor.analyze_email
+            account: Account name
+            strings: StringTable used for interning (sys.intern if None)
+
+        Returns:
+            JobRecord: The record
+        """
+        pay = result.get('pay') or (None, None, None)
+        job_id = result.get('message_id') or f"{account}:{result.get('subject', '')}:{result.get('date', '')}"
+        data = {k: result[k] for k in ('from', 'benefits') if result.get(k)}
+        return cls(
+            job_id, account, 'gmail', result.get('subject'), result.get('company'),
+            result.get('location'), result.get('employment_type'), pay[0], pay[1], pay[2],
+            None, data, strings
+        )
+
+    def extras(self):
+        """Return the source-specific extras as a dict."""
+        return json.loads(self.data) if self.data else {}
+
+    def to_dict(self):
+        """Return the record as a plain dict."""
+        record = {name: getattr(self, name) for name in self.__slots__}
+        record['data'] = self.extras()
+        return record
+
+    def __eq__(self, other):
+        if not isinstance(other, JobRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f"JobRecord(id={self.id!r}, title={self.title!r}, company={self.company!r})"
+
+
+class JobBatch:
+    """
+    Column-oriented container of jobs for bulk filtering and scoring.
+
+    Categorical fields are stored as StringTable codes and pay bounds as
+    doubles (NaN when unknown), all in ``array.array`` columns, so a batch of
+    100k jobs is a handful of contiguous buffers instead of 100k objects.
+    Titles, URLs and the JSON text of the extras are kept in plain lists.
+    """
+
+    def __init__(self, strings=None):
+        """
+        Initialize an empty batch.
+
+        Args:
+            strings: StringTable used for the coded columns (a new table
+                owned by the batch and its selections if None)
+        """
+        self.strings = StringTable() if strings is None else strings
+        self.ids = []
+        self.titles = []
+        self.urls = []
+        self.data = []
+        self.account = array('i')
+        self.source = array('i')
+        self.company = array('i')
+        self.location = array('i')
+        self.employment_type = array('i')
+        self.pay_period = array('i')
+        self.pay_min = array('d')
+        self.pay_max = array('d')
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(self, record):
+        """
+        Add a JobRecord to the batch.
+
+        Args:
+            record: JobRecord to add
+        """
+        code = self.strings.code
+        self.ids.append(record.id)
+        self.titles.append(record.title)
+        self.urls.append(record.url)
+        self.data.append(record.data)
+        self.account.append(code(record.account))
+        self.source.append(code(record.source))
+        self.company.append(code(record.company))
+        self.location.append(code(record.location))
+        self.employment_type.append(code(record.employment_type))
+        self.pay_period.append(code(record.pay_period))
+        self.pay_min.append(math.nan if record.pay_min is None else float(record.pay_min))
+        self.pay_max.append(math.nan if record.pay_max is None else float(record.pay_max))
+
+    def extend(self, records):
+        """Add several JobRecords to the batch."""
+        for record in records:
+            self.append(record)
+
+    def __getitem__(self, index):
+        """Rebuild the JobRecord at ``index``."""
+        lookup = self.strings.lookup
+        pay_min = self.pay_min[index]
+        pay_max = self.pay_max[index]
+        record = JobRecord(
+            self.ids[index], lookup(self.account[index]), lookup(self.source[index]),
+            self.titles[index], lookup(self.company[index]), lookup(self.location[index]),
+            lookup(self.employment_type[index]),
+            None if math.isnan(pay_min) else pay_min, None if math.isnan(pay_max) else pay_max,
+            lookup(self.pay_period[index]), self.urls[index], strings=self.strings
+        )
+        # Already JSON text, so it is not encoded again
+        record.data = self.data[index]
+        return record
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def filter_indices(self, employment_types=None, exclude_companies=None, pay_period=None, min_pay=None):
+        """
+        Return the indices of jobs matching all given conditions.
+
+        String conditions are converted to codes once, so each row is checked
+        with integer comparisons only. Strings that no job has never match
+        and are not added to the table.
+
+        Args:
+            employment_types: Allowed employment types
+            exclude_companies: Companies to drop
+            pay_period: Only jobs whose pay is given in this period
+            min_pay: Minimum upper pay bound (in the jobs' own period)
+
+        Returns:
+            list: Matching row indices
+        """
+        rows = range(len(self))
+        if employment_types is not None:
+            allowed = {self.strings.find(t) for t in employment_types}
+            column = self.employment_type
+            rows = [i for i in rows if column[i] in allowed]
+        if exclude_companies:
+            excluded = {self.strings.find(c) for c in exclude_companies}
+            column = self.company
+            rows = [i for i in rows if column[i] not in excluded]
+        if pay_period is not None:
+            period = self.strings.find(pay_period)
+            column = self.pay_period
+            rows = [i for i in rows if column[i] == period]
+        if min_pay is not None:
+            high = self.pay_max
+            low = self.pay_min
+            # NaN comparisons are False, so jobs without pay are dropped
+            rows = [i for i in rows if (high[i] if not math.isnan(high[i]) else low[i]) >= min_pay]
+        return list(rows)
+
+    def annual_pay(self):
+        """
+        Return the pay bounds converted to yearly amounts.
+
+        Returns:
+            tuple: (annual_min, annual_max) NumPy arrays with NaN where unknown
+        """
+        return annualize_codes(self.pay_min, self.pay_max, self.pay_period, self.strings)
+
+    def select(self, indices):
+        """
+        Return a new batch with the given rows.
+
+        Args:
+            indices: Row indices
+
+        Returns:
+            JobBatch: The selected rows
+        """
+        batch = JobBatch(self.strings)
+        batch.ids = [self.ids[i] for i in indices]
+        batch.titles = [self.titles[i] for i in indices]
+        batch.urls = [self.urls[i] for i in indices]
+        batch.data = [self.data[i] for i in indices]
+        for name in ('account', 'source', 'company', 'location', 'employment_type', 'pay_period'):
+            column = getattr(self, name)
+            setattr(batch, name, array('i', (column[i] for i in indices)))
+        batch.pay_min = array('d', (self.pay_min[i] for i in indices))
+        batch.pay_max = array('d', (self.pay_max[i] for i in indices))
+        return batch
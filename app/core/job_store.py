@@ -0,0 +1,243 @@
+import os
+import sqlite3
+import threading
+import time
+
+from app.core.job_record import JobRecord
+from app.core.pay import PayIntervalIndex
+
+
+class JobStore:
+    """
+    SQLite store for discovered jobs and processed message IDs.
+
+    One store is shared by every account and thread. Writes are batched with
+    ``executemany`` and serialized by a lock; SQLite runs in WAL mode so
+    readers are not blocked by writers. Pay queries are answered from a
+    PayIntervalIndex that is rebuilt on the first query after new jobs were
+    stored.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the job store.
+
+        Args:
+            path: Database file path (':memory:' for a temporary store)
+        """
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Bumped whenever jobs are added; the pay index is built for one generation
+        self._generation = 0
+        self._pay_index = (-1, None)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    account TEXT,
+                    source TEXT,
+                    title TEXT,
+                    company TEXT,
+                    location TEXT,
+                    employment_type TEXT,
+                    pay_min REAL,
+                    pay_max REAL,
+                    pay_period TEXT,
+                    url TEXT,
+                    found_at REAL,
+                    data TEXT
+                )
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS seen_messages (
+                    account TEXT,
+                    message_id TEXT,
+                    PRIMARY KEY (account, message_id)
+                ) WITHOUT ROWID
+            ''')
+
+    def add_jobs(self, jobs):
+        """
+        Insert jobs, ignoring IDs that are already stored.
+
+        Args:
+            jobs: JobRecords as produced by job_from_email / job_from_posting
+
+        Returns:
+            int: Number of new jobs stored
+        """
+        found_at = time.time()
+        rows = [
+            (job.id, job.account, job.source, job.title, job.company, job.location,
+             job.employment_type, job.pay_min, job.pay_max, job.pay_period, job.url,
+             found_at, job.data or '{}')
+            for job in jobs
+        ]
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows
+            )
+            added = self._conn.total_changes - before
+            if added:
+                self._generation += 1
+            return added
+
+    def mark_seen(self, account, message_ids):
+        """
+        Record message IDs as processed for an account.
+
+        Args:
+            account: Account name
+            message_ids: Iterable of message IDs
+        """
+        rows = [(account, message_id) for message_id in message_ids]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany('INSERT OR IGNORE INTO seen_messages VALUES (?, ?)', rows)
+
+    def filter_unseen(self, account, message_ids):
+        """
+        Return the message IDs that have not been processed for an account.
+
+        Args:
+            account: Account name
+            message_ids: List of message IDs
+
+        Returns:
+            list: Unseen IDs, in input order
+        """
+        message_ids = list(message_ids)
+        seen = set()
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(message_ids), 900):
+                chunk = message_ids[start:start + 900]
+                placeholders = ','.join('?' * len(chunk))
+                seen.update(row[0] for row in self._conn.execute(
+                    f'SELECT message_id FROM seen_messages WHERE account = ? AND message_id IN ({placeholders})',
+                    [account] + chunk
+                ))
+        return [message_id for message_id in message_ids if message_id not in seen]
+
+    def count_jobs(self, account=None):
+        """
+        Count stored jobs.
+
+        Args:
+            account: Only count jobs for this account (optional)
+
+        Returns:
+            int: Number of jobs
+        """
+        with self._lock:
+            if account is None:
+                return self._conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+            return self._conn.execute('SELECT COUNT(*) FROM jobs WHERE account = ?', (account,)).fetchone()[0]
+
+    def pay_columns(self, account=None):
+        """
+        Read the pay columns of stored jobs, e.g. to build a PayIntervalIndex.
+
+        Args:
+            account: Only read jobs for this account (optional)
+
+        Returns:
+            tuple: (ids, pay_min, pay_max, pay_period) lists
+        """
+        query = 'SELECT id, pay_min, pay_max, pay_period FROM jobs'
+        params = ()
+        if account is not None:
+            query += ' WHERE account = ?'
+            params = (account,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        if not rows:
+            return [], [], [], []
+        return tuple(list(column) for column in zip(*rows))
+
+    def pay_index(self):
+        """
+        Return a PayIntervalIndex over the annual pay of every stored job.
+
+        Returns:
+            PayIntervalIndex: Index as of the last stored job
+        """
+        generation, index = self._pay_index
+        if generation != self._generation:
+            # Jobs stored while the index is built bump the generation, so they trigger another build
+            generation = self._generation
+            index = PayIntervalIndex.from_store(self)
+            self._pay_index = (generation, index)
+        return index
+
+    def jobs_paying_at_least(self, amount):
+        """
+        Find stored jobs whose pay can reach an annual amount.
+
+        Args:
+            amount: Annual pay, e.g. ``pay_range_min``
+
+        Returns:
+            list: IDs of jobs whose annual upper bound is at least ``amount``
+                (jobs without pay are not included)
+        """
+        return self.pay_index().max_pay_at_least(amount)
+
+    def jobs_paying_between(self, low, high):
+        """
+        Find stored jobs whose annual pay range overlaps [low, high].
+
+        Args:
+            low: Annual lower bound
+            high: Annual upper bound
+
+        Returns:
+            list: Job IDs, in no particular order
+        """
+        return self.pay_index().overlapping(low, high)
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def job_from_email(account, result):
+    """
+    Convert a GmailMonitor analysis into a store record.
+
+    Args:
+        account: Account name
+        result: Analysis returned by GmailMonitor.analyze_email
+
+    Returns:
+        JobRecord: Job record
+    """
+    return JobRecord.from_email(result, account)
+
+
+def job_from_posting(account, posting):
+    """
+    Convert a ZipRecruiter posting into a store record.
+
+    Args:
+        account: Account name
+        posting: Posting returned by the ZipRecruiter jobs API
+
+    Returns:
+        JobRecord: Job record
+    """
+    return JobRecord.from_posting(posting, account)
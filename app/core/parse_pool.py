@@ -0,0 +1,152 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.email_parser import parse_raw_message
+
+
+def parse_or_none(raw):
+    """
+    Parse a raw message, tolerating malformed input.
+
+    Args:
+        raw: Raw message bytes
+
+    Returns:
+        dict: Record returned by parse_raw_message, or None if the message could not be parsed
+    """
+    try:
+        return parse_raw_message(raw)
+    except Exception:
+        # A single malformed message must not fail the batch it arrived in
+        return None
+
+
+def _parse_chunk(raw_messages):
+    """Parse a chunk of raw messages in a worker process."""
+    return [parse_or_none(raw) for raw in raw_messages]
+
+
+# Process pools shared by all parsers of this process: max_workers -> [pool, users]
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _acquire_pool(max_workers):
+    """Return the shared process pool with ``max_workers`` workers, starting it on first use."""
+    with _pools_lock:
+        entry = _pools.get(max_workers)
+        if entry is None:
+            # Spawned workers do not inherit the GUI and network threads of this process
+            pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+            entry = _pools[max_workers] = [pool, 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def _release_pool(max_workers):
+    """Drop one user of a shared process pool, stopping its workers after the last one."""
+    with _pools_lock:
+        entry = _pools[max_workers]
+        entry[1] -= 1
+        if entry[1]:
+            return
+        del _pools[max_workers]
+    entry[0].shutdown(wait=True)
+
+
+class ParallelMessageParser:
+    """
+    Parses raw messages, using a process pool for large batches.
+
+    MIME decoding and HTML-to-text conversion are CPU-bound and hold the GIL,
+    so large backlogs are split into chunks and parsed in worker processes.
+    Only the raw bytes go to the workers and only the compact records from
+    parse_raw_message come back. Small batches are parsed in-process, where
+    the pickling overhead would outweigh the gain. Messages that cannot be
+    parsed are returned as None.
+
+    All parsers of a process with the same number of workers share one pool,
+    so monitoring several accounts does not start a pool per account.
+    """
+
+    def __init__(self, threshold=1000, chunk_size=50, max_workers=None):
+        """
+        Initialize the parser.
+
+        Args:
+            threshold: Minimum batch size that is sent to the process pool
+            chunk_size: Messages per pool task
+            max_workers: Worker processes (defaults to the CPU count)
+        """
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = _acquire_pool(self.max_workers)
+        return self._pool
+
+    def use_pool(self, count):
+        """Return True if a batch of ``count`` messages should go to the process pool."""
+        return self.max_workers > 1 and count >= self.threshold
+
+    def submit(self, raw_messages):
+        """
+        Start parsing a batch in the process pool.
+
+        Args:
+            raw_messages: List of raw message bytes
+
+        Returns:
+            list: Futures, one per chunk, for collect()
+        """
+        pool = self._get_pool()
+        # Small batches are split finer so that they still occupy every worker
+        chunk_size = max(1, min(self.chunk_size, -(-len(raw_messages) // self.max_workers)))
+        return [
+            pool.submit(_parse_chunk, raw_messages[start:start + chunk_size])
+            for start in range(0, len(raw_messages), chunk_size)
+        ]
+
+    def collect(self, futures):
+        """
+        Wait for a submitted batch.
+
+        Args:
+            futures: Futures returned by submit()
+
+        Returns:
+            list: Parsed records in input order (None for unparsable messages)
+        """
+        records = []
+        for future in futures:
+            records.extend(future.result())
+        return records
+
+    def parse_many(self, raw_messages, use_pool=None):
+        """
+        Parse a batch of raw messages.
+
+        Args:
+            raw_messages: List of raw message bytes
+            use_pool: Whether to parse in the process pool; decided by use_pool()
+                from the batch size if None
+
+        Returns:
+            list: Parsed records in input order (None for unparsable messages)
+        """
+        if use_pool is None:
+            use_pool = self.use_pool(len(raw_messages))
+        if not use_pool or not raw_messages:
+            return [parse_or_none(raw) for raw in raw_messages]
+        return self.collect(self.submit(raw_messages))
+
+    def shutdown(self):
+        """Release the process pool; its workers stop once no other parser uses it."""
+        if self._pool is not None:
+            self._pool = None
+            _release_pool(self.max_workers)
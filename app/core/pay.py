@@ -0,0 +1,290 @@
+import numpy as np
+
+# Multipliers from a pay period to a yearly figure (40 hours x 52 weeks)
+ANNUAL_FACTORS = {
+    'hour': 2080.0, 'hr': 2080.0, 'hourly': 2080.0,
+    'day': 260.0, 'daily': 260.0,
+    'week': 52.0, 'wk': 52.0, 'weekly': 52.0,
+    'month': 12.0, 'mo': 12.0, 'monthly': 12.0,
+    'year': 1.0, 'yr': 1.0, 'annum': 1.0, 'yearly': 1.0, 'annual': 1.0, 'annually': 1.0,
+}
+
+# Upper bounds used to guess the period of amounts given without one
+HOURLY_CEILING = 500.0
+MONTHLY_CEILING = 20000.0
+
+
+def period_factor(period, amount=None):
+    """
+    Return the multiplier converting an amount paid per ``period`` to a yearly amount.
+
+    Without a period the amount's magnitude decides: below 500 is taken as
+    hourly, below 20,000 as monthly and anything else as yearly.
+
+    Args:
+        period: Pay period such as 'hour', 'month' or 'year' (may be None)
+        amount: Amount used to guess a missing period
+
+    Returns:
+        float: Multiplier, or NaN if the period is unknown and no amount is given
+    """
+    if period:
+        factor = ANNUAL_FACTORS.get(period.lower())
+        if factor is not None:
+            return factor
+    if amount is None:
+        return float('nan')
+    if amount < HOURLY_CEILING:
+        return ANNUAL_FACTORS['hour']
+    if amount < MONTHLY_CEILING:
+        return ANNUAL_FACTORS['month']
+    return 1.0
+
+
+def annualize(pay_min, pay_max, period):
+    """
+    Convert one pay range to yearly amounts.
+
+    Args:
+        pay_min: Lower bound (may be None)
+        pay_max: Upper bound (may be None)
+        period: Pay period of both bounds (may be None)
+
+    Returns:
+        tuple: (annual_min, annual_max), either None when unknown. A range
+            with only one bound gets that bound on both sides.
+    """
+    low = pay_min if pay_min is not None else pay_max
+    high = pay_max if pay_max is not None else pay_min
+    if low is None:
+        return None, None
+    factor = period_factor(period, low)
+    return low * factor, high * factor
+
+
+def annualize_batch(pay_min, pay_max, periods):
+    """
+    Convert many pay ranges to yearly amounts in one pass.
+
+    Each distinct period is looked up once; the conversion itself is done on
+    whole NumPy arrays.
+
+    Args:
+        pay_min: Sequence or array of lower bounds (None/NaN when unknown)
+        pay_max: Sequence or array of upper bounds (None/NaN when unknown)
+        periods: Sequence of pay periods (None when unknown)
+
+    Returns:
+        tuple: (annual_min, annual_max) float64 arrays with NaN where unknown
+    """
+    low = np.asarray(pay_min, dtype=np.float64)
+    high = np.asarray(pay_max, dtype=np.float64)
+    low = np.where(np.isnan(low), high, low)
+    high = np.where(np.isnan(high), low, high)
+
+    cache = {}
+    for period in set(periods):
+        cache[period] = period_factor(period)
+    factors = np.fromiter((cache[p] for p in periods), dtype=np.float64, count=len(low))
+    return _apply_factors(low, high, factors)
+
+
+def annualize_codes(pay_min, pay_max, period_codes, strings):
+    """
+    Convert the pay columns of a JobBatch to yearly amounts.
+
+    Args:
+        pay_min: array('d') or array of lower bounds (NaN when unknown)
+        pay_max: array('d') or array of upper bounds (NaN when unknown)
+        period_codes: array('i') of StringTable codes (-1 when unknown)
+        strings: StringTable the codes refer to
+
+    Returns:
+        tuple: (annual_min, annual_max) float64 arrays with NaN where unknown
+    """
+    low = np.frombuffer(pay_min, dtype=np.float64) if not isinstance(pay_min, np.ndarray) else pay_min
+    high = np.frombuffer(pay_max, dtype=np.float64) if not isinstance(pay_max, np.ndarray) else pay_max
+    codes = np.frombuffer(period_codes, dtype=np.int32) if not isinstance(period_codes, np.ndarray) else period_codes
+    low = np.where(np.isnan(low), high, low)
+    high = np.where(np.isnan(high), low, high)
+
+    # One table entry per string code plus a trailing NaN slot for code -1
+    table = np.array([period_factor(s) for s in strings.strings] + [np.nan], dtype=np.float64)
+    return _apply_factors(low, high, table[codes])
+
+
+def _apply_factors(low, high, factors):
+    """Multiply by the period factors, guessing the period where it is unknown."""
+    missing = np.isnan(factors)
+    if missing.any():
+        guessed = np.where(low < HOURLY_CEILING, ANNUAL_FACTORS['hour'],
+                           np.where(low < MONTHLY_CEILING, ANNUAL_FACTORS['month'], 1.0))
+        factors = np.where(missing, guessed, factors)
+    return low * factors, high * factors
+
+
+# Subtrees this small are stored as leaves and checked with a single mask
+LEAF_SIZE = 64
+
+
+class PayIntervalIndex:
+    """
+    Sorted index over the annual pay ranges of stored jobs.
+
+    Answers "minimum pay at least X" and "upper pay at least X" with a binary
+    search over sorted bounds, and "range overlaps [a, b]" with a centered
+    interval tree, so every query costs O(log n + k) for k results instead
+    of a scan over all jobs. The index is static: build a new one (or call
+    rebuild()) after adding jobs.
+    """
+
+    def __init__(self, ids, annual_min, annual_max):
+        """
+        Build the index.
+
+        Args:
+            ids: Job IDs
+            annual_min: Annual lower bounds (NaN when unknown)
+            annual_max: Annual upper bounds (NaN when unknown)
+        """
+        self.rebuild(ids, annual_min, annual_max)
+
+    @classmethod
+    def from_store(cls, store):
+        """
+        Build the index over every job in a JobStore.
+
+        Args:
+            store: JobStore
+
+        Returns:
+            PayIntervalIndex: The index
+        """
+        ids, pay_min, pay_max, periods = store.pay_columns()
+        return cls(ids, *annualize_batch(pay_min, pay_max, periods))
+
+    @classmethod
+    def from_batch(cls, batch):
+        """
+        Build the index over a JobBatch.
+
+        Args:
+            batch: JobBatch
+
+        Returns:
+            PayIntervalIndex: The index
+        """
+        annual_min, annual_max = annualize_codes(batch.pay_min, batch.pay_max, batch.pay_period, batch.strings)
+        return cls(batch.ids, annual_min, annual_max)
+
+    def rebuild(self, ids, annual_min, annual_max):
+        """Replace the indexed jobs."""
+        low = np.asarray(annual_min, dtype=np.float64)
+        high = np.asarray(annual_max, dtype=np.float64)
+        # Jobs without pay cannot answer pay queries
+        known = ~(np.isnan(low) | np.isnan(high))
+        self.ids = np.asarray(ids, dtype=object)[known]
+        self.low = np.minimum(low[known], high[known])
+        self.high = np.maximum(low[known], high[known])
+
+        self._by_low = np.argsort(self.low, kind='stable')
+        self._sorted_low = self.low[self._by_low]
+        self._by_high = np.argsort(self.high, kind='stable')
+        self._sorted_high = self.high[self._by_high]
+        self._tree = self._build(np.arange(len(self.ids)))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def min_pay_at_least(self, amount):
+        """
+        Jobs whose annual lower bound is at least ``amount``.
+
+        Args:
+            amount: Annual amount
+
+        Returns:
+            list: Job IDs, in increasing lower bound order
+        """
+        start = np.searchsorted(self._sorted_low, amount, side='left')
+        return self.ids[self._by_low[start:]].tolist()
+
+    def max_pay_at_least(self, amount):
+        """
+        Jobs whose annual upper bound is at least ``amount``, i.e. that can pay it.
+
+        Args:
+            amount: Annual amount
+
+        Returns:
+            list: Job IDs, in increasing upper bound order
+        """
+        start = np.searchsorted(self._sorted_high, amount, side='left')
+        return self.ids[self._by_high[start:]].tolist()
+
+    def overlapping(self, low, high):
+        """
+        Jobs whose annual range overlaps [low, high].
+
+        Args:
+            low: Annual lower bound of the query range
+            high: Annual upper bound of the query range
+
+        Returns:
+            list: Job IDs, in no particular order
+        """
+        found = []
+        stack = [self._tree] if self._tree else []
+        while stack:
+            node = stack.pop()
+            if node[0] is None:
+                _, rows, row_low, row_high = node
+                found.append(rows[(row_low <= high) & (row_high >= low)])
+                continue
+            center, left, right, by_low, low_keys, by_high, high_keys = node
+            if high < center:
+                # Node intervals contain center, so they overlap iff they start by ``high``
+                found.append(by_low[:np.searchsorted(low_keys, high, side='right')])
+                if left:
+                    stack.append(left)
+            elif low > center:
+                # ... or iff they end at or after ``low`` (high_keys is negated, ascending)
+                found.append(by_high[:np.searchsorted(high_keys, -low, side='right')])
+                if right:
+                    stack.append(right)
+            else:
+                found.append(by_low)
+                if left:
+                    stack.append(left)
+                if right:
+                    stack.append(right)
+        if not found:
+            return []
+        return self.ids[np.concatenate(found)].tolist()
+
+    def _build(self, rows):
+        """Build a centered interval tree node over ``rows``."""
+        if len(rows) == 0:
+            return None
+        if len(rows) <= LEAF_SIZE:
+            return (None, rows, self.low[rows], self.high[rows])
+        low = self.low[rows]
+        high = self.high[rows]
+        center = float(np.median((low + high) / 2.0))
+
+        here = (low <= center) & (high >= center)
+        node_rows = rows[here]
+        order = np.argsort(self.low[node_rows], kind='stable')
+        by_low = node_rows[order]
+        order = np.argsort(-self.high[node_rows], kind='stable')
+        by_high = node_rows[order]
+
+        left_rows = rows[high < center]
+        right_rows = rows[low > center]
+        return (
+            center,
+            self._build(left_rows),
+            self._build(right_rows),
+            by_low, self.low[by_low],
+            by_high, -self.high[by_high],
+        )
@@ -0,0 +1,120 @@
+import os
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from email.mime.application import MIMEApplication
+
+from app.core.templates import compile_template, render_batch
+
+
+class ReplyBuilder:
+    """
+    Builds MIME replies with the resume attached.
+
+    The resume is read and encoded once and the same attachment part is
+    reused for every reply; it is reloaded only when the file's
+    modification time changes. The body template is compiled once (see
+    app.core.templates) and personalized per recipient.
+    """
+
+    def __init__(self, sender, template, resume_path=None):
+        """
+        Initialize the reply builder.
+
+        Args:
+            sender: Address replies are sent from
+            template: Reply body template (see app.core.templates.compile_template)
+            resume_path: Path of the resume to attach (optional)
+        
+        Raises:
+            TemplateError: If the template is malformed
+        """
+        self.sender = sender
+        self.template = template
+        self.resume_path = resume_path
+        self._render = compile_template(template)
+        self._resume_data = None
+        self._resume_mtime = None
+        self._attachment = None
+
+    def _load_resume(self):
+        """
+        Return the cached resume bytes, reloading them if the file changed.
+
+        Returns:
+            bytes: Resume contents or None if no resume is configured
+        """
+        if not self.resume_path or not os.path.exists(self.resume_path):
+            return None
+
+        mtime = os.path.getmtime(self.resume_path)
+        if self._resume_data is None or mtime != self._resume_mtime:
+            with open(self.resume_path, 'rb') as f:
+                self._resume_data = f.read()
+            self._resume_mtime = mtime
+            self._attachment = None
+        return self._resume_data
+
+    def _resume_attachment(self):
+        """Return the cached, already encoded resume attachment part (or None)."""
+        resume = self._load_resume()
+        if resume is None:
+            return None
+        if self._attachment is None:
+            name = os.path.basename(self.resume_path)
+            attachment = MIMEApplication(resume, Name=name)
+            attachment['Content-Disposition'] = f'attachment; filename="{name}"'
+            self._attachment = attachment
+        return self._attachment
+
+    def render(self, context=None):
+        """
+        Render the reply body for one recipient.
+
+        Args:
+            context: Template fields (see app.core.templates.reply_context)
+
+        Returns:
+            str: Reply text
+        """
+        return self._render(context or {})
+
+    def render_many(self, contexts):
+        """
+        Render the reply bodies for a batch of recipients.
+
+        Args:
+            contexts: List of template field dicts
+
+        Returns:
+            list: Reply texts in input order
+        """
+        return render_batch(self.template, contexts)
+
+    def build(self, to, subject, message_id=None, body=None):
+        """
+        Build a reply message.
+
+        Args:
+            to: Recipient address
+            subject: Subject of the message being replied to
+            message_id: Message-ID of the original message, used for threading
+            body: Reply text (defaults to the template rendered without personalization)
+
+        Returns:
+            MIMEMultipart: The reply message
+        """
+        message = MIMEMultipart()
+        message['From'] = self.sender
+        message['To'] = to
+        message['Subject'] = subject if subject.lower().startswith('re:') else f"Re: {subject}"
+        if message_id:
+            message['In-Reply-To'] = message_id
+            message['References'] = message_id
+
+        message.attach(MIMEText(body if body is not None else self.render(), 'plain'))
+
+        attachment = self._resume_attachment()
+        if attachment is not None:
+            message.attach(attachment)
+
+        return message
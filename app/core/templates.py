@@ -0,0 +1,137 @@
+import functools
+import re
+from email.utils import parseaddr
+
+from app.core.email_parser import ROLE_AT_COMPANY_REGEX, company_from_address
+
+# Placeholders a reply template may use
+TEMPLATE_FIELDS = (
+    'name', 'full_name', 'company', 'role', 'pay', 'employment_type', 'location', 'subject',
+)
+
+# {field} or {field|default}; {{ and }} are literal braces
+_TOKEN_RE = re.compile(r'\{\{|\}\}|\{([a-z_]+)(?:\|([^{}]*))?\}|[{}]')
+
+_ROLE_AT_COMPANY_RE = re.compile(ROLE_AT_COMPANY_REGEX, re.IGNORECASE)
+
+
+class TemplateError(ValueError):
+    """Raised for malformed reply templates."""
+
+
+@functools.lru_cache(maxsize=128)
+def compile_template(template):
+    """
+    Compile a reply template into a render function.
+
+    Templates use ``{field}`` or ``{field|default}`` placeholders (see
+    TEMPLATE_FIELDS) and ``{{`` / ``}}`` for literal braces. Each template
+    is parsed once and turned into a single Python expression; compiled
+    functions are cached by template text.
+
+    Args:
+        template: Template text
+
+    Returns:
+        callable: render(context) -> str, where context is a dict of field values
+
+    Raises:
+        TemplateError: If the template has an unknown field or a stray brace
+    """
+    parts = []
+    position = 0
+    for match in _TOKEN_RE.finditer(template):
+        literal = template[position:match.start()]
+        if literal:
+            parts.append(repr(literal))
+        position = match.end()
+
+        token = match.group(0)
+        if token in ('{{', '}}'):
+            parts.append(repr(token[0]))
+        elif match.group(1) is None:
+            raise TemplateError(f"Unmatched '{token}' at position {match.start()} of the reply template")
+        else:
+            field, default = match.group(1), match.group(2) or ''
+            if field not in TEMPLATE_FIELDS:
+                raise TemplateError(f"Unknown reply template field '{field}'")
+            # Missing and empty values both fall back to the default
+            parts.append(f"(c.get({field!r}) or {default!r})")
+
+    if position < len(template):
+        parts.append(repr(template[position:]))
+
+    source = f"lambda c: ''.join(({', '.join(parts)},))" if parts else "lambda c: ''"
+    return eval(compile(source, '<reply template>', 'eval'), {'__builtins__': {}})
+
+
+def render_batch(template, contexts):
+    """
+    Render a template for many recipients in one call.
+
+    Args:
+        template: Template text
+        contexts: Iterable of context dicts
+
+    Returns:
+        list: Rendered texts in input order
+    """
+    return list(map(compile_template(template), contexts))
+
+
+def format_pay(pay):
+    """
+    Format an extracted pay range.
+
+    Args:
+        pay: (min, max, period) as returned by JobEmailParser.extract_pay, or None
+
+    Returns:
+        str: e.g. '$60,000 - $80,000 per year', or '' without pay
+    """
+    if not pay or pay[0] is None:
+        return ''
+    low, high, period = pay
+
+    def money(amount):
+        return f"${amount:,.0f}" if float(amount).is_integer() else f"${amount:,.2f}"
+
+    text = money(low) if high is None or high == low else f"{money(low)} - {money(high)}"
+    return f"{text} per {period}" if period else text
+
+
+def reply_context(result):
+    """
+    Collect the personalization fields for a reply to a job email.
+
+    Args:
+        result: Analysis returned by GmailMonitor.analyze_email
+
+    Returns:
+        dict: Template context (see TEMPLATE_FIELDS)
+    """
+    display_name, address = parseaddr(result.get('from') or '')
+    display_name = display_name.strip().strip('"')
+    address = result.get('reply_to') or address
+    subject = result.get('subject') or ''
+
+    role = result.get('role')
+    company = result.get('company')
+    match = _ROLE_AT_COMPANY_RE.match(subject)
+    if match:
+        role = role or match.group('role')
+        company = company or match.group('company')
+
+    if not company:
+        company = company_from_address(address)
+
+    return {
+        'name': display_name.split()[0] if display_name else '',
+        'full_name': display_name,
+        'company': company or '',
+        'role': role or '',
+        'pay': format_pay(result.get('pay')),
+        'employment_type': result.get('employment_type') or '',
+        'location': result.get('location') or '',
+        'subject': subject,
+    }
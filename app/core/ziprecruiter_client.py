@@ -1,8 +1,18 @@
 import requests
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 
+from app.core.events import EVENT_NEW_JOB, EVENT_APPLIED, EVENT_ERROR, EVENT_PROGRESS
+from app.core.criteria import JobCriteria
+from app.core.checkpoint import Checkpoint
+from app.core.applications import ApplicationLedger, ApplicationPipeline
+from app.core.job_record import JobBatch, JobRecord
+from app.utils import profiling
+from app.utils.http import HttpTransport, RetryBudget
+
 class ZipRecruiterClient:
     """
     Client for interacting with the ZipRecruiter API.
@@ -25,7 +35,11 @@ class ZipRecruiterClient:
         self.logger = logger
         self.search_thread = None
         self.stop_event = threading.Event()
-        self.session = None
+        # Pooled HTTP client, shared between accounts on the same host by AccountManager
+        self.transport = None
+        
+        # Optional callable(kind, source, **data) used to report progress to the UI
+        self.event_callback = None
         
         # Load ZipRecruiter configuration
         self.ziprecruiter_config = config.get('ziprecruiter', {})
@@ -34,6 +48,55 @@ class ZipRecruiterClient:
         self.email = self.ziprecruiter_config.get('email')
         self.password = self.ziprecruiter_config.get('password')
         
+        # Jobs API location (overridable to point at a local test server)
+        self.api_base_url = self.ziprecruiter_config.get('api_base_url', 'https://api.ziprecruiter.com').rstrip('/')
+        
+        # IDs of postings already reported, oldest first (a dict used as an
+        # ordered set). Only the most recently seen max_seen_jobs are kept, so
+        # the checkpoint rewritten after every query stays small.
+        self.seen_job_ids = {}
+        self.max_seen_jobs = self.ziprecruiter_config.get('max_seen_jobs', 50000)
+        
+        # Retries allowed per search sweep, across all of its requests
+        self.retry_budget = RetryBudget(self.ziprecruiter_config.get('retry_budget', 20))
+        
+        # Guards seen_job_ids and stage_stats when queries run concurrently
+        self._lock = threading.Lock()
+        
+        # Pay, employment type, ... requirements shared with the Gmail monitor
+        self.criteria = JobCriteria.from_config(config, self.logger)
+        
+        # Per-stage timings: stage name -> [count, total seconds]
+        self.stage_stats = {}
+        
+        # Automated applications to matching postings, set up on first use
+        self.auto_apply_config = self.ziprecruiter_config.get('auto_apply', {}) or {}
+        self.applications = None
+        
+        # Seen postings and the queries finished in the current sweep survive
+        # restarts, so an interrupted sweep continues with the remaining queries
+        self.done_queries = set()
+        self.last_sweep = None
+        self.checkpoint = Checkpoint.for_account(
+            self.ziprecruiter_config, 'ziprecruiter', self.ziprecruiter_config.get('checkpoint_name') or self.email
+        )
+        self._restore_checkpoint()
+    
+    @property
+    def session(self):
+        """The requests.Session of the HTTP transport."""
+        return self._get_transport().session
+    
+    def _get_transport(self):
+        """Return the HTTP transport, creating it on first use."""
+        if self.transport is None:
+            concurrency = self.ziprecruiter_config.get('search_concurrency', 4)
+            if self.auto_apply_config.get('enabled'):
+                concurrency += self.auto_apply_config.get('workers', 8)
+            pool_size = max(concurrency, self.ziprecruiter_config.get('http_pool_size', 10))
+            self.transport = HttpTransport.from_config(self.ziprecruiter_config, self.logger, pool_size)
+        return self.transport
+        
     def authenticate(self):
         """
         Authenticate with ZipRecruiter.
@@ -48,19 +111,13 @@ class ZipRecruiterClient:
                 
             self.logger.info(f"Authenticating with ZipRecruiter using email: {self.email}")
             
-            # Create a session for maintaining cookies
-            self.session = requests.Session()
-            
-            # Set user agent to mimic browser
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            self.session.headers.update(headers)
+            # The transport's session keeps cookies and sends a browser user agent
+            transport = self._get_transport()
             
             # Get the login page to capture any CSRF tokens (This is a simplified example)
             # In a real implementation, we would need to parse the login page and extract the CSRF token
             login_url = 'https://www.ziprecruiter.com/login'
-            response = self.session.get(login_url)
+            response = transport.get(login_url, stop_event=self.stop_event)
             
             # Attempt login (This is a simplified example)
             # In a real implementation, we would need to include all required form fields
@@ -100,17 +157,40 @@ class ZipRecruiterClient:
         self.search_thread.start()
         self.logger.info("Started ZipRecruiter search thread")
     
-    def stop_search(self):
-        """Stop job search."""
+    def begin_shutdown(self, timeout=None):
+        """
+        Ask running queries to stop after their current page.
+        
+        Queries finished so far are already checkpointed; the others run
+        again on the next start.
+        
+        Args:
+            timeout: Seconds to wait for the search to stop (defaults to ``shutdown_timeout``)
+        
+        Returns:
+            float: The timeout applied
+        """
+        if timeout is None:
+            timeout = self.ziprecruiter_config.get('shutdown_timeout', 10.0)
+        self.stop_event.set()
+        return timeout
+    
+    def stop_search(self, timeout=None):
+        """
+        Stop job search, checkpointing its progress.
+        
+        Args:
+            timeout: Seconds to wait for the search to stop (defaults to ``shutdown_timeout``)
+        """
         if not self.search_thread or not self.search_thread.is_alive():
             self.logger.warning("Job search is not running")
             return
         
         # Set stop event to signal the thread to exit
-        self.stop_event.set()
+        timeout = self.begin_shutdown(timeout)
         
         # Wait for the thread to finish
-        self.search_thread.join(timeout=5.0)
+        self.search_thread.join(timeout=timeout)
         if self.search_thread.is_alive():
             self.logger.warning("Job search thread did not exit gracefully")
         else:
@@ -129,22 +209,337 @@ class ZipRecruiterClient:
                 # Get search parameters from config
                 keywords = self.ziprecruiter_config.get('keywords', [])
                 locations = self.ziprecruiter_config.get('locations', [])
-                job_types = self.ziprecruiter_config.get('job_types', [])
-                radius = self.ziprecruiter_config.get('search_radius', 25)
                 
                 # Log search parameters
                 self.logger.info(f"Searching for: {', '.join(keywords)} in {', '.join(locations)}")
+                self._emit_event(EVENT_PROGRESS, message=f"Searching for: {', '.join(keywords)}")
                 
-                # Example search URL (would need to be adjusted for actual API)
-                search_url = 'https://www.ziprecruiter.com/candidate/search'
-                
-                # Placeholder for actual search implementation
-                # In a real implementation, we would make API requests and process results
+                new_jobs = self.run_search_sweep()
+                self.logger.info(f"Found {len(new_jobs)} new jobs on ZipRecruiter")
+                self.apply_to_jobs(new_jobs)
+                self.log_transport_stats()
+                self._emit_event(EVENT_PROGRESS, message=f"Found {len(new_jobs)} new jobs")
                 
                 # Wait for the search interval or until stop is requested
                 self.stop_event.wait(search_interval)
                 
             except Exception as e:
                 self.logger.exception(f"Error in job search loop: {e}")
+                self._emit_event(EVENT_ERROR, message=str(e))
                 # Wait for a short time before retrying
                 self.stop_event.wait(60)
+        
+        # Keep the postings seen by an interrupted query
+        self.save_checkpoint()
+    
+    def _restore_checkpoint(self):
+        """Load the seen postings and sweep progress of the previous run."""
+        state = self.checkpoint.load()
+        if not state:
+            return
+        seen = state.get('seen_job_ids', [])
+        self.seen_job_ids = dict.fromkeys(seen[-self.max_seen_jobs:] if self.max_seen_jobs else seen)
+        self.done_queries = {tuple(query) for query in state.get('done_queries', [])}
+        self.last_sweep = state.get('last_sweep')
+        self.logger.info(f"Resuming ZipRecruiter with {len(self.seen_job_ids)} seen postings and "
+                         f"{len(self.done_queries)} queries of the current sweep done")
+    
+    def save_checkpoint(self):
+        """Persist the seen postings and the progress of the current sweep."""
+        with self._lock:
+            state = {
+                'seen_job_ids': list(self.seen_job_ids),
+                'done_queries': [list(query) for query in self.done_queries],
+                'last_sweep': self.last_sweep,
+            }
+        self.checkpoint.save(state)
+    
+    def _mark_seen(self, job_id):
+        """
+        Record a posting as reported.
+        
+        Args:
+            job_id: Posting ID
+        
+        Returns:
+            bool: True if the posting had not been seen before
+        """
+        with self._lock:
+            if job_id in self.seen_job_ids:
+                # Postings that keep showing up stay among the most recent ones
+                del self.seen_job_ids[job_id]
+                self.seen_job_ids[job_id] = None
+                return False
+            self.seen_job_ids[job_id] = None
+            if self.max_seen_jobs and len(self.seen_job_ids) > self.max_seen_jobs:
+                del self.seen_job_ids[next(iter(self.seen_job_ids))]
+            return True
+    
+    def sweep_queries(self):
+        """
+        Return the (keyword, location) queries the current sweep still has to run.
+        
+        Returns:
+            list: Queries in configuration order
+        """
+        queries = [(keyword, location)
+                   for keyword in self.ziprecruiter_config.get('keywords', [])
+                   for location in self.ziprecruiter_config.get('locations', [])]
+        with self._lock:
+            remaining = [query for query in queries if query not in self.done_queries]
+            if not remaining:
+                # The configuration changed since the checkpoint; start a new sweep
+                self.done_queries.clear()
+                remaining = queries
+        return remaining
+    
+    def _complete_query(self, keyword, location):
+        """Record a finished query, closing the sweep after its last query."""
+        with self._lock:
+            self.done_queries.add((keyword, location))
+            queries = {(k, l) for k in self.ziprecruiter_config.get('keywords', [])
+                       for l in self.ziprecruiter_config.get('locations', [])}
+            if queries <= self.done_queries:
+                self.done_queries.clear()
+                self.last_sweep = time.time()
+        self.save_checkpoint()
+    
+    def seconds_until_next_sweep(self, interval):
+        """
+        Return how long to wait before the next sweep after a restart.
+        
+        Args:
+            interval: Seconds between sweeps
+        
+        Returns:
+            float: 0 if a sweep is unfinished or due
+        """
+        if self.done_queries or self.last_sweep is None:
+            return 0.0
+        return max(0.0, self.last_sweep + interval - time.time())
+    
+    @contextmanager
+    def _timed(self, stage):
+        """Accumulate the duration of a pipeline stage in stage_stats."""
+        profiling.checkpoint()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self.stage_stats.setdefault(stage, [0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed
+    
+    def search_jobs(self, keyword, location, radius=25, page=1, jobs_per_page=20):
+        """
+        Fetch one page of search results from the ZipRecruiter jobs API.
+        
+        Rate-limited (429) and server error (5xx) responses are retried after
+        the server's Retry-After delay or an exponential backoff, up to
+        ``max_retries`` times per request and within the sweep's retry budget.
+        
+        Args:
+            keyword: Search keywords
+            location: Location to search in
+            radius: Search radius in miles
+            page: Page number, starting at 1
+            jobs_per_page: Results per page
+        
+        Returns:
+            dict: Decoded response with 'jobs' and 'total_jobs' keys
+        """
+        params = {
+            'search': keyword,
+            'location': location,
+            'radius_miles': radius,
+            'page': page,
+            'jobs_per_page': jobs_per_page,
+            'api_key': self.ziprecruiter_config.get('api_key', '')
+        }
+        response = self._get_transport().get(
+            f"{self.api_base_url}/jobs/v1", params=params,
+            budget=self.retry_budget, stop_event=self.stop_event
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    def search_query(self, keyword, location):
+        """
+        Page through the results of one keyword/location search.
+        
+        A query that runs to its last page is recorded in the checkpoint as
+        done for the current sweep.
+        
+        Args:
+            keyword: Search keywords
+            location: Location to search in
+        
+        Returns:
+            list: Postings not seen before that meet the criteria
+        """
+        job_types = self.ziprecruiter_config.get('job_types', [])
+        radius = self.ziprecruiter_config.get('search_radius', 25)
+        max_pages = self.ziprecruiter_config.get('max_pages', 5)
+        jobs_per_page = self.ziprecruiter_config.get('jobs_per_page', 20)
+        
+        new_jobs = []
+        for page in range(1, max_pages + 1):
+            if self.stop_event.is_set():
+                # Not done: the query runs again after a restart
+                return new_jobs
+            
+            with self._timed('search'):
+                data = self.search_jobs(keyword, location, radius, page, jobs_per_page)
+            jobs = data.get('jobs', [])
+            
+            fresh = []
+            for job in jobs:
+                employment_type = job.get('employment_type')
+                if job_types and employment_type and employment_type not in job_types:
+                    continue
+                if not self._mark_seen(job['id']):
+                    continue
+                fresh.append(job)
+            
+            # The page is checked against the criteria as one batch, with a string table of its own
+            batch = JobBatch()
+            batch.extend(JobRecord.from_posting(job, strings=batch.strings) for job in fresh)
+            for index in self.criteria.filter_batch(batch):
+                job = fresh[index]
+                new_jobs.append(job)
+                company = job.get('hiring_company', {}).get('name', '')
+                self._emit_event(EVENT_NEW_JOB, message=f"{job.get('name', '')} at {company}")
+            
+            # A short page means there are no more results
+            if len(jobs) < jobs_per_page:
+                break
+        
+        self._complete_query(keyword, location)
+        return new_jobs
+    
+    def run_search_sweep(self):
+        """
+        Run one search over every configured keyword and location.
+        
+        Up to ``search_concurrency`` queries run at the same time over the
+        transport's connection pool. The sweep starts with a full retry budget;
+        a query that still fails is logged and skipped. A sweep interrupted
+        by a stop or restart continues with the queries it had not finished.
+        
+        Returns:
+            list: Postings not seen in earlier sweeps
+        """
+        queries = self.sweep_queries()
+        concurrency = max(1, min(self.ziprecruiter_config.get('search_concurrency', 4), len(queries)))
+        self.retry_budget.reset()
+        
+        def run(query):
+            if self.stop_event.is_set():
+                return []
+            try:
+                return self.search_query(*query)
+            except requests.RequestException as e:
+                # Keep the results of the other queries
+                self.logger.error(f"ZipRecruiter search for {query[0]!r} in {query[1]!r} failed: {e}")
+                self._emit_event(EVENT_ERROR, message=str(e))
+                return []
+        
+        if concurrency == 1:
+            results = map(run, queries)
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='ziprecruiter-search') as executor:
+                results = list(executor.map(run, queries))
+        
+        new_jobs = []
+        for jobs in results:
+            new_jobs.extend(jobs)
+        
+        if not self.stop_event.is_set() and self.done_queries:
+            # Failed queries are skipped until the next sweep rather than retried forever
+            with self._lock:
+                self.done_queries.clear()
+                self.last_sweep = time.time()
+            self.save_checkpoint()
+        return new_jobs
+    
+    def _get_applications(self):
+        """Return the application pipeline, creating it on first use."""
+        if self.applications is None:
+            settings = self.auto_apply_config
+            account = self.ziprecruiter_config.get('checkpoint_name') or self.email or 'default'
+            ledger = ApplicationLedger(settings.get('ledger', 'app/resources/applications.db'))
+            self.applications = ApplicationPipeline(
+                self._get_transport(), ledger, self.logger, account,
+                apply_url=settings.get('apply_url') or f"{self.api_base_url}/jobs/v1/apply",
+                applicant={
+                    'name': settings.get('applicant_name', ''),
+                    'email': settings.get('applicant_email') or self.email,
+                    'phone': settings.get('applicant_phone', ''),
+                },
+                resume_path=settings.get('resume_path', 'app/resources/dummy_resume.txt'),
+                workers=settings.get('workers', 8),
+                rate_per_host=settings.get('rate_per_host', 2.0),
+                max_per_sweep=settings.get('max_per_sweep', 200),
+                retry_budget=settings.get('retry_budget', 20),
+                one_per_company=settings.get('one_per_company', False),
+                max_attempts=settings.get('max_attempts', 5)
+            )
+            self.applications.on_applied = self._on_applied
+            if self.applications.one_per_company:
+                # Postings from companies applied to earlier are not reported again
+                for company in ledger.applied_companies(account):
+                    self.criteria.exclude_company(company)
+        return self.applications
+    
+    def _on_applied(self, posting):
+        """Report a submitted application."""
+        company = (posting.get('hiring_company') or {}).get('name') or ''
+        if company and self.applications.one_per_company:
+            with self._lock:
+                self.criteria.exclude_company(company)
+        self._emit_event(EVENT_APPLIED, message=f"{posting.get('name', '')} at {company}")
+    
+    def apply_to_jobs(self, postings):
+        """
+        Apply to postings that met the criteria, if ``auto_apply.enabled`` is set.
+        
+        Unfinished applications of earlier sweeps are resent as well.
+        
+        Args:
+            postings: Postings returned by run_search_sweep or search_query
+        
+        Returns:
+            dict: Outcome -> count (empty when auto-apply is off)
+        """
+        if not self.auto_apply_config.get('enabled'):
+            return {}
+        with self._timed('apply'):
+            outcomes = self._get_applications().apply(
+                postings, stop_event=self.stop_event, criteria=self.criteria
+            )
+        if outcomes:
+            self.logger.info("ZipRecruiter applications: " + ", ".join(f"{count} {outcome}"
+                                                                      for outcome, count in sorted(outcomes.items())))
+        return outcomes
+    
+    def log_transport_stats(self):
+        """Log connection reuse and retry counters of the HTTP transport."""
+        stats = self._get_transport().stats()
+        self.logger.info(
+            f"ZipRecruiter HTTP: {stats['requests']} requests over {stats['connections']} connections "
+            f"({stats['reuse_ratio']:.0%} reused), {stats['retries']} retries, "
+            f"{self.retry_budget.denied} retries over budget, {stats['failures']} failures"
+        )
+    
+    def _emit_event(self, kind, **data):
+        """
+        Report an event to the registered event callback, if any.
+        
+        Args:
+            kind: One of the EVENT_* constants from app.core.events
+            **data: Event payload
+        """
+        if self.event_callback is not None:
+            self.event_callback(kind, 'ziprecruiter', **data)
@@ -3,14 +3,16 @@ import os
 from pathlib import Path
 
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from dotenv import load_dotenv
 
 from app.utils.config import Config
 from app.utils.logger import Logger
 from app.core.gmail_monitor import GmailMonitor
 from app.core.ziprecruiter_client import ZipRecruiterClient
+from app.core.account_manager import AccountManager
 from app.ui.main_window import MainWindow
+from app.utils.profiling import Profiler
 
 def main():
     """Main application entry point."""
@@ -39,8 +41,25 @@ def main():
     gmail_monitor = GmailMonitor(config, logger)
     ziprecruiter_client = ZipRecruiterClient(config, logger)
     
+    # SIGUSR1 toggles CPU profiling, SIGUSR2 writes a memory snapshot
+    profiler = Profiler(config, logger)
+    profiler.install_signal_handlers()
+    
+    # Python only runs signal handlers between bytecodes, so wake the
+    # interpreter regularly while Qt's event loop is waiting
+    signal_timer = QTimer()
+    signal_timer.timeout.connect(lambda: None)
+    signal_timer.start(500)
+    
     # Initialize main window
-    main_window = MainWindow(config, logger, gmail_monitor, ziprecruiter_client)
+    main_window = MainWindow(config, logger, gmail_monitor, ziprecruiter_client, profiler)
+    
+    # Additional accounts share one worker pool and job store
+    account_manager = None
+    if config.get('accounts'):
+        account_manager = AccountManager(config, logger)
+        account_manager.event_callback = main_window.event_bridge.post
+        account_manager.start()
     
     # When started from run_app.py, always show the main window
     # Check the name of the script that started the application
@@ -59,6 +78,8 @@ def main():
     
     # Cleanup before exit
     log.info("Shutting down Job Assistant AI application")
+    if account_manager is not None:
+        account_manager.stop()
     
     return exit_code
 
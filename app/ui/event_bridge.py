@@ -0,0 +1,80 @@
+from collections import deque
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from app.core.events import EVENT_PROGRESS, make_event
+
+
+class EventBridge(QObject):
+    """
+    Coalescing bridge that carries worker-thread events to the Qt thread.
+
+    Worker threads call ``post`` which only appends to a ``deque`` (appends
+    and pops are atomic in CPython, so no lock is taken on the hot path).
+    A ``QTimer`` running on the UI thread drains the queue at a fixed rate
+    and emits the events as a single batch. Progress events are coalesced
+    so that only the latest one per source is delivered in each batch.
+    """
+
+    batch_ready = Signal(list)
+
+    def __init__(self, flush_hz=20, max_batch=500, parent=None):
+        """
+        Initialize the event bridge.
+
+        Args:
+            flush_hz: Number of flushes per second
+            max_batch: Maximum number of events drained per flush
+            parent: Optional parent QObject
+        """
+        super().__init__(parent)
+        self.max_batch = max_batch
+        self._queue = deque()
+        self.dropped_progress = 0
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, int(1000 / flush_hz)))
+        self._timer.timeout.connect(self.flush)
+
+    def start(self):
+        """Start periodic flushing."""
+        self._timer.start()
+
+    def stop(self):
+        """Stop periodic flushing and deliver anything still queued."""
+        self._timer.stop()
+        while self._queue:
+            self.flush()
+
+    def post(self, kind, source, **data):
+        """
+        Queue an event. Safe to call from any thread.
+
+        Args:
+            kind: One of the EVENT_* constants from app.core.events
+            source: Name of the emitting service
+            **data: Event payload
+        """
+        self._queue.append(make_event(kind, source, **data))
+
+    def flush(self):
+        """Drain up to ``max_batch`` events and emit them as one batch."""
+        queue = self._queue
+        if not queue:
+            return
+
+        batch = []
+        latest_progress = {}
+        for _ in range(min(len(queue), self.max_batch)):
+            event = queue.popleft()
+            if event.kind == EVENT_PROGRESS:
+                # Keep only the newest progress event per source
+                if event.source in latest_progress:
+                    self.dropped_progress += 1
+                latest_progress[event.source] = event
+            else:
+                batch.append(event)
+
+        batch.extend(latest_progress.values())
+        if batch:
+            self.batch_ready.emit(batch)
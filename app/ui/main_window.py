@@ -4,15 +4,23 @@ from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, 
     QPushButton, QLabel, QTextEdit, QTabWidget, 
     QGridLayout, QGroupBox, QCheckBox, QLineEdit, 
-    QFileDialog, QMessageBox, QSystemTrayIcon, QMenu
+    QFileDialog, QMessageBox, QSystemTrayIcon, QMenu, QListWidget,
+    QAbstractItemView
 )
 from PySide6.QtGui import QIcon, QAction
 from PySide6.QtCore import Qt, QTimer
 
+from app.core.events import (
+    EVENT_NEW_JOB, EVENT_REPLY_SENT, EVENT_APPLIED, EVENT_ERROR, EVENT_PROGRESS, EVENT_CLASSIFIER_UPDATED,
+    EVENT_PROFILING
+)
+from app.ui.event_bridge import EventBridge
+from app.utils.profiling import Profiler
+
 class MainWindow(QMainWindow):
     """Main application window for the Job Assistant AI."""
     
-    def __init__(self, config, logger, gmail_monitor, ziprecruiter_client):
+    def __init__(self, config, logger, gmail_monitor, ziprecruiter_client, profiler=None):
         """Initialize the main window."""
         super().__init__()
         
@@ -21,6 +29,15 @@ class MainWindow(QMainWindow):
         self.gmail_monitor = gmail_monitor
         self.ziprecruiter_client = ziprecruiter_client
         
+        # On-demand CPU and memory profiling, controlled from the tray menu
+        self.profiler = profiler or Profiler(config, logger)
+        
+        # Bridge that delivers worker-thread events to the UI in batches
+        self.event_bridge = EventBridge(flush_hz=20, parent=self)
+        self.gmail_monitor.event_callback = self.event_bridge.post
+        self.ziprecruiter_client.event_callback = self.event_bridge.post
+        self.profiler.event_callback = self.event_bridge.post
+        
         # Set up the UI
         self._setup_ui()
         
@@ -29,6 +46,8 @@ class MainWindow(QMainWindow):
         
         # Connect signals
         self._connect_signals()
+        
+        self.event_bridge.start()
     
     def _setup_ui(self):
         """Set up the user interface."""
@@ -69,6 +88,13 @@ class MainWindow(QMainWindow):
         
         email_layout.addWidget(email_buttons)
         
+        # Activity log fed by worker events
+        activity_log = QTextEdit()
+        activity_log.setReadOnly(True)
+        activity_log.document().setMaximumBlockCount(1000)
+        self.activity_log = activity_log
+        email_layout.addWidget(activity_log)
+        
         # Job search tab
         job_tab = QWidget()
         tabs.addTab(job_tab, "Job Search")
@@ -78,6 +104,40 @@ class MainWindow(QMainWindow):
         self.job_status_label = job_status
         job_layout.addWidget(job_status)
         
+        # Training tab: label recent emails to train the job email classifier
+        training_tab = QWidget()
+        self.training_tab = training_tab
+        tabs.addTab(training_tab, "Email Training")
+        self.tabs = tabs
+        
+        training_layout = QVBoxLayout(training_tab)
+        classifier_status = QLabel()
+        self.classifier_status_label = classifier_status
+        training_layout.addWidget(classifier_status)
+        
+        training_list = QListWidget()
+        training_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.training_list = training_list
+        self.training_records = []
+        training_layout.addWidget(training_list)
+        
+        training_buttons = QWidget()
+        training_buttons_layout = QGridLayout(training_buttons)
+        
+        refresh_training_btn = QPushButton("Refresh")
+        label_job_btn = QPushButton("Job Email")
+        label_other_btn = QPushButton("Not a Job")
+        
+        self.refresh_training_btn = refresh_training_btn
+        self.label_job_btn = label_job_btn
+        self.label_other_btn = label_other_btn
+        
+        training_buttons_layout.addWidget(refresh_training_btn, 0, 0)
+        training_buttons_layout.addWidget(label_job_btn, 0, 1)
+        training_buttons_layout.addWidget(label_other_btn, 0, 2)
+        
+        training_layout.addWidget(training_buttons)
+        
         # Bottom buttons
         bottom_buttons = QWidget()
         bottom_layout = QGridLayout(bottom_buttons)
@@ -110,9 +170,14 @@ class MainWindow(QMainWindow):
         tray_menu = QMenu()
         
         show_action = QAction("Show", self)
+        self.profile_action = QAction("Start CPU Profile", self)
+        memory_action = QAction("Take Memory Snapshot", self)
         quit_action = QAction("Quit", self)
         
         tray_menu.addAction(show_action)
+        profiling_menu = tray_menu.addMenu("Profiling")
+        profiling_menu.addAction(self.profile_action)
+        profiling_menu.addAction(memory_action)
         tray_menu.addAction(quit_action)
         
         self.tray_icon.setContextMenu(tray_menu)
@@ -120,6 +185,8 @@ class MainWindow(QMainWindow):
         
         # Connect actions
         show_action.triggered.connect(self.show)
+        self.profile_action.triggered.connect(self.toggle_profiling)
+        memory_action.triggered.connect(self.take_memory_snapshot)
         quit_action.triggered.connect(self.close_application)
     
     def _connect_signals(self):
@@ -128,6 +195,44 @@ class MainWindow(QMainWindow):
         self.stop_email_btn.clicked.connect(self.stop_email_monitoring)
         self.exit_btn.clicked.connect(self.close_application)
         self.settings_btn.clicked.connect(self.open_settings)
+        self.refresh_training_btn.clicked.connect(self.refresh_training_list)
+        self.label_job_btn.clicked.connect(lambda: self.label_selected_emails(True))
+        self.label_other_btn.clicked.connect(lambda: self.label_selected_emails(False))
+        self.tabs.currentChanged.connect(self._tab_changed)
+        self.event_bridge.batch_ready.connect(self._handle_worker_events)
+    
+    def _handle_worker_events(self, events):
+        """
+        Apply a batch of worker events to the UI.
+        
+        Args:
+            events: List of WorkerEvent tuples delivered by the event bridge
+        """
+        lines = []
+        for event in events:
+            message = event.data.get('message', '')
+            if event.kind == EVENT_PROGRESS:
+                if event.source.startswith('gmail'):
+                    self.email_status_label.setText(f"Email monitoring status: {message}")
+                else:
+                    self.job_status_label.setText(f"Job search status: {message}")
+            elif event.kind == EVENT_NEW_JOB:
+                lines.append(f"[{event.source}] New job: {message}")
+            elif event.kind == EVENT_REPLY_SENT:
+                lines.append(f"[{event.source}] Reply sent: {message}")
+            elif event.kind == EVENT_APPLIED:
+                lines.append(f"[{event.source}] Applied: {message}")
+            elif event.kind == EVENT_ERROR:
+                lines.append(f"[{event.source}] Error: {message}")
+            elif event.kind == EVENT_CLASSIFIER_UPDATED:
+                self._update_classifier_status()
+            elif event.kind == EVENT_PROFILING:
+                # Toggled by SIGUSR1
+                self._show_profiling_state(event.data.get('path'))
+        
+        # One append per batch keeps layout work bounded
+        if lines:
+            self.activity_log.append("\n".join(lines))
     
     def start_email_monitoring(self):
         """Start email monitoring service."""
@@ -141,6 +246,74 @@ class MainWindow(QMainWindow):
         self.email_status_label.setText("Email monitoring status: Stopped")
         self.logger.info("Email monitoring stopped from UI")
     
+    def _tab_changed(self, index):
+        """Refresh the training list when its tab is opened."""
+        if self.tabs.widget(index) is self.training_tab:
+            self.refresh_training_list()
+    
+    def refresh_training_list(self):
+        """List the recently classified emails, newest first, for labeling."""
+        self.training_records = self.gmail_monitor.recent_snapshot()[::-1]
+        self.training_list.clear()
+        for record in self.training_records:
+            if record['probability'] is None:
+                verdict = 'job' if record['is_job'] else 'other'
+            else:
+                verdict = f"{record['probability']:.0%} job"
+            self.training_list.addItem(f"[{verdict}] {record['subject']} - {record['from']}")
+        self._update_classifier_status()
+    
+    def label_selected_emails(self, is_job):
+        """Teach the classifier the label of the selected emails in the background."""
+        rows = sorted({index.row() for index in self.training_list.selectedIndexes()}, reverse=True)
+        if not rows:
+            return
+        # The status is updated when the monitor reports that the model was saved
+        self.gmail_monitor.label_messages_async([self.training_records[row] for row in rows], is_job)
+        for row in rows:
+            self.training_list.takeItem(row)
+            del self.training_records[row]
+    
+    def _update_classifier_status(self):
+        """Show how many labels the classifier has learned and whether it is in use."""
+        classifier = self.gmail_monitor.classifier
+        if classifier is None:
+            self.classifier_status_label.setText("Email classifier: disabled, emails are classified by keywords")
+            return
+        job_labels, other_labels = classifier.label_counts
+        if self.gmail_monitor.classifier_active():
+            state = "in use"
+        else:
+            min_labels = self.gmail_monitor.classifier_config.get('min_labels', 10)
+            state = f"keywords are used until {min_labels} emails of each kind are labeled"
+        self.classifier_status_label.setText(
+            f"Email classifier: {job_labels} job / {other_labels} other emails labeled, {state}"
+        )
+    
+    def toggle_profiling(self):
+        """Start a CPU profiling session, or stop the running one and report where it was saved."""
+        self._show_profiling_state(self.profiler.toggle())
+    
+    def _show_profiling_state(self, path):
+        """Update the tray action after profiling was started or stopped, reporting the written profile."""
+        if self.profiler.running:
+            self.profile_action.setText("Stop CPU Profile")
+            self.activity_log.append(f"CPU profiling started ({self.profiler.mode})")
+        else:
+            self.profile_action.setText("Start CPU Profile")
+            if path:
+                self.activity_log.append(f"CPU profile written to {path}")
+                self.tray_icon.showMessage("Job Assistant AI", f"Profile written to {path}",
+                                           QSystemTrayIcon.Information, 3000)
+    
+    def take_memory_snapshot(self):
+        """Write a tracemalloc snapshot with the allocation differences since the previous one."""
+        try:
+            path = self.profiler.memory_snapshot()
+            self.activity_log.append(f"Memory snapshot written to {path}")
+        except Exception as e:
+            self.logger.error(f"Error taking memory snapshot: {e}")
+    
     def closeEvent(self, event):
         """Handle window close event."""
         # Minimize to tray instead of closing
@@ -155,8 +328,13 @@ class MainWindow(QMainWindow):
     
     def close_application(self):
         """Properly close the application."""
-        # Stop services
+        # Stop services; unfinished work is checkpointed and resumed on the next start
         self.gmail_monitor.stop_monitoring()
+        if self.ziprecruiter_client.search_thread and self.ziprecruiter_client.search_thread.is_alive():
+            self.ziprecruiter_client.stop_search()
+        self.event_bridge.stop()
+        if self.profiler.running:
+            self.profiler.stop()
         
         # Really quit the application
         self.tray_icon.hide()
@@ -0,0 +1,271 @@
+import threading
+import time
+
+from urllib.parse import urlparse
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+# gzip and deflate, plus br and zstd when their decoders are installed
+ACCEPT_ENCODING = urllib3.util.make_headers(accept_encoding=True)['accept-encoding']
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+# Rate-limited and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class _Session(requests.Session):
+    """
+    Session that reads proxy and CA bundle settings from the environment
+    once per host.
+
+    requests scans every environment variable for proxies on each request,
+    which costs more than the request itself on a fast local connection.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._environment = {}
+        self._environment_lock = threading.Lock()
+
+    def merge_environment_settings(self, url, proxies, stream, verify, cert):
+        if proxies or stream is not None or verify is not None or cert is not None or not self.trust_env:
+            return super().merge_environment_settings(url, proxies, stream, verify, cert)
+        parts = urlparse(url)
+        key = (parts.scheme, parts.netloc)
+        with self._environment_lock:
+            settings = self._environment.get(key)
+            if settings is None:
+                settings = super().merge_environment_settings(url, {}, None, None, None)
+                self._environment[key] = settings
+        return dict(settings, proxies=dict(settings['proxies']))
+
+
+class RetryBudget:
+    """
+    Thread-safe cap on the number of retries, shared by all requests of a sweep.
+
+    Per-request retries alone let a struggling server multiply the load of
+    a sweep; once the budget is spent, failed requests are returned as is.
+    """
+
+    def __init__(self, limit):
+        """
+        Initialize the retry budget.
+
+        Args:
+            limit: Retries allowed until the next reset (None = unlimited)
+        """
+        self.limit = limit
+        self.spent = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Start a new sweep with the full budget."""
+        with self._lock:
+            self.spent = 0
+            self.denied = 0
+
+    def try_spend(self):
+        """
+        Take one retry from the budget.
+
+        Returns:
+            bool: True if the retry may be made
+        """
+        with self._lock:
+            if self.limit is not None and self.spent >= self.limit:
+                self.denied += 1
+                return False
+            self.spent += 1
+            return True
+
+    @property
+    def remaining(self):
+        """Retries left in the budget (None if unlimited)."""
+        return None if self.limit is None else max(0, self.limit - self.spent)
+
+
+class HttpTransport:
+    """
+    Pooled HTTP client for one API host.
+
+    Wraps a requests.Session whose adapter keeps up to ``pool_size``
+    keep-alive connections per host and makes extra threads wait for a free
+    connection rather than open throwaway ones. Every request gets connect
+    and read timeouts and asks for compressed responses. Rate-limited and
+    server error responses, as well as connection failures of idempotent
+    requests, are retried after the server's Retry-After delay or an
+    exponential backoff, within the caller's retry budget. A response asking
+    to wait longer than ``max_retry_after`` is returned without retrying.
+    """
+
+    def __init__(self, logger, pool_size=10, connect_timeout=5.0, read_timeout=30.0, max_retries=3,
+                 max_retry_after=60.0):
+        """
+        Initialize the transport.
+
+        Args:
+            logger: Application logger
+            pool_size: Connections kept open per host; should match the number of threads using the transport
+            connect_timeout: Seconds to wait for a connection
+            read_timeout: Seconds to wait for response data
+            max_retries: Retries per request
+            max_retry_after: Longest Retry-After delay, in seconds, that is waited for
+        """
+        self.logger = logger
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.max_retry_after = max_retry_after
+
+        self.session = _Session()
+        self.session.headers.update({'User-Agent': USER_AGENT, 'Accept-Encoding': ACCEPT_ENCODING})
+        # Retries are handled in request() so they can honor Retry-After and the budget
+        self.adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0, pool_block=True)
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._failures = 0
+
+    @classmethod
+    def from_config(cls, section, logger, pool_size=None):
+        """
+        Create a transport from a configuration section.
+
+        Args:
+            section: Configuration section with optional 'http_pool_size',
+                'connect_timeout', 'read_timeout', 'max_retries' and 'max_retry_after' keys
+            logger: Application logger
+            pool_size: Overrides 'http_pool_size'
+
+        Returns:
+            HttpTransport: The transport
+        """
+        return cls(
+            logger,
+            pool_size=pool_size or section.get('http_pool_size', 10),
+            connect_timeout=section.get('connect_timeout', 5.0),
+            read_timeout=section.get('read_timeout', 30.0),
+            max_retries=section.get('max_retries', 3),
+            max_retry_after=section.get('max_retry_after', 60.0)
+        )
+
+    def request(self, method, url, budget=None, stop_event=None, **kwargs):
+        """
+        Send a request, retrying transient failures.
+
+        Non-idempotent requests are only retried after a 429 response.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            budget: RetryBudget the retries are taken from (unlimited if omitted)
+            stop_event: Optional threading.Event that cancels retry waits
+            **kwargs: Passed to requests.Session.request
+
+        Returns:
+            requests.Response: The last response, which may still be an error
+
+        Raises:
+            requests.RequestException: If the request failed without a response
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        idempotent = method.upper() in ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+        # A failed POST may have been processed; only a rate-limited one surely was not
+        retry_statuses = RETRY_STATUSES if idempotent else {429}
+
+        attempt = 0
+        response = None
+        while True:
+            with self._lock:
+                self._requests += 1
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not idempotent or not self._may_retry(attempt, budget):
+                    with self._lock:
+                        self._failures += 1
+                    raise
+                response = None
+                delay = 2 ** attempt
+                self.logger.warning(f"Request to {url} failed ({e}), retrying in {delay} seconds")
+            else:
+                if response.status_code not in retry_statuses:
+                    return response
+                delay = self._retry_after(response, attempt)
+                if not delay <= self.max_retry_after:
+                    # Not worth holding a worker and a connection that long
+                    self.logger.warning(f"{url} returned {response.status_code} and asked to retry in {delay} "
+                                        f"seconds, more than {self.max_retry_after}; giving up")
+                    return response
+                if not self._may_retry(attempt, budget):
+                    return response
+                self.logger.warning(f"{url} returned {response.status_code}, retrying in {delay} seconds")
+
+            attempt += 1
+            if stop_event is not None:
+                if stop_event.wait(delay):
+                    if response is None:
+                        raise requests.ConnectionError(f"Request to {url} cancelled")
+                    return response
+            else:
+                time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        """Send a GET request (see request())."""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """Send a POST request (see request()); POSTs are only retried when rate limited."""
+        return self.request('POST', url, **kwargs)
+
+    def _may_retry(self, attempt, budget):
+        if attempt >= self.max_retries:
+            return False
+        if budget is not None and not budget.try_spend():
+            return False
+        with self._lock:
+            self._retries += 1
+        return True
+
+    @staticmethod
+    def _retry_after(response, attempt):
+        try:
+            return max(0.0, float(response.headers.get('Retry-After', 2 ** attempt)))
+        except ValueError:
+            # An HTTP date rather than seconds
+            return float(2 ** attempt)
+
+    def stats(self):
+        """
+        Report request and connection reuse counters.
+
+        Returns:
+            dict: 'requests', 'retries', 'failures', 'connections' (opened),
+                'reused' (requests sent on an already open connection) and 'reuse_ratio'
+        """
+        pools = self.adapter.poolmanager.pools
+        opened = sent = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                sent += pool.num_requests
+        with self._lock:
+            stats = {'requests': self._requests, 'retries': self._retries, 'failures': self._failures}
+        stats['connections'] = opened
+        stats['reused'] = max(0, sent - opened)
+        stats['reuse_ratio'] = round(stats['reused'] / sent, 3) if sent else 0.0
+        return stats
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
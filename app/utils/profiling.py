@@ -0,0 +1,363 @@
+import cProfile
+import datetime
+import io
+import os
+import pstats
+import signal
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+from app.core.events import EVENT_PROFILING
+
+DEFAULT_LOG_DIR = Path(__file__).parent.parent.parent / 'logs'
+
+# cProfile session worker threads attach to at their next checkpoint (None when off)
+_cprofile_session = None
+_thread_state = threading.local()
+
+# From Python 3.12 cProfile is built on sys.monitoring: only one profiler can
+# be enabled at a time, and it sees every thread
+_PROCESS_WIDE_CPROFILE = sys.version_info >= (3, 12)
+
+
+def checkpoint():
+    """
+    Attach or detach the calling thread's cProfile profiler.
+
+    cProfile only profiles the thread that enables it, so worker threads
+    call this at the start of every pipeline stage. It costs two attribute
+    lookups while no cProfile session is running.
+    """
+    session = _cprofile_session
+    profile = getattr(_thread_state, 'profile', None)
+    if profile is not None and (session is None or _thread_state.session is not session):
+        profile.disable()
+        _thread_state.profile = None
+        profile = None
+    if session is not None and profile is None:
+        _thread_state.profile = session.attach()
+        _thread_state.session = session
+
+
+def _timestamp():
+    return datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]
+
+
+class _CProfileSession:
+    """
+    One cProfile.Profile per worker thread, merged when the session stops.
+
+    Where only one profiler can be enabled (Python 3.12+), the first thread
+    to attach enables a single process-wide profiler instead, and the other
+    threads share it.
+    """
+
+    def __init__(self):
+        self.profiles = {}
+        self._lock = threading.Lock()
+
+    def attach(self):
+        if _PROCESS_WIDE_CPROFILE:
+            with self._lock:
+                profile = self.profiles.get('all threads')
+                if profile is None:
+                    profile = self.profiles['all threads'] = cProfile.Profile()
+                    profile.enable()
+            return profile
+        profile = cProfile.Profile()
+        with self._lock:
+            self.profiles[threading.current_thread().name] = profile
+        profile.enable()
+        return profile
+
+    def close(self):
+        """
+        Disable the session's profiles.
+
+        From Python 3.12 this stops the process-wide profiler, so a new
+        session can enable its own. Before 3.12 disabling only removes the
+        calling thread's hook; workers remove theirs at their next checkpoint
+        and whatever they record until then is not reported.
+        """
+        with self._lock:
+            profiles = list(self.profiles.values())
+        for profile in profiles:
+            profile.disable()
+
+    def stats(self):
+        """Merge the per-thread profiles, or return None if no thread attached."""
+        with self._lock:
+            profiles = list(self.profiles.values())
+        stats = None
+        for profile in profiles:
+            # Also disables the profile, which close() has already done
+            profile.create_stats()
+            if stats is None:
+                stats = pstats.Stats(profile, stream=io.StringIO())
+            else:
+                stats.add(profile)
+        return stats
+
+
+class _StackSampler(threading.Thread):
+    """Samples the stacks of every other thread at a fixed interval."""
+
+    def __init__(self, interval):
+        super().__init__(name='profiler-sampler', daemon=True)
+        self.interval = interval
+        self.samples = Counter()
+        self.sample_count = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        own = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                self.samples[(names.get(ident, str(ident)), tuple(reversed(stack)))] += 1
+            self.sample_count += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(timeout=5.0)
+
+
+def _describe(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class Profiler:
+    """
+    On-demand CPU and memory profiling of the running application.
+
+    A CPU session either samples the stacks of all threads (``sampling``,
+    the default, which also covers a scan that is already running) or
+    collects cProfile statistics from the monitor and search threads
+    (``cprofile``, which attach at their next pipeline stage). Memory
+    snapshots use tracemalloc and report the top allocation differences
+    since the previous snapshot. Reports are written to timestamped files
+    under the log directory.
+
+    Sessions toggled by SIGUSR1 are reported to ``event_callback`` as
+    EVENT_PROFILING events, so the UI can show the current state.
+    """
+
+    def __init__(self, config, logger, log_dir=None):
+        """
+        Initialize the profiler.
+
+        Args:
+            config: Application configuration
+            logger: Application logger
+            log_dir: Directory for reports (defaults to logs/)
+        """
+        self.logger = logger
+        profiling_config = config.get('profiling', {}) or {}
+        self.mode = profiling_config.get('mode', 'sampling')
+        self.sample_interval = profiling_config.get('sample_interval', 0.005)
+        self.top_n = profiling_config.get('top_n', 25)
+        self.tracemalloc_frames = profiling_config.get('tracemalloc_frames', 10)
+        self.log_dir = Path(log_dir or profiling_config.get('log_dir') or DEFAULT_LOG_DIR)
+
+        self._lock = threading.Lock()
+        self._memory_lock = threading.Lock()
+        self._sampler = None
+        self._session = None
+        self._started_at = None
+        self._last_snapshot = None
+        self.event_callback = None
+
+    @property
+    def running(self):
+        """True while a CPU profiling session is active."""
+        return self._sampler is not None or self._session is not None
+
+    def start(self, mode=None):
+        """
+        Start a CPU profiling session.
+
+        Args:
+            mode: 'sampling' or 'cprofile' (defaults to the configured mode)
+        """
+        global _cprofile_session
+        with self._lock:
+            if self.running:
+                return
+            mode = mode or self.mode
+            self._started_at = datetime.datetime.now()
+            if mode == 'cprofile':
+                self._session = _CProfileSession()
+                _cprofile_session = self._session
+            else:
+                self._sampler = _StackSampler(self.sample_interval)
+                self._sampler.start()
+        self.logger.info(f"Started {mode} profiling")
+
+    def stop(self):
+        """
+        Stop the CPU profiling session and write its report.
+
+        Returns:
+            Path: The report file, or None if no session was running
+        """
+        global _cprofile_session
+        with self._lock:
+            sampler, session = self._sampler, self._session
+            self._sampler = self._session = None
+            if session is not None:
+                _cprofile_session = None
+        if sampler is not None:
+            sampler.stop()
+            path = self._write_sampling_report(sampler)
+        elif session is not None:
+            session.close()
+            path = self._write_cprofile_report(session)
+        else:
+            return None
+        self.logger.info(f"Profile written to {path}")
+        return path
+
+    def toggle(self):
+        """Start a session if none is running, otherwise stop it and write the report."""
+        if self.running:
+            return self.stop()
+        self.start()
+        return None
+
+    def memory_snapshot(self):
+        """
+        Take a tracemalloc snapshot and write the top allocations and the
+        differences since the previous snapshot.
+
+        Tracing starts with the first call, so that snapshot is the baseline.
+
+        Returns:
+            Path: The report file
+        """
+        with self._memory_lock:
+            return self._memory_snapshot_locked()
+
+    def _memory_snapshot_locked(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.tracemalloc_frames)
+            self._last_snapshot = None
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+
+        lines = [f"Memory snapshot {datetime.datetime.now().isoformat(timespec='seconds')}",
+                 f"Traced: {current / 1e6:.1f} MB current, {peak / 1e6:.1f} MB peak", ""]
+        if self._last_snapshot is None:
+            lines.append("First snapshot: tracing started, the next snapshot reports differences.")
+        else:
+            lines.append(f"Top {self.top_n} allocation differences since the previous snapshot:")
+            for stat in snapshot.compare_to(self._last_snapshot, 'lineno')[:self.top_n]:
+                lines.append(f"  {stat}")
+        lines.append("")
+        lines.append(f"Top {self.top_n} allocations:")
+        for stat in snapshot.statistics('lineno')[:self.top_n]:
+            lines.append(f"  {stat}")
+        self._last_snapshot = snapshot
+
+        path = self._write(f"memory_{_timestamp()}.txt", "\n".join(lines) + "\n")
+        self.logger.info(f"Memory snapshot written to {path}")
+        return path
+
+    def stop_memory_tracing(self):
+        """Stop tracemalloc, which slows down allocations while it traces."""
+        with self._memory_lock:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self._last_snapshot = None
+
+    def install_signal_handlers(self):
+        """
+        Toggle CPU profiling on SIGUSR1 and take a memory snapshot on SIGUSR2.
+
+        Must be called from the main thread. Does nothing on platforms
+        without these signals.
+        """
+        if not hasattr(signal, 'SIGUSR1'):
+            return
+        # Reports are written off the signal handler, which may interrupt any code
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self._in_thread(self._toggle_from_signal))
+        signal.signal(signal.SIGUSR2, lambda signum, frame: self._in_thread(self.memory_snapshot))
+
+    def _in_thread(self, func):
+        threading.Thread(target=func, name='profiler-signal', daemon=True).start()
+
+    def _toggle_from_signal(self):
+        path = self.toggle()
+        if self.event_callback is not None:
+            self.event_callback(EVENT_PROFILING, 'profiler', running=self.running,
+                                path=None if path is None else str(path))
+
+    def _write_sampling_report(self, sampler):
+        per_thread = {}
+        for (thread_name, stack), count in sampler.samples.items():
+            stats = per_thread.setdefault(thread_name, [0, Counter(), Counter()])
+            stats[0] += count
+            if stack:
+                stats[1][stack[-1]] += count
+            for code in set(stack):
+                stats[2][code] += count
+
+        elapsed = (datetime.datetime.now() - self._started_at).total_seconds()
+        lines = [f"Sampling profile started {self._started_at.isoformat(timespec='seconds')}, "
+                 f"{elapsed:.1f} s, {sampler.sample_count} samples every {sampler.interval * 1000:.1f} ms", ""]
+        for thread_name, (total, own, inclusive) in sorted(per_thread.items(), key=lambda item: -item[1][0]):
+            lines.append(f"Thread {thread_name}: {total} samples")
+            lines.append(f"  Top {self.top_n} by own samples:")
+            for code, count in own.most_common(self.top_n):
+                lines.append(f"    {count:8d} {count / total:6.1%}  {_describe(code)}")
+            lines.append(f"  Top {self.top_n} by inclusive samples:")
+            for code, count in inclusive.most_common(self.top_n):
+                lines.append(f"    {count:8d} {count / total:6.1%}  {_describe(code)}")
+            lines.append("")
+
+        timestamp = _timestamp()
+        # Collapsed stacks, readable by flamegraph.pl and speedscope
+        folded = "".join(
+            f"{thread_name};{';'.join(_describe(code) for code in stack)} {count}\n"
+            for (thread_name, stack), count in sampler.samples.items()
+        )
+        self._write(f"profile_{timestamp}.folded", folded)
+        return self._write(f"profile_{timestamp}.txt", "\n".join(lines))
+
+    def _write_cprofile_report(self, session):
+        stats = session.stats()
+        timestamp = _timestamp()
+        if stats is None:
+            return self._write(f"profile_{timestamp}.txt",
+                               "No monitor or search thread ran a pipeline stage during the session.\n")
+
+        stats.dump_stats(str(self._ensure_log_dir() / f"profile_{timestamp}.pstats"))
+        stream = io.StringIO()
+        stats.stream = stream
+        stream.write(f"cProfile session started {self._started_at.isoformat(timespec='seconds')}, "
+                     f"threads: {', '.join(sorted(session.profiles))}\n")
+        stats.sort_stats('cumulative').print_stats(self.top_n)
+        stats.sort_stats('tottime').print_stats(self.top_n)
+        return self._write(f"profile_{timestamp}.txt", stream.getvalue())
+
+    def _ensure_log_dir(self):
+        os.makedirs(self.log_dir, exist_ok=True)
+        return self.log_dir
+
+    def _write(self, name, text):
+        path = self._ensure_log_dir() / name
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
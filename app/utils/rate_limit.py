@@ -0,0 +1,80 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter."""
+
+    def __init__(self, rate, capacity=None):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second (0 or None disables limiting)
+            capacity: Maximum burst size (defaults to one second of tokens)
+        """
+        self.rate = rate or 0
+        self.capacity = capacity if capacity is not None else max(self.rate, 1)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_acquire(self, tokens=1):
+        """
+        Take tokens without waiting.
+
+        Returns:
+            bool: True if the tokens were available
+        """
+        if not self.rate:
+            return True
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def wait_time(self, tokens=1):
+        """
+        Seconds until ``tokens`` will be available.
+
+        Returns:
+            float: 0 if the tokens are available now
+        """
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            self._refill(time.monotonic())
+            missing = tokens - self._tokens
+            return max(0.0, missing / self.rate)
+
+    def acquire(self, tokens=1, stop_event=None):
+        """
+        Wait until tokens are available and take them.
+
+        Args:
+            tokens: Number of tokens
+            stop_event: Optional threading.Event that aborts the wait
+
+        Returns:
+            bool: True if the tokens were taken, False if the wait was aborted
+
+        Raises:
+            ValueError: If more tokens are requested than the bucket holds
+        """
+        if self.rate and tokens > self.capacity:
+            # The bucket never fills up that far, the wait would never end
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of capacity {self.capacity}")
+        while not self.try_acquire(tokens):
+            delay = self.wait_time(tokens)
+            if stop_event is not None:
+                if stop_event.wait(delay):
+                    return False
+            else:
+                time.sleep(delay)
+        return True
@@ -0,0 +1,3 @@
+"""
+Local stand-ins for Gmail and ZipRecruiter used by the load harness.
+"""
@@ -0,0 +1,99 @@
+"""
+Fault injection and process helpers shared by the fake servers.
+"""
+import multiprocessing
+import random
+import threading
+import time
+
+
+class FaultInjector:
+    """
+    Adds latency, random errors and a request rate limit to a fake server.
+
+    The rate limit is a token bucket shared by all connections to the server.
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, rate_limit=0, seed=0):
+        """
+        Initialize the fault injector.
+
+        Args:
+            latency: Seconds added to every request
+            error_rate: Probability (0-1) that a request fails
+            rate_limit: Allowed requests per second (0 disables the limit)
+            seed: Random seed for error injection
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = float(rate_limit)
+        self._last_refill = time.monotonic()
+
+    def delay(self):
+        """Sleep for the configured latency."""
+        if self.latency:
+            time.sleep(self.latency)
+
+    def should_fail(self):
+        """Return True if this request should fail."""
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+    def allow(self):
+        """Consume a rate-limit token; return False if the request is over the limit."""
+        if not self.rate_limit:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._last_refill) * self.rate_limit)
+            self._last_refill = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+def start_in_thread(server):
+    """
+    Serve a socketserver-based server from a daemon thread.
+
+    Args:
+        server: Server instance with serve_forever()
+
+    Returns:
+        threading.Thread: The serving thread
+    """
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def _serve_child(factory, kwargs, queue):
+    servers = factory(**kwargs)
+    queue.put({name: server.server_address for name, server in servers.items()})
+    threads = [start_in_thread(server) for server in servers.values()]
+    for thread in threads:
+        thread.join()
+
+
+def start_in_process(factory, **kwargs):
+    """
+    Run fake servers in a child process so they do not skew the client's resource usage.
+
+    Args:
+        factory: Picklable callable returning a dict of name -> server
+        **kwargs: Arguments for the factory
+
+    Returns:
+        tuple: (multiprocessing.Process, dict of name -> (host, port))
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve_child, args=(factory, kwargs, queue), daemon=True)
+    process.start()
+    addresses = queue.get(timeout=30)
+    return process, addresses
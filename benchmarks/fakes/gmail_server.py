@@ -0,0 +1,371 @@
+"""
+Fake Gmail: REST API, IMAP and SMTP servers over a synthetic mailbox.
+
+The mailbox is generated on demand from message indexes (see
+benchmarks.synthetic.raw_message), so a 1M-message mailbox costs no memory.
+Message UIDs run from 1 to the mailbox size.
+
+Run standalone:
+    python -m benchmarks.fakes.gmail_server --size 100000 --imap-port 1143 --smtp-port 1025 --rest-port 8080
+"""
+import argparse
+import base64
+import json
+import re
+import shlex
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from benchmarks.synthetic import raw_message
+from benchmarks.fakes.common import FaultInjector, start_in_thread
+
+
+class SyntheticMailbox:
+    """Read-only mailbox whose messages are generated from their UID."""
+
+    def __init__(self, size, seed=0, job_ratio=0.3, address='candidate@example.com'):
+        self.size = size
+        self.seed = seed
+        self.job_ratio = job_ratio
+        self.address = address
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, uid):
+        return 1 <= uid <= self.size
+
+    def raw(self, uid):
+        """Return the raw bytes of message ``uid``."""
+        return raw_message(uid - 1, self.seed, self.job_ratio, self.address)
+
+
+def parse_sequence_set(text, maximum):
+    """
+    Expand an IMAP sequence set such as ``1:5,9,12:*``.
+
+    Args:
+        text: Sequence set
+        maximum: Value of ``*``
+
+    Returns:
+        list: Numbers in the set, ascending, limited to 1..maximum
+    """
+    numbers = set()
+    for part in text.split(','):
+        if ':' in part:
+            low, high = part.split(':', 1)
+            low = maximum if low == '*' else int(low)
+            high = maximum if high == '*' else int(high)
+            low, high = min(low, high), max(low, high)
+            numbers.update(range(max(low, 1), min(high, maximum) + 1))
+        else:
+            number = maximum if part == '*' else int(part)
+            if 1 <= number <= maximum:
+                numbers.add(number)
+    return sorted(numbers)
+
+
+class _ImapHandler(socketserver.StreamRequestHandler):
+    """Implements the IMAP4rev1 subset used by GmailMonitor."""
+
+    disable_nagle_algorithm = True
+
+    def send(self, line):
+        self.wfile.write(line.encode('utf-8') + b'\r\n')
+
+    def handle(self):
+        server = self.server
+        mailbox = server.mailbox
+        self.send("* OK Fake IMAP4rev1 ready")
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            try:
+                tag, command, *rest = line.decode('utf-8').rstrip('\r\n').split(' ', 2)
+            except ValueError:
+                self.send("* BAD malformed command")
+                continue
+            args = rest[0] if rest else ''
+            command = command.upper()
+            server.faults.delay()
+
+            if command == 'UID':
+                sub, _, args = args.partition(' ')
+                command = 'UID ' + sub.upper()
+
+            if command == 'CAPABILITY':
+                self.send("* CAPABILITY IMAP4rev1 AUTH=PLAIN")
+                self.send(f"{tag} OK CAPABILITY completed")
+            elif command == 'LOGIN':
+                self.send(f"{tag} OK LOGIN completed")
+            elif command in ('SELECT', 'EXAMINE'):
+                self.send(f"* {len(mailbox)} EXISTS")
+                self.send("* 0 RECENT")
+                self.send("* OK [UIDVALIDITY 1] UIDs valid")
+                self.send(f"* OK [UIDNEXT {len(mailbox) + 1}] Predicted next UID")
+                self.send(f"{tag} OK [READ-WRITE] {command} completed")
+            elif command == 'STATUS':
+                name = shlex.split(args)[0]
+                self.send(f"* STATUS {name} (MESSAGES {len(mailbox)} UIDNEXT {len(mailbox) + 1})")
+                self.send(f"{tag} OK STATUS completed")
+            elif command == 'NOOP':
+                self.send(f"{tag} OK NOOP completed")
+            elif command == 'UID SEARCH':
+                # Only the UID criterion is honoured; every other criterion matches all messages
+                match = re.search(r'UID (\S+)', args, re.IGNORECASE)
+                uids = parse_sequence_set(match.group(1), len(mailbox)) if match else range(1, len(mailbox) + 1)
+                self.send("* SEARCH " + ' '.join(map(str, uids)))
+                self.send(f"{tag} OK SEARCH completed")
+            elif command == 'UID FETCH':
+                if server.faults.should_fail():
+                    self.send(f"{tag} NO [UNAVAILABLE] Temporary failure")
+                    continue
+                sequence = args.split(' ', 1)[0]
+                out = []
+                for uid in parse_sequence_set(sequence, len(mailbox)):
+                    raw = mailbox.raw(uid)
+                    out.append(f"* {uid} FETCH (UID {uid} BODY[] {{{len(raw)}}}\r\n".encode('utf-8'))
+                    out.append(raw)
+                    out.append(b")\r\n")
+                out.append(f"{tag} OK FETCH completed\r\n".encode('utf-8'))
+                self.wfile.write(b''.join(out))
+                with server.lock:
+                    server.messages_fetched += len(out) // 3
+            elif command in ('UID STORE', 'EXPUNGE', 'CLOSE'):
+                self.send(f"{tag} OK {command} completed")
+            elif command == 'LOGOUT':
+                self.send("* BYE Fake IMAP server logging out")
+                self.send(f"{tag} OK LOGOUT completed")
+                return
+            else:
+                self.send(f"{tag} BAD Unsupported command {command}")
+
+
+class FakeImapServer(socketserver.ThreadingTCPServer):
+    """Plain-text IMAP server over a SyntheticMailbox."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, mailbox, faults=None):
+        super().__init__(address, _ImapHandler)
+        self.mailbox = mailbox
+        self.faults = faults or FaultInjector()
+        self.lock = threading.Lock()
+        self.messages_fetched = 0
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    """Implements the ESMTP subset used by smtplib."""
+
+    disable_nagle_algorithm = True
+
+    def send(self, line):
+        self.wfile.write(line.encode('utf-8') + b'\r\n')
+
+    def handle(self):
+        server = self.server
+        self.send("220 fake-smtp ESMTP ready")
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', errors='replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+            server.faults.delay()
+
+            if verb in ('EHLO', 'HELO'):
+                self.send("250-fake-smtp")
+                self.send("250-SIZE 35882577")
+                self.send("250 AUTH PLAIN LOGIN")
+            elif verb == 'AUTH':
+                self.send("235 2.7.0 Accepted")
+            elif verb == 'MAIL':
+                if server.faults.should_fail():
+                    self.send("451 4.3.0 Temporary failure")
+                else:
+                    self.send("250 2.1.0 OK")
+            elif verb in ('RCPT', 'RSET', 'NOOP'):
+                self.send("250 2.0.0 OK")
+            elif verb == 'DATA':
+                self.send("354 Go ahead")
+                size = 0
+                while True:
+                    data = self.rfile.readline()
+                    if not data or data == b'.\r\n':
+                        break
+                    size += len(data)
+                with server.lock:
+                    server.messages_received += 1
+                    server.bytes_received += size
+                self.send("250 2.0.0 OK queued")
+            elif verb == 'QUIT':
+                self.send("221 2.0.0 Bye")
+                return
+            else:
+                self.send("502 5.5.2 Command not implemented")
+
+
+class FakeSmtpServer(socketserver.ThreadingTCPServer):
+    """SMTP server that accepts and counts every message."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, faults=None):
+        super().__init__(address, _SmtpHandler)
+        self.faults = faults or FaultInjector()
+        self.lock = threading.Lock()
+        self.messages_received = 0
+        self.bytes_received = 0
+
+
+class _RestHandler(BaseHTTPRequestHandler):
+    """Implements the Gmail REST endpoints used for listing, reading and sending."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    PREFIX = '/gmail/v1/users/me'
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def check_faults(self):
+        """Apply latency, rate limiting and error injection; return False if the request was rejected."""
+        faults = self.server.faults
+        faults.delay()
+        if not faults.allow():
+            self.send_json(429, {'error': {'code': 429, 'message': 'Rate Limit Exceeded'}}, {'Retry-After': '1'})
+            return False
+        if faults.should_fail():
+            self.send_json(500, {'error': {'code': 500, 'message': 'Backend Error'}})
+            return False
+        return True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        mailbox = self.server.mailbox
+        if not self.check_faults():
+            return
+
+        if url.path == f'{self.PREFIX}/profile':
+            self.send_json(200, {'emailAddress': mailbox.address, 'messagesTotal': len(mailbox)})
+        elif url.path == f'{self.PREFIX}/messages':
+            # Newest first, like Gmail; the page token is the offset
+            max_results = min(int(query.get('maxResults', ['100'])[0]), 500)
+            offset = int(query.get('pageToken', ['0'])[0])
+            newest = len(mailbox) - offset
+            uids = range(newest, max(newest - max_results, 0), -1)
+            payload = {
+                'messages': [{'id': f'{uid:x}', 'threadId': f'{uid:x}'} for uid in uids],
+                'resultSizeEstimate': len(mailbox)
+            }
+            if offset + max_results < len(mailbox):
+                payload['nextPageToken'] = str(offset + max_results)
+            self.send_json(200, payload)
+        elif url.path.startswith(f'{self.PREFIX}/messages/'):
+            uid = int(url.path.rsplit('/', 1)[1], 16)
+            if uid not in mailbox:
+                self.send_json(404, {'error': {'code': 404, 'message': 'Not Found'}})
+                return
+            raw = base64.urlsafe_b64encode(mailbox.raw(uid)).decode('ascii')
+            self.send_json(200, {'id': f'{uid:x}', 'threadId': f'{uid:x}', 'raw': raw})
+        else:
+            self.send_json(404, {'error': {'code': 404, 'message': 'Not Found'}})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        if not self.check_faults():
+            return
+
+        if url.path.endswith('/messages/send'):
+            with self.server.lock:
+                self.server.messages_sent += 1
+                message_id = self.server.messages_sent
+            self.send_json(200, {'id': f'sent-{message_id:x}', 'labelIds': ['SENT']})
+        else:
+            self.send_json(404, {'error': {'code': 404, 'message': 'Not Found'}})
+
+
+class FakeGmailRestServer(ThreadingHTTPServer):
+    """HTTP server implementing a subset of the Gmail REST API."""
+
+    daemon_threads = True
+
+    def __init__(self, address, mailbox, faults=None):
+        super().__init__(address, _RestHandler)
+        self.mailbox = mailbox
+        self.faults = faults or FaultInjector()
+        self.lock = threading.Lock()
+        self.messages_sent = 0
+
+
+def create_servers(size=1000, seed=0, job_ratio=0.3, host='127.0.0.1',
+                   imap_port=0, smtp_port=0, rest_port=0,
+                   latency=0.0, error_rate=0.0, rate_limit=0):
+    """
+    Create the IMAP, SMTP and REST servers over one synthetic mailbox.
+
+    Ports default to 0 (any free port); read the actual ports from server_address.
+
+    Returns:
+        dict: 'imap', 'smtp' and 'rest' servers
+    """
+    mailbox = SyntheticMailbox(size, seed, job_ratio)
+    return {
+        'imap': FakeImapServer((host, imap_port), mailbox, FaultInjector(latency, error_rate, 0, seed)),
+        'smtp': FakeSmtpServer((host, smtp_port), FaultInjector(latency, error_rate, 0, seed)),
+        'rest': FakeGmailRestServer((host, rest_port), mailbox, FaultInjector(latency, error_rate, rate_limit, seed)),
+    }
+
+
+def main():
+    """Run the fake Gmail servers until interrupted."""
+    parser = argparse.ArgumentParser(description="Fake Gmail IMAP/SMTP/REST servers")
+    parser.add_argument('--size', type=int, default=1000, help="Number of messages in the mailbox")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--job-ratio', type=float, default=0.3)
+    parser.add_argument('--imap-port', type=int, default=1143)
+    parser.add_argument('--smtp-port', type=int, default=1025)
+    parser.add_argument('--rest-port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Probability of a failed request")
+    parser.add_argument('--rate-limit', type=int, default=0, help="REST requests per second (0 = unlimited)")
+    args = parser.parse_args()
+
+    servers = create_servers(
+        args.size, args.seed, args.job_ratio, '127.0.0.1',
+        args.imap_port, args.smtp_port, args.rest_port,
+        args.latency, args.error_rate, args.rate_limit
+    )
+    threads = [start_in_thread(server) for server in servers.values()]
+    for name, server in servers.items():
+        print(f"{name} listening on {server.server_address[0]}:{server.server_address[1]}")
+    try:
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
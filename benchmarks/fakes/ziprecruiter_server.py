@@ -0,0 +1,197 @@
+"""
+Fake ZipRecruiter jobs API.
+
+Serves ``GET /jobs/v1`` in the shape of the ZipRecruiter jobs API. Results
+are derived deterministically from (search, location, index), so the same
+posting keeps the same ID across pages and sweeps. Responses are gzipped
+for clients that accept it.
+
+``GET /stats`` reports request and application counters.
+``POST /jobs/v1/apply`` accepts applications (JSON with 'job_id' and
+'email'). A repeated Idempotency-Key returns the original application, and
+a second application to the same job with another key gets 409 and is
+counted in ``duplicate_applications``.
+
+Run standalone:
+    python -m benchmarks.fakes.ziprecruiter_server --port 8081 --jobs-per-query 500 --rate-limit 50
+"""
+import argparse
+import gzip
+import json
+import random
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from benchmarks.synthetic import generate_job_posting
+from benchmarks.fakes.common import FaultInjector, start_in_thread
+
+
+def posting_for(search, location, index):
+    """Deterministically generate posting ``index`` for a query."""
+    seed = zlib.crc32(f"{search}|{location}|{index}".encode('utf-8'))
+    job = generate_job_posting(random.Random(seed))
+    job['id'] = f"{seed:08x}-{index}"
+    return job
+
+
+class _ZipRecruiterHandler(BaseHTTPRequestHandler):
+    """Implements the jobs search endpoint."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        gzipped = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if gzipped:
+            body = gzip.compress(body, compresslevel=5)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def check_faults(self):
+        """Apply latency, rate limiting and error injection; return False if the request was rejected."""
+        server = self.server
+        server.faults.delay()
+        with server.lock:
+            server.requests += 1
+        if not server.faults.allow():
+            with server.lock:
+                server.rate_limited += 1
+            self.send_json(429, {'success': False, 'error': 'rate limit exceeded'}, {'Retry-After': '1'})
+            return False
+        if server.faults.should_fail():
+            with server.lock:
+                server.errors += 1
+            self.send_json(500, {'success': False, 'error': 'internal error'})
+            return False
+        return True
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/jobs/v1/apply':
+            self.send_json(404, {'success': False, 'error': 'not found'})
+            return
+        # Read the body first so the connection stays usable after a rejection
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        if not self.check_faults():
+            return
+        try:
+            application = json.loads(body)
+        except ValueError:
+            application = None
+        if not isinstance(application, dict) or not application.get('job_id') or not application.get('email'):
+            self.send_json(400, {'success': False, 'error': 'job_id and email are required'})
+            return
+
+        server = self.server
+        key = self.headers.get('Idempotency-Key')
+        job_id = application['job_id']
+        with server.lock:
+            if key and key in server.applications_by_key:
+                status, application_id = 200, server.applications_by_key[key]
+                server.replayed_applications += 1
+            elif job_id in server.applied_jobs:
+                status, application_id = 409, server.applied_jobs[job_id]
+                server.duplicate_applications += 1
+            else:
+                status, application_id = 201, f"app-{len(server.applied_jobs) + 1:06d}"
+                server.applied_jobs[job_id] = application_id
+                if key:
+                    server.applications_by_key[key] = application_id
+        self.send_json(status, {'success': status != 409, 'application_id': application_id})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/stats':
+            server = self.server
+            with server.lock:
+                stats = {'requests': server.requests, 'rate_limited': server.rate_limited, 'errors': server.errors,
+                         'applications': len(server.applied_jobs), 'replayed_applications': server.replayed_applications,
+                         'duplicate_applications': server.duplicate_applications}
+            self.send_json(200, stats)
+            return
+        if url.path != '/jobs/v1':
+            self.send_json(404, {'success': False, 'error': 'not found'})
+            return
+        if not self.check_faults():
+            return
+
+        query = parse_qs(url.query)
+        search = query.get('search', [''])[0]
+        location = query.get('location', [''])[0]
+        page = max(int(query.get('page', ['1'])[0]), 1)
+        per_page = min(int(query.get('jobs_per_page', ['20'])[0]), 500)
+        total = self.server.jobs_per_query
+
+        start = (page - 1) * per_page
+        jobs = [posting_for(search, location, i) for i in range(start, min(start + per_page, total))]
+        self.send_json(200, {'success': True, 'total_jobs': total, 'num_paginable_jobs': total, 'jobs': jobs})
+
+
+class FakeZipRecruiterServer(ThreadingHTTPServer):
+    """HTTP server implementing the ZipRecruiter jobs search API."""
+
+    daemon_threads = True
+
+    def __init__(self, address, jobs_per_query=200, faults=None):
+        super().__init__(address, _ZipRecruiterHandler)
+        self.jobs_per_query = jobs_per_query
+        self.faults = faults or FaultInjector()
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.rate_limited = 0
+        self.errors = 0
+        # job ID -> application ID, and Idempotency-Key -> application ID
+        self.applied_jobs = {}
+        self.applications_by_key = {}
+        self.replayed_applications = 0
+        self.duplicate_applications = 0
+
+
+def create_servers(jobs_per_query=200, host='127.0.0.1', port=0,
+                   latency=0.0, error_rate=0.0, rate_limit=0, seed=0):
+    """
+    Create the fake ZipRecruiter server.
+
+    Returns:
+        dict: 'ziprecruiter' server
+    """
+    faults = FaultInjector(latency, error_rate, rate_limit, seed)
+    return {'ziprecruiter': FakeZipRecruiterServer((host, port), jobs_per_query, faults)}
+
+
+def main():
+    """Run the fake ZipRecruiter server until interrupted."""
+    parser = argparse.ArgumentParser(description="Fake ZipRecruiter jobs API")
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--jobs-per-query', type=int, default=200, help="Total results for every search")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Probability of a failed request")
+    parser.add_argument('--rate-limit', type=int, default=0, help="Requests per second (0 = unlimited)")
+    args = parser.parse_args()
+
+    servers = create_servers(args.jobs_per_query, '127.0.0.1', args.port,
+                             args.latency, args.error_rate, args.rate_limit)
+    server = servers['ziprecruiter']
+    print(f"ziprecruiter listening on {server.server_address[0]}:{server.server_address[1]}")
+    try:
+        start_in_thread(server).join()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+"""
+End-to-end load harness running GmailMonitor and ZipRecruiterClient against local fakes.
+
+Usage:
+    python -m benchmarks.load gmail --sizes 1000,10000,100000,1000000 --limit 20000
+    python -m benchmarks.load rest --sizes 1000,10000 --limit 2000
+    python -m benchmarks.load ziprecruiter --jobs-per-query 1000 --latency 0.02 --rate-limit 50 --concurrency 8
+    python -m benchmarks.load apply --jobs-per-query 500 --latency 0.05 --apply-workers 16 --apply-rate 100
+
+The fake servers run in a child process so the reported CPU time and peak
+RSS belong to the client. ``--limit`` caps how many of the newest messages
+are processed at each mailbox size while the listing still covers the whole
+mailbox, which keeps 1M-message runs practical.
+"""
+import argparse
+import atexit
+import base64
+import json
+import logging
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+import requests
+
+from app.core.email_parser import parse_raw_message
+from app.core.gmail_monitor import GmailMonitor
+from app.core.ziprecruiter_client import ZipRecruiterClient
+from benchmarks.fakes import gmail_server, ziprecruiter_server
+from benchmarks.fakes.common import start_in_process
+
+
+class ResourceMeter:
+    """Measures wall time, CPU time and peak RSS of the current process."""
+
+    def __enter__(self):
+        self.start_wall = time.perf_counter()
+        self.start_usage = resource.getrusage(resource.RUSAGE_SELF)
+        return self
+
+    def __exit__(self, *exc):
+        end_usage = resource.getrusage(resource.RUSAGE_SELF)
+        self.wall = time.perf_counter() - self.start_wall
+        self.cpu = (end_usage.ru_utime - self.start_usage.ru_utime) + (end_usage.ru_stime - self.start_usage.ru_stime)
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        self.max_rss_mb = end_usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+        return False
+
+
+def stage_report(stage_stats, messages):
+    """Convert [count, seconds] stage stats to per-call and per-message latencies."""
+    report = {}
+    for stage, (count, total) in stage_stats.items():
+        report[stage] = {
+            'calls': count,
+            'total_s': round(total, 3),
+            'ms_per_call': round(total / count * 1000, 3) if count else 0.0,
+            'us_per_message': round(total / messages * 1e6, 1) if messages else 0.0,
+        }
+    return report
+
+
+def _checkpoint_dir():
+    """Temporary checkpoint directory, so runs never resume from each other."""
+    path = tempfile.mkdtemp(prefix='job-assistant-load-')
+    atexit.register(shutil.rmtree, path, True)
+    return path
+
+
+def gmail_config(addresses, auto_reply, parse_workers=None):
+    imap_host, imap_port = addresses['imap']
+    smtp_host, smtp_port = addresses['smtp']
+    return {
+        'gmail': {
+            'email': 'candidate@example.com',
+            'password': 'not-a-real-password',
+            'imap_host': imap_host,
+            'imap_port': imap_port,
+            'imap_ssl': False,
+            'smtp_host': smtp_host,
+            'smtp_port': smtp_port,
+            'smtp_starttls': False,
+            'auto_reply': auto_reply,
+            'response_template': 'Thank you for reaching out.',
+            'resume_path': 'app/resources/dummy_resume.txt',
+            'initial_sync_days': 36500,
+            'parse_workers': parse_workers,
+            'checkpoint_dir': _checkpoint_dir(),
+        }
+    }
+
+
+def run_gmail(size, limit, args):
+    """Scan a synthetic mailbox over IMAP and reply over SMTP."""
+    process, addresses = start_in_process(
+        gmail_server.create_servers, size=size, job_ratio=args.job_ratio,
+        latency=args.latency, error_rate=args.error_rate
+    )
+    try:
+        monitor = GmailMonitor(gmail_config(addresses, not args.no_reply, args.parse_workers), logging.getLogger('benchmarks.load'))
+
+        # Full listing pass at this mailbox size
+        with monitor._timed('list_full'):
+            monitor.fetch_new_message_uids()
+
+        processed = min(limit, size) if limit else size
+        monitor.last_uid = size - processed
+        with ResourceMeter() as meter:
+            jobs = monitor.scan_emails()
+        monitor._disconnect()
+        monitor.message_parser.shutdown()
+    finally:
+        process.terminate()
+
+    return {
+        'mode': 'gmail',
+        'mailbox_size': size,
+        'messages': processed,
+        'jobs': len(jobs),
+        'wall_s': round(meter.wall, 3),
+        'cpu_s': round(meter.cpu, 3),
+        'max_rss_mb': round(meter.max_rss_mb, 1),
+        'messages_per_s': round(processed / meter.wall, 1) if meter.wall else 0.0,
+        'stages': stage_report(monitor.stage_stats, processed),
+    }
+
+
+def run_rest(size, limit, args):
+    """List and download a synthetic mailbox through the Gmail REST API."""
+    process, addresses = start_in_process(
+        gmail_server.create_servers, size=size, job_ratio=args.job_ratio,
+        latency=args.latency, error_rate=args.error_rate, rate_limit=args.rate_limit
+    )
+    host, port = addresses['rest']
+    base_url = f"http://{host}:{port}/gmail/v1/users/me"
+    monitor = GmailMonitor({'gmail': {'checkpoint_dir': _checkpoint_dir()}}, logging.getLogger('benchmarks.load'))
+    session = requests.Session()
+    processed = min(limit, size) if limit else size
+
+    def get(url, **params):
+        while True:
+            response = session.get(url, params=params, timeout=30)
+            if response.status_code == 429:
+                time.sleep(float(response.headers.get('Retry-After', 1)))
+                continue
+            if response.status_code >= 500:
+                continue
+            response.raise_for_status()
+            return response.json()
+
+    jobs = 0
+    try:
+        with ResourceMeter() as meter:
+            ids = []
+            page_token = None
+            while len(ids) < processed:
+                params = {'maxResults': 500}
+                if page_token:
+                    params['pageToken'] = page_token
+                with monitor._timed('list'):
+                    page = get(f"{base_url}/messages", **params)
+                ids.extend(m['id'] for m in page.get('messages', []))
+                page_token = page.get('nextPageToken')
+                if not page_token:
+                    break
+
+            for message_id in ids[:processed]:
+                with monitor._timed('fetch'):
+                    raw = base64.urlsafe_b64decode(get(f"{base_url}/messages/{message_id}", format='raw')['raw'])
+                with monitor._timed('parse'):
+                    message = parse_raw_message(raw)
+                with monitor._timed('classify'):
+                    jobs += monitor.analyze_email(message)['is_job']
+    finally:
+        process.terminate()
+
+    return {
+        'mode': 'rest',
+        'mailbox_size': size,
+        'messages': processed,
+        'jobs': jobs,
+        'wall_s': round(meter.wall, 3),
+        'cpu_s': round(meter.cpu, 3),
+        'max_rss_mb': round(meter.max_rss_mb, 1),
+        'messages_per_s': round(processed / meter.wall, 1) if meter.wall else 0.0,
+        'stages': stage_report(monitor.stage_stats, processed),
+    }
+
+
+def run_ziprecruiter(args):
+    """Run one search sweep against the fake ZipRecruiter API."""
+    process, addresses = start_in_process(
+        ziprecruiter_server.create_servers, jobs_per_query=args.jobs_per_query,
+        latency=args.latency, error_rate=args.error_rate, rate_limit=args.rate_limit
+    )
+    host, port = addresses['ziprecruiter']
+    config = {
+        'ziprecruiter': {
+            'api_base_url': f"http://{host}:{port}",
+            'keywords': ['python', 'developer', 'software engineer'],
+            'locations': ['remote', 'New York, NY', 'Austin, TX'],
+            'job_types': [],
+            'jobs_per_page': 100,
+            'max_pages': args.jobs_per_query // 100 + 1,
+            'max_retries': 10,
+            'retry_budget': args.retry_budget,
+            'search_concurrency': args.concurrency,
+            'checkpoint_dir': _checkpoint_dir(),
+        }
+    }
+    client = ZipRecruiterClient(config, logging.getLogger('benchmarks.load'))
+    try:
+        with ResourceMeter() as meter:
+            jobs = client.run_search_sweep()
+    finally:
+        process.terminate()
+
+    return {
+        'mode': 'ziprecruiter',
+        'jobs': len(jobs),
+        'wall_s': round(meter.wall, 3),
+        'cpu_s': round(meter.cpu, 3),
+        'max_rss_mb': round(meter.max_rss_mb, 1),
+        'jobs_per_s': round(len(jobs) / meter.wall, 1) if meter.wall else 0.0,
+        'stages': stage_report(client.stage_stats, len(jobs)),
+        'http': dict(client.transport.stats(), retries_over_budget=client.retry_budget.denied),
+    }
+
+
+def run_apply(args):
+    """Search and auto-apply twice with one ledger; the second pass must not apply again."""
+    process, addresses = start_in_process(
+        ziprecruiter_server.create_servers, jobs_per_query=args.jobs_per_query,
+        latency=args.latency, error_rate=args.error_rate, rate_limit=args.rate_limit
+    )
+    host, port = addresses['ziprecruiter']
+    ledger = f"{_checkpoint_dir()}/applications.db"
+
+    def make_client():
+        # A fresh checkpoint, so the second client reports every posting again
+        return ZipRecruiterClient({'ziprecruiter': {
+            'api_base_url': f"http://{host}:{port}",
+            'email': 'candidate@example.com',
+            'keywords': ['python', 'developer', 'software engineer'],
+            'locations': ['remote', 'New York, NY', 'Austin, TX'],
+            'job_types': [],
+            'jobs_per_page': 100,
+            'max_pages': args.jobs_per_query // 100 + 1,
+            'search_concurrency': args.concurrency,
+            'checkpoint_dir': _checkpoint_dir(),
+            'auto_apply': {
+                'enabled': True,
+                'ledger': ledger,
+                'workers': args.apply_workers,
+                'rate_per_host': args.apply_rate,
+                'max_per_sweep': 100000,
+                'retry_budget': args.retry_budget,
+            },
+        }, 'gmail': {'criteria': {}}}, logging.getLogger('benchmarks.load'))
+
+    try:
+        client = make_client()
+        jobs = client.run_search_sweep()
+        with ResourceMeter() as meter:
+            outcomes = client.apply_to_jobs(jobs)
+        repeat = make_client()
+        repeat_outcomes = repeat.apply_to_jobs(repeat.run_search_sweep())
+        server_stats = client.transport.get(f"http://{host}:{port}/stats").json()
+    finally:
+        process.terminate()
+
+    applied = outcomes.get('applied', 0)
+    return {
+        'mode': 'apply',
+        'jobs': applied,
+        'matches': len(jobs),
+        'wall_s': round(meter.wall, 3),
+        'cpu_s': round(meter.cpu, 3),
+        'max_rss_mb': round(meter.max_rss_mb, 1),
+        'jobs_per_s': round(applied / meter.wall, 1) if meter.wall else 0.0,
+        'stages': stage_report({k: v for k, v in client.stage_stats.items() if k == 'apply'}, applied),
+        'outcomes': outcomes,
+        'repeat_outcomes': repeat_outcomes,
+        'server': server_stats,
+    }
+
+
+def print_result(result):
+    rate = result.get('messages_per_s', result.get('jobs_per_s'))
+    size = f"size={result['mailbox_size']:>8} " if 'mailbox_size' in result else ''
+    print(f"{result['mode']:12s} {size}items={result.get('messages', result['jobs']):>8} "
+          f"wall={result['wall_s']:8.2f}s cpu={result['cpu_s']:8.2f}s rss={result['max_rss_mb']:7.1f}MB rate={rate:10.1f}/s")
+    for stage, stats in result['stages'].items():
+        print(f"    {stage:10s} calls={stats['calls']:>8} {stats['ms_per_call']:10.3f} ms/call {stats['us_per_message']:10.1f} us/item")
+    if 'outcomes' in result:
+        server = result['server']
+        print(f"    matches={result['matches']} outcomes={result['outcomes']} second pass={result['repeat_outcomes'] or 'nothing to do'}")
+        print(f"    server applications={server['applications']} duplicates={server['duplicate_applications']} "
+              f"replayed={server['replayed_applications']} rate_limited={server['rate_limited']}")
+    if 'http' in result:
+        http = result['http']
+        print(f"    http       requests={http['requests']} connections={http['connections']} "
+              f"reused={http['reuse_ratio']:.0%} retries={http['retries']} over_budget={http['retries_over_budget']}")
+
+
+def main(argv=None):
+    """Run the load harness."""
+    parser = argparse.ArgumentParser(description="Job Assistant AI load harness")
+    parser.add_argument('mode', choices=['gmail', 'rest', 'ziprecruiter', 'apply'])
+    parser.add_argument('--sizes', default='1000,10000', help="Comma separated mailbox sizes")
+    parser.add_argument('--limit', type=int, default=0, help="Process at most this many messages per size")
+    parser.add_argument('--job-ratio', type=float, default=0.3, help="Fraction of recruiter emails")
+    parser.add_argument('--jobs-per-query', type=int, default=500, help="ZipRecruiter results per search")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every server request")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Probability of a failed server request")
+    parser.add_argument('--rate-limit', type=int, default=0, help="Server requests per second (0 = unlimited)")
+    parser.add_argument('--concurrency', type=int, default=4, help="Concurrent ZipRecruiter queries")
+    parser.add_argument('--retry-budget', type=int, default=100, help="ZipRecruiter retries per sweep")
+    parser.add_argument('--apply-workers', type=int, default=8, help="Concurrent applications in apply mode")
+    parser.add_argument('--apply-rate', type=float, default=0, help="Applications per second (0 = unlimited)")
+    parser.add_argument('--parse-workers', type=int, help="Processes for backlog parsing (default: CPU count)")
+    parser.add_argument('--no-reply', action='store_true', help="Do not send replies in gmail mode")
+    parser.add_argument('--json', dest='json_path', help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results = []
+    if args.mode in ('ziprecruiter', 'apply'):
+        results.append(run_ziprecruiter(args) if args.mode == 'ziprecruiter' else run_apply(args))
+        print_result(results[-1])
+    else:
+        runner = run_gmail if args.mode == 'gmail' else run_rest
+        for size in (int(s) for s in args.sizes.split(',')):
+            results.append(runner(size, args.limit, args))
+            print_result(results[-1])
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=4)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Memory benchmark for the in-memory job representations.
+
+Usage:
+    python -m benchmarks.memory                  # 100k postings
+    python -m benchmarks.memory --count 1000000 --json memory.json
+
+Postings are generated, serialized and decoded again page by page, as they
+arrive from the ZipRecruiter jobs API, so every posting owns its own string
+objects. Each representation is built from those pages and only the result
+is kept; the reported size is what tracemalloc still sees allocated
+afterwards, including the string table. Every representation holds the
+same fields, the snippet included.
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+
+from app.core.job_record import JobBatch, JobRecord, StringTable
+from benchmarks.synthetic import generate_job_posting
+
+PAGE_SIZE = 100
+
+
+def iter_pages(count, seed=0):
+    """Yield freshly decoded pages of synthetic postings."""
+    rng = random.Random(seed)
+    for start in range(0, count, PAGE_SIZE):
+        page = [generate_job_posting(rng) for _ in range(min(PAGE_SIZE, count - start))]
+        yield json.loads(json.dumps({'jobs': page}))['jobs']
+
+
+def build_dicts(count):
+    """Plain dict per job, the representation used before JobRecord."""
+    jobs = []
+    for page in iter_pages(count):
+        for posting in page:
+            jobs.append({
+                'id': f"ziprecruiter:{posting['id']}",
+                'account': 'default',
+                'source': 'ziprecruiter',
+                'title': posting.get('name'),
+                'company': (posting.get('hiring_company') or {}).get('name'),
+                'location': posting.get('location'),
+                'employment_type': posting.get('employment_type'),
+                'pay_min': posting.get('salary_min'),
+                'pay_max': posting.get('salary_max'),
+                'pay_period': posting.get('salary_interval'),
+                'url': posting.get('url'),
+                'data': {'snippet': posting['snippet']} if posting.get('snippet') else None
+            })
+    return jobs
+
+
+def build_records(count):
+    strings = StringTable()
+    jobs = []
+    for page in iter_pages(count):
+        jobs.extend(JobRecord.from_posting(posting, 'default', strings) for posting in page)
+    return jobs, strings
+
+
+def build_batch(count):
+    batch = JobBatch()
+    for page in iter_pages(count):
+        batch.extend(JobRecord.from_posting(posting, 'default', batch.strings) for posting in page)
+    return batch
+
+
+REPRESENTATIONS = {
+    'dict': build_dicts,
+    'JobRecord': build_records,
+    'JobBatch': build_batch,
+}
+
+
+def measure(builder, count):
+    """
+    Build a representation and measure the memory it retains.
+
+    Returns:
+        tuple: (retained bytes, peak bytes during the build)
+    """
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = builder(count)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current - baseline, peak - baseline
+
+
+def main(argv=None):
+    """Run the memory benchmark."""
+    parser = argparse.ArgumentParser(description="Job representation memory benchmark")
+    parser.add_argument('--count', type=int, default=100000, help="Number of postings")
+    parser.add_argument('--json', dest='json_path', help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, builder in REPRESENTATIONS.items():
+        retained, peak = measure(builder, args.count)
+        results[name] = {
+            'retained_mb': round(retained / 1e6, 2),
+            'peak_mb': round(peak / 1e6, 2),
+            'bytes_per_job': round(retained / args.count, 1),
+        }
+
+    base = results['dict']['retained_mb']
+    for name, stats in results.items():
+        stats['reduction'] = round(base / stats['retained_mb'], 2) if stats['retained_mb'] else 0.0
+        print(f"{name:10s} {stats['retained_mb']:9.2f} MB retained {stats['bytes_per_job']:8.1f} B/job "
+              f"{stats['peak_mb']:9.2f} MB peak  {stats['reduction']:5.2f}x smaller than dict")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'count': args.count, 'results': results}, f, indent=4)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,396 @@
+"""
+Micro-benchmarks for the hot paths of the application.
+
+Usage:
+    python -m benchmarks.micro                 # run and compare against baselines
+    python -m benchmarks.micro --update        # run and store new baselines
+    python -m benchmarks.micro -k extract      # only benchmarks whose name contains 'extract'
+
+Each benchmark reports the best time per operation over several repeats.
+Results are compared with ``benchmarks/baselines.json``; a benchmark that is
+slower than its baseline by more than the threshold factor is reported as a
+regression and the command exits with status 1. Baselines are machine
+specific, so refresh them with ``--update`` when changing hardware.
+"""
+import argparse
+import atexit
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import generate_mailbox
+
+BASELINE_PATH = Path(__file__).parent / 'baselines.json'
+DEFAULT_THRESHOLD = 1.5
+
+# name -> setup function returning (operation, items processed per call)
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a benchmark setup function under ``name``."""
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+@benchmark('classify_keywords')
+def bench_classify_keywords():
+    from app.core.email_parser import JobEmailParser
+    parser = JobEmailParser()
+    messages = generate_mailbox(1000, seed=1)
+
+    def run():
+        for m in messages:
+            parser.is_job_email(m['subject'], m['body'])
+    return run, len(messages)
+
+
+def _trained_classifier(seed):
+    from app.core.classifier import JobEmailClassifier
+    classifier = JobEmailClassifier()
+    messages = generate_mailbox(1000, seed=seed, digest_ratio=0.5)
+    classifier.learn(classifier.texts(messages), ['recruiter at' in m['body'] for m in messages])
+    return classifier
+
+
+@benchmark('classify_model_batch')
+def bench_classify_model_batch():
+    classifier = _trained_classifier(seed=14)
+    texts = classifier.texts(generate_mailbox(10000, seed=15, digest_ratio=0.5))
+
+    def run():
+        classifier.predict(texts)
+    return run, len(texts)
+
+
+@benchmark('train_classifier')
+def bench_train_classifier():
+    from app.core.classifier import JobEmailClassifier
+    classifier = JobEmailClassifier()
+    messages = generate_mailbox(1000, seed=16, digest_ratio=0.5)
+    texts = classifier.texts(messages)
+    labels = ['recruiter at' in m['body'] for m in messages]
+
+    def run():
+        classifier.learn(texts, labels)
+    return run, len(texts)
+
+
+@benchmark('extract_pay')
+def bench_extract_pay():
+    from app.core.email_parser import JobEmailParser
+    parser = JobEmailParser()
+    bodies = [m['body'] for m in generate_mailbox(1000, seed=2, job_ratio=1.0)]
+
+    def run():
+        for body in bodies:
+            parser.extract_pay(body)
+    return run, len(bodies)
+
+
+@benchmark('extract_employment_type')
+def bench_extract_employment_type():
+    from app.core.email_parser import JobEmailParser
+    parser = JobEmailParser()
+    bodies = [m['body'] for m in generate_mailbox(1000, seed=3, job_ratio=1.0)]
+
+    def run():
+        for body in bodies:
+            parser.extract_employment_type(body)
+    return run, len(bodies)
+
+
+@benchmark('extract_benefits')
+def bench_extract_benefits():
+    from app.core.email_parser import JobEmailParser
+    parser = JobEmailParser()
+    bodies = [m['body'] for m in generate_mailbox(1000, seed=4, job_ratio=1.0)]
+
+    def run():
+        for body in bodies:
+            parser.extract_benefits(body)
+    return run, len(bodies)
+
+
+@benchmark('parse_raw_message')
+def bench_parse_raw_message():
+    from app.core.email_parser import parse_raw_message
+    from benchmarks.synthetic import raw_message
+    raws = [raw_message(i, seed=6) for i in range(500)]
+
+    def run():
+        for raw in raws:
+            parse_raw_message(raw)
+    return run, len(raws)
+
+
+@benchmark('build_reply_with_attachment')
+def bench_build_reply():
+    from app.core.responder import ReplyBuilder
+    resume_path = Path(__file__).parent.parent / 'app' / 'resources' / 'dummy_resume.txt'
+    builder = ReplyBuilder('candidate@example.com', 'Thank you for reaching out.', str(resume_path))
+    messages = generate_mailbox(200, seed=5, job_ratio=1.0)
+
+    def run():
+        for m in messages:
+            builder.build(m['from'], m['subject'], '<id@example.com>').as_bytes()
+    return run, len(messages)
+
+
+REPLY_TEMPLATE = ("Hi {name|there},\n\nThank you for reaching out about the {role|open} role at "
+                  "{company|your company}. The {pay|advertised} range works for me, and my resume is attached.")
+
+
+def _reply_contexts(count, seed):
+    from app.core.email_parser import JobEmailParser
+    from app.core.templates import reply_context
+    parser = JobEmailParser()
+    contexts = []
+    for m in generate_mailbox(count, seed=seed, job_ratio=1.0):
+        result = dict(m)
+        result['reply_to'] = m['from']
+        result.update(parser.analyze(m['subject'], m['body']))
+        contexts.append(reply_context(result))
+    return contexts
+
+
+@benchmark('render_reply_templates')
+def bench_render_reply_templates():
+    from app.core.templates import render_batch
+    contexts = _reply_contexts(500, seed=12)
+
+    def run():
+        render_batch(REPLY_TEMPLATE, contexts)
+    return run, len(contexts)
+
+
+@benchmark('build_personalized_replies')
+def bench_build_personalized_replies():
+    from app.core.responder import ReplyBuilder
+    resume_path = Path(__file__).parent.parent / 'app' / 'resources' / 'dummy_resume.txt'
+    builder = ReplyBuilder('candidate@example.com', REPLY_TEMPLATE, str(resume_path))
+    contexts = _reply_contexts(200, seed=13)
+
+    def run():
+        bodies = builder.render_many(contexts)
+        for context, body in zip(contexts, bodies):
+            builder.build('recruiter@example.com', context['subject'], '<id@example.com>', body).as_bytes()
+    return run, len(contexts)
+
+
+def _pay_columns(count, seed):
+    from benchmarks.synthetic import generate_job_posting
+    rng = random.Random(seed)
+    postings = [generate_job_posting(rng) for _ in range(count)]
+    return ([p['id'] for p in postings], [p['salary_min'] for p in postings],
+            [p['salary_max'] for p in postings], [p['salary_interval'] for p in postings])
+
+
+@benchmark('annualize_pay_batch')
+def bench_annualize_pay_batch():
+    from app.core.pay import annualize_batch
+    _, pay_min, pay_max, periods = _pay_columns(100000, seed=7)
+
+    def run():
+        annualize_batch(pay_min, pay_max, periods)
+    return run, len(pay_min)
+
+
+@benchmark('pay_index_overlap_query')
+def bench_pay_index_overlap_query():
+    from app.core.pay import PayIntervalIndex, annualize_batch
+    ids, pay_min, pay_max, periods = _pay_columns(100000, seed=8)
+    index = PayIntervalIndex(ids, *annualize_batch(pay_min, pay_max, periods))
+
+    def run():
+        index.overlapping(150000, 151000)
+    return run, 1
+
+
+@benchmark('pay_index_min_pay_query')
+def bench_pay_index_min_pay_query():
+    from app.core.pay import PayIntervalIndex, annualize_batch
+    ids, pay_min, pay_max, periods = _pay_columns(100000, seed=9)
+    index = PayIntervalIndex(ids, *annualize_batch(pay_min, pay_max, periods))
+
+    def run():
+        index.min_pay_at_least(240000)
+    return run, 1
+
+
+@benchmark('location_filter')
+def bench_location_filter():
+    from app.core.geo import LocationFilter
+    from benchmarks.synthetic import generate_job_posting
+    rng = random.Random(10)
+    locations = [generate_job_posting(rng)['location'] for _ in range(1000)]
+    location_filter = LocationFilter(['remote', 'Austin, TX', 'Boston, MA'], radius_miles=25)
+
+    def run():
+        for location in locations:
+            location_filter.matches(location)
+    return run, len(locations)
+
+
+@benchmark('company_match_50k')
+def bench_company_match():
+    from app.core.companies import CompanyMatcher
+    rng = random.Random(11)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+
+    def company():
+        return ''.join(rng.choice(letters) for _ in range(rng.randint(5, 10))).title() + rng.choice([' Inc.', ' LLC', ''])
+    matcher = CompanyMatcher([company() for _ in range(50000)])
+    # Half listed names in another form, half unknown names
+    queries = [rng.choice(matcher.names).upper() + ' Corporation' for _ in range(250)]
+    queries += [company() for _ in range(250)]
+
+    def run():
+        matcher._cache.clear()
+        for query in queries:
+            matcher.match(query)
+    return run, len(queries)
+
+
+@benchmark('config_load_save')
+def bench_config_load_save():
+    from app.utils.config import Config
+    config = Config()
+    fd, path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    atexit.register(os.remove, path)
+    config.config_path = Path(path)
+    config.save_config()
+
+    def run():
+        config.load_config()
+        config.save_config()
+    return run, 1
+
+
+def measure(setup, repeat=5, min_time=0.2):
+    """
+    Time a benchmark.
+
+    Args:
+        setup: Benchmark setup function
+        repeat: Number of timed repeats; the best one is reported
+        min_time: Minimum duration of a single repeat in seconds
+
+    Returns:
+        dict: Result with 'us_per_op' and 'ops_per_sec'
+    """
+    run, items = setup()
+
+    # Like timeit, keep the collector from adding noise to the measurement
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        best, loops = _time_loops(run, repeat, min_time)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    per_op = best / (loops * items)
+    return {'us_per_op': round(per_op * 1e6, 3), 'ops_per_sec': round(1.0 / per_op, 1)}
+
+
+def _time_loops(run, repeat, min_time):
+    """Return the best repeat duration and the loop count used."""
+    # Calibrate the number of loops so one repeat lasts at least min_time
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        best = min(best, time.perf_counter() - start)
+    return best, loops
+
+
+def load_baselines(path=BASELINE_PATH):
+    """Load stored baselines, or an empty baseline file structure."""
+    if not path.exists():
+        return {'threshold': DEFAULT_THRESHOLD, 'benchmarks': {}}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def compare(name, result, baselines):
+    """
+    Compare a result with its baseline.
+
+    Returns:
+        tuple: (ratio or None, True if the result is a regression)
+    """
+    baseline = baselines['benchmarks'].get(name)
+    if not baseline:
+        return None, False
+    ratio = result['us_per_op'] / baseline['us_per_op']
+    threshold = baseline.get('threshold', baselines.get('threshold', DEFAULT_THRESHOLD))
+    return ratio, ratio > threshold
+
+
+def main(argv=None):
+    """Run the micro-benchmark suite."""
+    parser = argparse.ArgumentParser(description="Run Job Assistant AI micro-benchmarks")
+    parser.add_argument('-k', dest='pattern', default='', help="Only run benchmarks containing this text")
+    parser.add_argument('--update', action='store_true', help="Store results as the new baselines")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed repeats per benchmark")
+    parser.add_argument('--json', dest='json_path', help="Also write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    random.seed(0)
+    baselines = load_baselines()
+    results = {}
+    regressions = []
+
+    for name, setup in BENCHMARKS.items():
+        if args.pattern not in name:
+            continue
+        result = measure(setup, repeat=args.repeat)
+        results[name] = result
+        ratio, regressed = compare(name, result, baselines)
+        status = '' if ratio is None else f"  x{ratio:.2f} vs baseline"
+        if regressed:
+            status += "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:32s} {result['us_per_op']:12.3f} us/op {result['ops_per_sec']:14.1f} ops/s{status}")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=4)
+
+    if args.update:
+        for name, result in results.items():
+            entry = baselines['benchmarks'].setdefault(name, {})
+            entry.update(result)
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(baselines, f, indent=4, sort_keys=True)
+        print(f"Baselines written to {BASELINE_PATH}")
+        return 0
+
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Synthetic recruiter emails and job postings for benchmarks and load tests.
+
+Every generator takes an explicit ``random.Random`` (or an index) so that
+runs are reproducible. ``raw_message(i)`` derives message ``i`` from its
+index alone, which lets fake servers expose arbitrarily large mailboxes
+without holding them in memory.
+"""
+import random
+from email.utils import formatdate
+
+FIRST_NAMES = ['Alex', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn', 'Drew']
+LAST_NAMES = ['Smith', 'Johnson', 'Lee', 'Garcia', 'Brown', 'Davis', 'Miller', 'Wilson', 'Moore', 'Clark']
+COMPANIES = ['Acme Inc.', 'Globex Corporation', 'Initech LLC', 'Umbrella Corp', 'Hooli',
+             'Stark Industries', 'Wayne Enterprises', 'Soylent Co.', 'Vandelay Industries', 'Tyrell Corp']
+TITLES = ['Software Engineer', 'Senior Python Developer', 'Backend Engineer', 'Data Engineer',
+          'Full Stack Developer', 'Platform Engineer', 'DevOps Engineer', 'Machine Learning Engineer']
+LOCATIONS = ['Remote', 'New York, NY', 'San Francisco, CA', 'Austin, TX', 'Seattle, WA',
+             'Chicago, IL', 'Boston, MA', 'Denver, CO', 'Hybrid - Atlanta, GA']
+EMPLOYMENT_TYPES = ['full-time', 'part-time', 'contract', 'temporary', 'internship']
+PAY_PERIODS = [('year', 60000, 180000), ('hour', 30, 120), ('month', 5000, 15000)]
+NOISE_SUBJECTS = ['Your weekly newsletter', 'Order confirmation #{n}', 'Dinner on Friday?',
+                  'Security alert', 'Your receipt', 'Photos from the weekend']
+JOB_BOARDS = ['JobHunt', 'CareerBoard', 'HireDaily', 'WorkFeed']
+DIGEST_SUBJECTS = ['{n} new jobs for you', 'Your weekly job alert', 'Jobs you may be interested in',
+                   'New positions hiring now near you']
+
+
+def _person(rng):
+    return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+
+def generate_job_posting(rng):
+    """
+    Generate a job posting in the shape returned by the ZipRecruiter jobs API.
+
+    Args:
+        rng: random.Random instance
+
+    Returns:
+        dict: Job posting
+    """
+    period, low, high = rng.choice(PAY_PERIODS)
+    salary_min = rng.randint(low, high)
+    company = rng.choice(COMPANIES)
+    location = rng.choice(LOCATIONS)
+    return {
+        'id': f"job-{rng.getrandbits(48):012x}",
+        'name': rng.choice(TITLES),
+        'hiring_company': {'name': company},
+        'location': location,
+        'employment_type': rng.choice(EMPLOYMENT_TYPES),
+        'salary_min': salary_min,
+        'salary_max': salary_min + rng.randint(0, salary_min // 3 + 1),
+        'salary_interval': period,
+        'snippet': f"{company} is hiring. Benefits include health, dental and 401k.",
+        'url': f"https://www.ziprecruiter.com/jobs/{rng.getrandbits(32):08x}",
+    }
+
+
+def generate_recruiter_email(rng):
+    """
+    Generate a recruiter email about a job.
+
+    Args:
+        rng: random.Random instance
+
+    Returns:
+        dict: Message with 'from', 'subject' and 'body' keys
+    """
+    first, last = _person(rng)
+    job = generate_job_posting(rng)
+    company = job['hiring_company']['name']
+    body = (
+        f"Hi,\n\nMy name is {first} {last} and I am a recruiter at {company}. "
+        f"We have an opening for a {job['name']} position ({job['location']}).\n\n"
+        f"Position type: {job['employment_type']}\n"
+        f"Salary range: ${job['salary_min']:,} - ${job['salary_max']:,} per {job['salary_interval']}\n"
+        f"Benefits include medical, dental, vision and a 401k match.\n\n"
+        f"Responsibilities include building services and mentoring the team. "
+        f"Requirements: 5+ years of experience with Python.\n\n"
+        f"Would you be open to an interview this week?\n\nThanks,\n{first}"
+    )
+    return {
+        'from': f"{first} {last} <{first.lower()}.{last.lower()}@example.com>",
+        'subject': f"{job['name']} opportunity at {company}",
+        'body': body,
+    }
+
+
+def generate_noise_email(rng):
+    """
+    Generate a message that is not job-related.
+
+    Args:
+        rng: random.Random instance
+
+    Returns:
+        dict: Message with 'from', 'subject' and 'body' keys
+    """
+    first, last = _person(rng)
+    subject = rng.choice(NOISE_SUBJECTS).format(n=rng.randint(1000, 9999))
+    body = (
+        f"Hello,\n\nJust a quick note about {subject.lower()}. "
+        f"Let me know what you think when you get a chance.\n\n{first}"
+    )
+    return {
+        'from': f"{first} {last} <{first.lower()}@example.org>",
+        'subject': subject,
+        'body': body,
+    }
+
+
+def generate_digest_email(rng):
+    """
+    Generate a job-board newsletter, which is full of job keywords but is not
+    a job offer addressed to the candidate.
+
+    Args:
+        rng: random.Random instance
+
+    Returns:
+        dict: Message with 'from', 'subject' and 'body' keys
+    """
+    board = rng.choice(JOB_BOARDS)
+    listings = []
+    for _ in range(rng.randint(3, 6)):
+        job = generate_job_posting(rng)
+        listings.append(
+            f"- {job['name']} - {job['hiring_company']['name']} - {job['location']}\n"
+            f"  Salary: ${job['salary_min']:,}+ per {job['salary_interval']}. Apply now: {job['url']}"
+        )
+    body = (
+        "Top jobs matching your profile this week\n\n" + "\n".join(listings) +
+        f"\n\nEasy apply with your saved resume. Update your job alert preferences or "
+        f"unsubscribe at any time.\n\n{board} Team"
+    )
+    return {
+        'from': f"{board} Job Alerts <alerts@{board.lower()}.example.net>",
+        'subject': rng.choice(DIGEST_SUBJECTS).format(n=rng.randint(5, 50)),
+        'body': body,
+    }
+
+
+def generate_mailbox(count, seed=0, job_ratio=0.3, digest_ratio=0.0):
+    """
+    Generate a list of messages mixing recruiter, job-board digest and noise emails.
+
+    Args:
+        count: Number of messages
+        seed: Random seed
+        job_ratio: Fraction of recruiter emails
+        digest_ratio: Fraction of job-board digests among the other emails
+
+    Returns:
+        list: Message dicts
+    """
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        if rng.random() < job_ratio:
+            messages.append(generate_recruiter_email(rng))
+        elif digest_ratio and rng.random() < digest_ratio:
+            messages.append(generate_digest_email(rng))
+        else:
+            messages.append(generate_noise_email(rng))
+    return messages
+
+
+def message_for_index(index, seed=0, job_ratio=0.3):
+    """
+    Deterministically generate message ``index`` of a synthetic mailbox.
+
+    Args:
+        index: Message index
+        seed: Mailbox seed
+        job_ratio: Fraction of recruiter emails
+
+    Returns:
+        dict: Message with 'from', 'subject' and 'body' keys
+    """
+    rng = random.Random(seed * 1000003 + index)
+    if rng.random() < job_ratio:
+        return generate_recruiter_email(rng)
+    return generate_noise_email(rng)
+
+
+def raw_message(index, seed=0, job_ratio=0.3, to='candidate@example.com'):
+    """
+    Render message ``index`` of a synthetic mailbox as RFC 822 bytes.
+
+    Args:
+        index: Message index
+        seed: Mailbox seed
+        job_ratio: Fraction of recruiter emails
+        to: Recipient address
+
+    Returns:
+        bytes: The raw message
+    """
+    message = message_for_index(index, seed, job_ratio)
+    headers = (
+        f"Message-ID: <{seed}.{index}@synthetic.example.com>\r\n"
+        f"Date: {formatdate(1700000000 + index * 60)}\r\n"
+        f"From: {message['from']}\r\n"
+        f"To: {to}\r\n"
+        f"Subject: {message['subject']}\r\n"
+        f"MIME-Version: 1.0\r\n"
+        f"Content-Type: text/plain; charset=utf-8\r\n"
+        f"Content-Transfer-Encoding: 8bit\r\n\r\n"
+    )
+    return (headers + message['body'].replace('\n', '\r\n') + '\r\n').encode('utf-8')
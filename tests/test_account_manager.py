@@ -0,0 +1,90 @@
+import logging
+
+import pytest
+
+from app.core.account_manager import AccountManager, AccountState
+from app.core.job_store import JobStore
+
+
+class RecordingExecutor:
+    """Stands in for the worker pool: keeps submitted units until the test runs them."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, func, *args):
+        self.submitted.append((func, args))
+
+    def run_all(self):
+        submitted, self.submitted = self.submitted, []
+        for func, args in submitted:
+            func(*args)
+
+
+@pytest.fixture
+def manager():
+    manager = AccountManager({'account_pool': {'worker_threads': 2}}, logging.getLogger('test'),
+                             store=JobStore(':memory:'))
+    manager.executor = RecordingExecutor()
+    yield manager
+    manager.store.close()
+
+
+def add(manager, name, units, ran=None, quota_per_minute=0):
+    state = AccountState(name, 'ziprecruiter', None, 3600, quota_per_minute)
+    for i in range(units):
+        state.pending.append(lambda name=name, i=i: ran.append((name, i)))
+    manager.accounts[name] = state
+    return state
+
+
+def test_dispatch_is_round_robin_with_one_unit_per_account(manager):
+    ran = []
+    add(manager, 'big', 4, ran)
+    add(manager, 'small', 1, ran)
+    add(manager, 'other', 2, ran)
+
+    while True:
+        manager._dispatch()
+        if not manager.executor.submitted:
+            break
+        # One unit per account at a time, never more than the pool size
+        names = [args[0].name for _, args in manager.executor.submitted]
+        assert len(names) == len(set(names)) <= manager.max_workers
+        manager.executor.run_all()
+
+    assert ran == [('big', 0), ('small', 0), ('other', 0), ('big', 1),
+                 ('other', 1), ('big', 2), ('big', 3)]
+    assert manager._in_flight == 0
+    assert all(state.status['state'] == 'idle' for state in manager.accounts.values())
+
+
+def test_quota_limits_units_per_minute(manager):
+    ran = []
+    limited = add(manager, 'limited', 3, ran, quota_per_minute=60)
+    add(manager, 'free', 3, ran)
+
+    for _ in range(3):
+        manager._dispatch()
+        manager.executor.run_all()
+
+    # One unit a second with a burst of one: the other units wait for tokens
+    assert [name for name, _ in ran].count('limited') == 1
+    assert [name for name, _ in ran].count('free') == 3
+    assert len(limited.pending) == 2
+    assert manager.get_status()['limited']['pending_tasks'] == 2
+
+
+def test_failed_unit_abandons_the_rest_of_the_scan(manager):
+    state = add(manager, 'broken', 0)
+    state.pending.extend([lambda: 1 / 0, lambda: None])
+    events = []
+    manager.event_callback = lambda kind, source, **data: events.append((kind, source, data['message']))
+
+    manager._dispatch()
+    manager.executor.run_all()
+
+    assert not state.pending
+    assert state.status['errors'] == 1
+    assert state.status['last_error'] == 'division by zero'
+    assert events == [('error', 'ziprecruiter:broken', 'division by zero')]
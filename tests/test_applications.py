@@ -0,0 +1,64 @@
+import logging
+
+from app.core.applications import REJECTED, ApplicationLedger, ApplicationPipeline
+from app.core.criteria import JobCriteria
+
+POSTING = {'id': 'job-1', 'name': 'Backend Engineer', 'hiring_company': {'name': 'Acme'}, 'location': 'Austin, TX'}
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self._body = body
+        self.text = ''
+
+    def json(self):
+        if self._body is None:
+            raise ValueError("No JSON body")
+        return self._body
+
+
+class FakeTransport:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent = 0
+
+    def post(self, url, **kwargs):
+        self.sent += 1
+        return self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+
+
+def make_pipeline(transport, ledger, **kwargs):
+    return ApplicationPipeline(transport, ledger, logging.getLogger('test'), 'test',
+                               'https://jobs.example.com/apply', {'name': 'Jane'}, rate_per_host=0, **kwargs)
+
+
+def test_application_is_given_up_after_max_attempts():
+    ledger = ApplicationLedger(':memory:')
+    transport = FakeTransport(FakeResponse(503))
+    pipeline = make_pipeline(transport, ledger, max_attempts=3)
+
+    assert pipeline.apply([POSTING]) == {'failed': 1}
+    assert pipeline.apply([]) == {'failed': 1}
+    assert pipeline.apply([]) == {'rejected': 1}
+    assert pipeline.apply([]) == {}
+    assert transport.sent == 3
+    assert ledger.counts('test') == {REJECTED: 1}
+
+
+def test_resumed_application_is_checked_against_the_criteria():
+    ledger = ApplicationLedger(':memory:')
+    transport = FakeTransport(FakeResponse(503), FakeResponse(201, {'application_id': 'a1'}))
+    assert make_pipeline(transport, ledger).apply([POSTING]) == {'failed': 1}
+
+    criteria = JobCriteria({'excluded_companies': ['Acme']})
+    assert make_pipeline(transport, ledger).apply([], criteria=criteria) == {}
+    assert transport.sent == 1
+    assert ledger.unfinished('test') == []
+
+
+def test_non_object_json_response_is_accepted():
+    ledger = ApplicationLedger(':memory:')
+    pipeline = make_pipeline(FakeTransport(FakeResponse(201, ['ok'])), ledger)
+
+    assert pipeline.apply([POSTING]) == {'applied': 1}
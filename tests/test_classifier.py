@@ -0,0 +1,113 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.core.classifier import JOB, NOT_JOB, JobEmailClassifier, hash_ngrams, shared_classifier
+from benchmarks.synthetic import generate_digest_email, generate_noise_email, generate_recruiter_email
+
+
+def labeled_messages(count, seed):
+    """Recruiter emails are jobs; job-board digests and other mail are not."""
+    rng = random.Random(seed)
+    messages, labels = [], []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            messages.append(generate_recruiter_email(rng))
+        elif kind == 1:
+            messages.append(generate_digest_email(rng))
+        else:
+            messages.append(generate_noise_email(rng))
+        labels.append(JOB if kind == 0 else NOT_JOB)
+    return messages, np.array(labels, dtype=bool)
+
+
+@pytest.fixture(scope='module')
+def trained():
+    classifier = JobEmailClassifier(n_bits=14)
+    messages, labels = labeled_messages(300, seed=1)
+    classifier.learn(classifier.texts(messages), labels)
+    return classifier
+
+
+def test_learns_to_tell_recruiters_from_job_board_digests(trained):
+    messages, labels = labeled_messages(150, seed=2)
+
+    predicted = trained.predict(trained.texts(messages))
+
+    assert trained.label_counts == (100, 200)
+    assert trained.is_trained(100) and not trained.is_trained(101)
+    assert (predicted == labels).mean() >= 0.95
+
+
+def test_untrained_model_has_no_opinion():
+    classifier = JobEmailClassifier(n_bits=10)
+
+    assert not classifier.is_trained()
+    assert classifier.predict_proba(["anything at all", ""]).tolist() == [0.5, 0.5]
+
+
+def test_save_and_load_round_trip(trained, tmp_path):
+    path = tmp_path / 'model' / 'classifier.npz'
+    texts = trained.texts(labeled_messages(30, seed=3)[0])
+
+    trained.save(path)
+    loaded = JobEmailClassifier.load(path)
+
+    assert (loaded.n_bits, loaded.alpha, loaded.max_chars) == (trained.n_bits, trained.alpha, trained.max_chars)
+    assert np.array_equal(loaded.feature_counts, trained.feature_counts)
+    assert loaded.label_counts == trained.label_counts
+    assert np.allclose(loaded.predict_proba(texts), trained.predict_proba(texts))
+    assert [p.name for p in path.parent.iterdir()] == ['classifier.npz']
+
+    # A loaded model keeps learning where the saved one stopped
+    loaded.learn(["we are hiring a recruiter"], [JOB])
+    assert loaded.label_counts == (trained.label_counts[0] + 1, trained.label_counts[1])
+
+
+def test_load_rejects_invalid_models(trained, tmp_path):
+    other = tmp_path / 'other.npz'
+    np.savez(other, version=1, n_bits=10, alpha=0.5, max_chars=4000,
+             feature_counts=trained.feature_counts, message_counts=trained.message_counts)
+    with pytest.raises(ValueError, match="feature space"):
+        JobEmailClassifier.load(other)
+
+    np.savez(other, version=2)
+    with pytest.raises(ValueError, match="version"):
+        JobEmailClassifier.load(other)
+
+    np.savez(other, version=1, n_bits=10)
+    with pytest.raises(ValueError, match="Missing"):
+        JobEmailClassifier.load(other)
+
+    with pytest.raises(OSError):
+        JobEmailClassifier.load(tmp_path / 'missing.npz')
+
+
+def test_learn_requires_one_label_per_text():
+    with pytest.raises(ValueError):
+        JobEmailClassifier(n_bits=10).learn(["a", "b"], [JOB])
+
+
+def test_ngram_hashes_do_not_depend_on_the_batch():
+    texts = ["Senior Python developer role", "", "café\0menu", "python developer"]
+
+    documents, features = hash_ngrams(texts, 12)
+
+    for index, text in enumerate(texts):
+        alone = hash_ngrams([text], 12)[1]
+        assert sorted(features[documents == index].tolist()) == sorted(alone.tolist())
+    # 'python' and 'developer' hash the same in both texts that contain them
+    first = set(features[documents == 0].tolist())
+    last = set(features[documents == 3].tolist())
+    assert len(first & last) == 3
+
+
+def test_shared_classifier_is_loaded_once(trained, tmp_path):
+    path = tmp_path / 'shared.npz'
+    trained.save(path)
+
+    assert shared_classifier(str(path)) is shared_classifier(str(path))
+    assert shared_classifier(str(path)).label_counts == trained.label_counts
+    assert not shared_classifier(str(tmp_path / 'new.npz')).is_trained()
@@ -0,0 +1,79 @@
+import random
+import string
+
+import pytest
+
+from app.core.companies import CompanyMatcher, _trigrams, normalize_company
+
+
+def dice(a, b):
+    a, b = _trigrams(a), _trigrams(b)
+    return 2.0 * len(a & b) / (len(a) + len(b))
+
+
+@pytest.mark.parametrize('name, normalized', [
+    ("ACME Corporation", 'acme'),
+    ("Acme, Inc.", 'acme'),
+    ("The Globex Co. L.L.C.", 'globex'),
+    ("Société Générale S.A.", 'societe generale'),
+    ("Johnson & Johnson", 'johnson and johnson'),
+    ("The Company", 'company'),
+    ("", ''),
+])
+def test_normalize_company(name, normalized):
+    assert normalize_company(name) == normalized
+
+
+def test_fuzzy_match_respects_the_dice_threshold():
+    matcher = CompanyMatcher(['Initech Software'], threshold=0.85)
+
+    assert matcher.match('INITECH SOFTWARE LLC') == 'Initech Software'
+    assert dice('initech softwares', 'initech software') >= 0.85
+    assert matcher.match('Initech Softwares') == 'Initech Software'
+    assert dice('initech systems', 'initech software') < 0.85
+    assert matcher.match('Initech Systems') is None
+    assert 'Initech Systems' not in matcher
+
+    exact_only = CompanyMatcher(['Initech Software'], threshold=1.0)
+    assert exact_only.match('Initech Softwares') is None
+    assert exact_only.match('initech software, inc.') == 'Initech Software'
+
+
+def test_added_names_replace_cached_misses():
+    matcher = CompanyMatcher(['Acme'])
+    assert matcher.match('Globex') is None
+
+    matcher.add('Globex Corporation')
+
+    assert matcher.match('Globex') == 'Globex Corporation'
+    assert len(matcher) == 2
+
+
+def typo(rng, name):
+    """Drop, double or swap a letter."""
+    i = rng.randrange(len(name) - 1)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return name[:i] + name[i + 1:]
+    if kind == 1:
+        return name[:i] + name[i] + name[i:]
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+
+@pytest.mark.parametrize('threshold', [0.6, 0.75, 0.85])
+def test_prefix_filtering_finds_the_best_match_brute_force_finds(threshold):
+    rng = random.Random(threshold)
+    words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8))) for _ in range(150)]
+    names = sorted({' '.join(rng.sample(words, rng.randint(1, 3))) for _ in range(600)})
+    matcher = CompanyMatcher(names, threshold=threshold)
+    grams = [_trigrams(normalize_company(name)) for name in names]
+
+    for query in [typo(rng, name) for name in rng.sample(names, 100)]:
+        key = _trigrams(normalize_company(query))
+        best = max(2.0 * len(key & other) / (len(key) + len(other)) for other in grams)
+        found = matcher.match(query)
+        if best >= threshold:
+            assert found is not None, query
+            assert dice(normalize_company(query), normalize_company(found)) == pytest.approx(best)
+        else:
+            assert found is None, query
@@ -0,0 +1,110 @@
+import json
+import logging
+import os
+import stat
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('google.oauth2.credentials')
+
+from google.oauth2.credentials import Credentials
+
+from app.core.credentials import CredentialManager
+
+SCOPES = ['https://www.googleapis.com/auth/gmail.modify']
+
+
+def write_token(path, expires_in, refresh_token='refresh-1'):
+    credentials = Credentials(
+        'old-token', refresh_token=refresh_token, token_uri='https://oauth2.example.com/token',
+        client_id='client', client_secret='secret', scopes=SCOPES,
+        expiry=datetime.utcnow() + timedelta(seconds=expires_in),
+    )
+    path.write_text(credentials.to_json())
+
+
+@pytest.fixture
+def refreshes(monkeypatch):
+    calls = []
+
+    def refresh(credentials, request):
+        calls.append(credentials.token)
+        credentials.token = f'new-token-{len(calls)}'
+        credentials.expiry = datetime.utcnow() + timedelta(hours=1)
+
+    monkeypatch.setattr(Credentials, 'refresh', refresh)
+    return calls
+
+
+def manager(path, margin=600):
+    return CredentialManager(str(path), SCOPES, logging.getLogger('test'), refresh_margin=margin)
+
+
+def test_refresh_is_due_a_margin_before_expiry(tmp_path):
+    token = tmp_path / 'token.json'
+    write_token(token, 3600)
+    credentials = manager(token)
+
+    assert credentials.load() is credentials.load()
+    assert 2990 < credentials.seconds_until_refresh() <= 3000
+
+    write_token(token, 300)
+    soon = manager(token)
+    # Nothing loaded yet
+    assert soon.seconds_until_refresh() == 600
+    soon.load()
+    assert soon.seconds_until_refresh() == 0.0
+
+
+def test_token_is_refreshed_ahead_of_expiry_and_written_back(tmp_path, refreshes):
+    token = tmp_path / 'token.json'
+    write_token(token, 300)
+    credentials = manager(token)
+
+    credentials.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not refreshes and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        credentials.stop()
+
+    assert refreshes == ['old-token']
+    saved = json.loads(token.read_text())
+    assert saved['token'] == 'new-token-1'
+    assert saved['refresh_token'] == 'refresh-1'
+    assert stat.S_IMODE(os.stat(token).st_mode) == 0o600
+    # The next refresh is an hour minus the margin away
+    assert credentials.seconds_until_refresh() > 2900
+    assert os.listdir(tmp_path) == ['token.json']
+
+
+def test_failed_write_keeps_the_previous_token(tmp_path, refreshes, monkeypatch):
+    token = tmp_path / 'token.json'
+    write_token(token, 0)
+    before = token.read_text()
+    credentials = manager(token)
+    credentials.load()
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, 'replace', fail)
+    with pytest.raises(OSError):
+        credentials._refresh_locked()
+
+    assert token.read_text() == before
+    assert os.listdir(tmp_path) == ['token.json']
+
+
+def test_token_without_refresh_token_is_rejected(tmp_path, refreshes):
+    token = tmp_path / 'token.json'
+    write_token(token, 0, refresh_token='')
+    credentials = manager(token)
+    credentials.load()
+
+    with pytest.raises(ValueError):
+        credentials._refresh_locked()
+    assert refreshes == []
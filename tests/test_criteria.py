@@ -0,0 +1,100 @@
+import random
+
+from app.core.criteria import JobCriteria
+from app.core.email_parser import JobEmailParser
+from app.core.job_record import JobBatch, JobRecord
+from benchmarks.synthetic import generate_job_posting
+
+BODY = (
+    "Hi,\n\nMy name is Alex and I am a recruiter at {company}. We have an opening for a "
+    "Backend Engineer position.\n\nSalary range: $150,000 - $180,000 per year\n"
+    "Would you be open to an interview this week?"
+)
+
+
+def analyze(subject, body, sender='alex@example.com'):
+    result = {'subject': subject, 'body': body, 'from': sender}
+    result.update(JobEmailParser().analyze(subject, body, sender=sender))
+    return result
+
+
+def test_email_from_excluded_company_is_rejected():
+    criteria = JobCriteria({'excluded_companies': ['Globex Inc.']})
+
+    by_subject = analyze("Backend Engineer opportunity at Globex Corporation", BODY.format(company="someone"))
+    by_body = analyze("Quick question", BODY.format(company="GLOBEX LLC"))
+    by_domain = analyze("Quick question about a job", BODY.format(company="our team"),
+                        sender='alex@careers.globex.com')
+
+    for result in (by_subject, by_body, by_domain):
+        assert result['is_job']
+        assert not criteria.matches_email(result), result['company']
+
+
+def test_email_from_other_company_is_accepted():
+    criteria = JobCriteria({'excluded_companies': ['Globex Inc.']})
+
+    result = analyze("Backend Engineer opportunity at Initech", BODY.format(company="Initech"))
+
+    assert result['company'] == 'Initech'
+    assert criteria.matches_email(result)
+
+
+def test_email_location_is_checked_against_the_requirements():
+    criteria = JobCriteria({'location_requirements': ['remote', 'Austin, TX'], 'search_radius': 25})
+    body = "We have an opening for a Backend Engineer position ({location}). Salary range: $150,000 per year."
+
+    far = analyze("Backend Engineer opportunity at Initech", body.format(location="Seattle, WA"))
+    near = analyze("Backend Engineer opportunity at Initech", body.format(location="Round Rock, TX"))
+    remote = analyze("Backend Engineer opportunity at Initech", "This is a fully remote role. Salary: $150,000")
+
+    assert far['location'] == 'Seattle, WA'
+    assert not criteria.matches_email(far)
+    assert criteria.matches_email(near)
+    assert criteria.matches_email(remote)
+
+
+def test_filter_batch_does_not_grow_the_string_table():
+    criteria = JobCriteria({'employment_types': ['full-time', 'contract', 'internship'],
+                            'excluded_companies': ['Globex']})
+    batch = JobBatch()
+    batch.extend([
+        JobRecord('1', company='Acme', employment_type='full-time'),
+        JobRecord('2', company='Globex', employment_type='full-time'),
+        JobRecord('3', company='Initech', employment_type='part-time'),
+    ])
+    size = len(batch.strings)
+
+    assert criteria.filter_batch(batch).tolist() == [0]
+    assert batch.filter_indices(employment_types=['contract'], pay_period='year') == []
+    assert len(batch.strings) == size
+    # Every batch has its own table unless one is shared explicitly
+    assert JobBatch().strings is not batch.strings
+
+
+def test_filter_batch_agrees_with_matches_posting():
+    criteria = JobCriteria({'pay_range_min': 90000, 'employment_types': ['full-time', 'contract'],
+                            'location_requirements': ['remote', 'Austin, TX'],
+                            'excluded_companies': ['Acme']})
+    rng = random.Random(1)
+    postings = [generate_job_posting(rng) for _ in range(2000)]
+    batch = JobBatch()
+    batch.extend(JobRecord.from_posting(posting, strings=batch.strings) for posting in postings)
+
+    expected = [i for i, posting in enumerate(postings) if criteria.matches_posting(posting)]
+    assert 0 < len(expected) < len(postings)
+    assert criteria.filter_batch(batch).tolist() == expected
+    assert criteria.filter_batch(JobBatch()).tolist() == []
+
+
+def test_batch_keeps_the_extras_of_its_records():
+    posting = {'id': 'p1', 'name': 'Backend Engineer', 'hiring_company': {'name': 'Acme'},
+               'salary_min': 100000, 'snippet': 'Build APIs'}
+    record = JobRecord.from_posting(posting, 'default')
+    batch = JobBatch()
+    batch.extend([record, JobRecord('2', company='Initech')])
+
+    assert batch[0] == record
+    assert batch[0].extras() == {'snippet': 'Build APIs'}
+    assert batch.select([1, 0])[1] == record
+    assert batch[1].extras() == {}
@@ -0,0 +1,109 @@
+import pytest
+
+from app.core import parse_pool
+from app.core.backfill import Backfill, iter_mbox_messages
+from app.core.email_parser import JobEmailParser, parse_raw_message
+from app.core.job_store import JobStore
+from app.core.parse_pool import ParallelMessageParser
+
+EIGHT_BIT_MESSAGE = (
+    "Message-ID: <8bit@example.com>\r\n"
+    "From: José Pérez <jose@example.com>\r\n"
+    "Subject: Café Software Engineer opportunity at Acme\r\n"
+    "Content-Type: text/plain; charset=utf-8\r\n"
+    "Content-Disposition: inline; filename=\"résumé.txt\"\r\n"
+    "\r\n"
+    "We are hiring a recruiter for a remote position.\r\n"
+).encode('utf-8')
+
+
+def test_parse_raw_message_decodes_8bit_headers():
+    message = parse_raw_message(EIGHT_BIT_MESSAGE)
+
+    assert message['from'] == 'José Pérez <jose@example.com>'
+    assert message['reply_to'] == 'jose@example.com'
+    assert message['subject'] == 'Café Software Engineer opportunity at Acme'
+    assert message['body'].startswith('We are hiring')
+
+
+def test_parse_raw_message_falls_back_to_latin1_headers():
+    raw = b"From: Jos\xe9 <j@example.com>\r\nSubject: =?utf-8?q?Caf=C3=A9?= role\r\n\r\nhi\r\n"
+
+    message = parse_raw_message(raw)
+
+    assert message['from'] == 'José <j@example.com>'
+    assert message['subject'] == 'Café role'
+
+
+def test_parse_many_returns_none_for_unparsable_messages(monkeypatch):
+    def parse(raw):
+        if raw == b'bad':
+            raise ValueError("malformed")
+        return parse_raw_message(raw)
+    monkeypatch.setattr(parse_pool, 'parse_raw_message', parse)
+
+    records = ParallelMessageParser(threshold=1000).parse_many([EIGHT_BIT_MESSAGE, b'bad', EIGHT_BIT_MESSAGE])
+
+    assert records[1] is None
+    assert records[0]['subject'] == records[2]['subject']
+
+
+def test_backfill_skips_unparsable_messages(tmp_path, monkeypatch):
+    def parse(raw):
+        if b'<broken@example.com>' in raw:
+            raise ValueError("malformed")
+        return parse_raw_message(raw)
+    monkeypatch.setattr(parse_pool, 'parse_raw_message', parse)
+
+    broken = b"Message-ID: <broken@example.com>\r\nSubject: x\r\n\r\nbody\r\n"
+    mbox = tmp_path / 'mail.mbox'
+    mbox.write_bytes(b"From a@example.com Mon Jan  1 00:00:00 2024\n" + EIGHT_BIT_MESSAGE +
+                     b"\nFrom b@example.com Mon Jan  1 00:00:00 2024\n" + broken)
+
+    store = JobStore(str(tmp_path / 'jobs.db'))
+    try:
+        stats = Backfill(store, 'test', parse_workers=1).run(str(mbox))
+    finally:
+        store.close()
+
+    assert stats['messages'] == 2
+    assert stats['failed'] == 1
+    assert stats['jobs'] == 1
+
+
+def test_mbox_from_escaping_is_undone(tmp_path):
+    mbox = tmp_path / 'mail.mbox'
+    mbox.write_bytes(b"From a@example.com Mon Jan  1 00:00:00 2024\n"
+                     b"Subject: x\n\n>From the team\n>>From quoted\nNot >From here\n")
+
+    assert list(iter_mbox_messages(str(mbox))) == [
+        b"Subject: x\n\nFrom the team\n>From quoted\nNot >From here\n"
+    ]
+
+
+def test_parsers_share_one_process_pool():
+    first = ParallelMessageParser(max_workers=2)
+    second = ParallelMessageParser(max_workers=2)
+    try:
+        # A small batch of a large backlog still goes to the pool when asked to
+        assert first.parse_many([EIGHT_BIT_MESSAGE] * 3, use_pool=True)[2]['reply_to'] == 'jose@example.com'
+        assert second.parse_many([EIGHT_BIT_MESSAGE], use_pool=True)[0] is not None
+        assert first._pool is second._pool
+        first.shutdown()
+        assert parse_pool._pools[2][1] == 1
+    finally:
+        first.shutdown()
+        second.shutdown()
+    assert 2 not in parse_pool._pools
+
+
+@pytest.mark.parametrize('text, location', [
+    ("Location: St. Louis, MO", 'St. Louis, MO'),
+    ("The team is based in Washington D.C. area.", 'Washington D.C. area'),
+    ("Location: Austin, TX. Apply today!", 'Austin, TX'),
+    ("Location: Austin, TX.\nSalary: $120,000 per year", 'Austin, TX'),
+    ("Location: Ft. Worth; hybrid", 'Ft. Worth'),
+    ("Backend Engineer position (Remote)", 'Remote'),
+])
+def test_extract_location_keeps_abbreviations(text, location):
+    assert JobEmailParser().extract_location(text) == location
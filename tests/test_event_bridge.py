@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+QtCore = pytest.importorskip('PySide6.QtCore')
+
+from app.core.events import EVENT_ERROR, EVENT_NEW_JOB, EVENT_PROGRESS
+from app.ui.event_bridge import EventBridge
+
+
+@pytest.fixture
+def bridge():
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    bridge = EventBridge(max_batch=10)
+    batches = []
+    bridge.batch_ready.connect(batches.append)
+    yield bridge, batches
+    bridge.deleteLater()
+    app.processEvents()
+
+
+def test_flush_keeps_the_latest_progress_per_source(bridge):
+    bridge, batches = bridge
+    bridge.post(EVENT_PROGRESS, 'gmail', message='1')
+    bridge.post(EVENT_NEW_JOB, 'gmail', message='job')
+    bridge.post(EVENT_PROGRESS, 'gmail', message='2')
+    bridge.post(EVENT_PROGRESS, 'ziprecruiter', message='a')
+    bridge.post(EVENT_PROGRESS, 'gmail', message='3')
+    bridge.post(EVENT_ERROR, 'ziprecruiter', message='boom')
+
+    bridge.flush()
+
+    assert len(batches) == 1
+    assert [(e.kind, e.source, e.data['message']) for e in batches[0]] == [
+        (EVENT_NEW_JOB, 'gmail', 'job'),
+        (EVENT_ERROR, 'ziprecruiter', 'boom'),
+        (EVENT_PROGRESS, 'gmail', '3'),
+        (EVENT_PROGRESS, 'ziprecruiter', 'a'),
+    ]
+    assert bridge.dropped_progress == 2
+
+
+def test_flush_drains_at_most_max_batch_events(bridge):
+    bridge, batches = bridge
+    for i in range(25):
+        bridge.post(EVENT_NEW_JOB, 'gmail', message=str(i))
+
+    bridge.flush()
+    assert [len(batch) for batch in batches] == [10]
+
+    # Stopping delivers what is still queued
+    bridge.stop()
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert [e.data['message'] for batch in batches for e in batch] == [str(i) for i in range(25)]
+
+    bridge.flush()
+    assert len(batches) == 3
+
+
+def test_events_posted_from_many_threads_are_all_delivered(bridge):
+    bridge, batches = bridge
+
+    def post(source):
+        for i in range(200):
+            bridge.post(EVENT_NEW_JOB, source, message=str(i))
+
+    threads = [threading.Thread(target=post, args=(f'worker-{n}',)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    bridge.stop()
+
+    delivered = [e for batch in batches for e in batch]
+    assert len(delivered) == 800
+    for n in range(4):
+        assert [e.data['message'] for e in delivered if e.source == f'worker-{n}'] == [str(i) for i in range(200)]
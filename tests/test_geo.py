@@ -0,0 +1,87 @@
+import logging
+
+import numpy as np
+
+from app.core.geo import Gazetteer, KDTree, LocationFilter, get_gazetteer, haversine_miles
+
+PLACES = (
+    "city,state,zip,latitude,longitude\n"
+    "Springfield,IL,62701,39.7817,-89.6501\n"
+    "Springfield,MO,65806,37.2090,-93.2923\n"
+    "St. Louis,MO,63101,38.6270,-90.1994\n"
+    "Austin,TX,78701,30.2672,-97.7431\n"
+    "Round Rock,TX,78664,30.5083,-97.6789\n"
+)
+
+
+def small_gazetteer(tmp_path):
+    path = tmp_path / 'places.csv'
+    path.write_text(PLACES, encoding='utf-8')
+    return Gazetteer(str(path))
+
+
+def test_lookup_by_zip_and_zip3(tmp_path):
+    gazetteer = small_gazetteer(tmp_path)
+
+    assert gazetteer.by_zip['78664'].city == 'Round Rock'
+    assert gazetteer.by_zip3['787'].city == 'Austin'
+    assert gazetteer.lookup('Austin, TX 78664').city == 'Round Rock'
+    # An unlisted ZIP falls back to the first place of its 3-digit prefix
+    assert gazetteer.lookup('78799').city == 'Austin'
+    assert gazetteer.lookup('99999') is None
+
+
+def test_lookup_by_name(tmp_path):
+    gazetteer = small_gazetteer(tmp_path)
+
+    assert gazetteer.by_name[('st louis', 'mo')].zip == '63101'
+    assert gazetteer.lookup('Saint Louis, Missouri').zip == '63101'
+    assert gazetteer.lookup('Springfield, MO').zip == '65806'
+    # Without a state the first listed place of that name is used
+    assert gazetteer.lookup('Springfield').zip == '62701'
+    assert gazetteer.lookup('Gotham, NY') is None
+
+
+def test_kdtree_radius_query_matches_brute_force():
+    rng = np.random.default_rng(7)
+    points = rng.normal(size=(500, 3))
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    tree = KDTree(points)
+
+    for center in points[:20]:
+        for radius in (0.05, 0.3, 1.0):
+            expected = np.flatnonzero(((points - center) ** 2).sum(axis=1) <= radius * radius)
+            assert sorted(tree.query_radius(center, radius)) == expected.tolist()
+
+
+def test_places_within_matches_haversine():
+    gazetteer = get_gazetteer()
+    austin = gazetteer.lookup('Austin, TX')
+
+    found = {place.index for place in gazetteer.places_within(austin, 200)}
+
+    expected = {place.index for place in gazetteer.places
+                if haversine_miles(austin.latitude, austin.longitude, place.latitude, place.longitude) <= 200}
+    assert found == expected
+    assert austin.index in found
+
+
+def test_unknown_locations_are_counted_and_optionally_rejected(tmp_path, caplog):
+    gazetteer = small_gazetteer(tmp_path)
+    logger = logging.getLogger('test_geo')
+    accepting = LocationFilter(['Austin, TX'], 25, gazetteer, logger=logger)
+    rejecting = LocationFilter(['Austin, TX'], 25, gazetteer, accept_unknown=False)
+
+    with caplog.at_level(logging.INFO, logger='test_geo'):
+        assert accepting.matches('Gotham, NY')
+        assert accepting.matches('Gotham, NY')
+    assert not rejecting.matches('Gotham, NY')
+    assert accepting.matches('Round Rock, TX') and rejecting.matches('Round Rock, TX')
+    assert not rejecting.matches('St. Louis, MO')
+    # A bare tag names no place, so it is not reported as missing from the gazetteer
+    assert not rejecting.matches('Hybrid')
+
+    assert accepting.unresolved == {'Gotham, NY': 2}
+    assert rejecting.unresolved == {'Gotham, NY': 1}
+    # Logged once per location, not once per job
+    assert len([r for r in caplog.records if 'Gotham' in r.getMessage()]) == 1
@@ -0,0 +1,57 @@
+import logging
+import smtplib
+
+from app.core.gmail_monitor import GmailMonitor
+
+
+def make_monitor(tmp_path, outcomes, **gmail):
+    """Monitor whose replies to a@example.com fail with the given exceptions in turn."""
+    config = {'gmail': {'email': 'me@example.com', 'checkpoint_dir': str(tmp_path), **gmail}}
+    monitor = GmailMonitor(config, logging.getLogger('test'))
+    sent = []
+
+    def send(reply):
+        if reply['to'] == 'a@example.com' and outcomes:
+            raise outcomes.pop(0)
+        sent.append(reply['to'])
+
+    monitor._send_reply = send
+    return monitor, sent
+
+
+def reply(to):
+    return {'to': to, 'subject': 'Re: job', 'message_id': f'<{to}>', 'body': 'Thanks'}
+
+
+def test_permanent_failure_drops_reply(tmp_path):
+    monitor, sent = make_monitor(tmp_path, [smtplib.SMTPDataError(550, b'mailbox unavailable')])
+    monitor.queued_replies = [reply('a@example.com'), reply('b@example.com')]
+
+    monitor.send_queued_replies()
+
+    assert sent == ['b@example.com']
+    assert monitor.queued_replies == []
+
+
+def test_transient_failure_is_retried_then_dropped(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('app.core.gmail_monitor.time.time', lambda: now[0])
+    failure = smtplib.SMTPDataError(451, b'try again later')
+    monitor, sent = make_monitor(tmp_path, [failure] * 3, reply_max_attempts=3)
+    monitor.queued_replies = [reply('a@example.com'), reply('b@example.com')]
+
+    monitor.send_queued_replies()
+    # The failed reply waits for its backoff without holding up the others
+    assert sent == ['b@example.com']
+    assert monitor.queued_replies[0]['attempts'] == 1
+    monitor.send_queued_replies()
+    assert monitor.queued_replies[0]['attempts'] == 1
+
+    now[0] += 60
+    monitor.send_queued_replies()
+    assert monitor.queued_replies[0]['attempts'] == 2
+    now[0] += 120
+    monitor.send_queued_replies()
+    assert monitor.queued_replies == []
+    assert sent == ['b@example.com']
+    assert monitor.checkpoint.load()['replies'] == []
@@ -0,0 +1,42 @@
+import logging
+
+import requests
+
+from app.utils.http import HttpTransport, RetryBudget
+
+
+def make_transport(monkeypatch, *responses, **kwargs):
+    transport = HttpTransport(logging.getLogger('test'), **kwargs)
+    sent = []
+
+    def request(method, url, **request_kwargs):
+        sent.append(url)
+        return responses[min(len(sent), len(responses)) - 1]
+
+    monkeypatch.setattr(transport.session, 'request', request)
+    monkeypatch.setattr('app.utils.http.time.sleep', lambda delay: None)
+    return transport, sent
+
+
+def response(status, retry_after=None):
+    result = requests.Response()
+    result.status_code = status
+    if retry_after is not None:
+        result.headers['Retry-After'] = retry_after
+    return result
+
+
+def test_long_retry_after_is_not_waited_for(monkeypatch):
+    transport, sent = make_transport(monkeypatch, response(429, '3600'), max_retry_after=60)
+    budget = RetryBudget(5)
+
+    assert transport.get('https://api.example.com/jobs', budget=budget).status_code == 429
+    assert len(sent) == 1
+    assert budget.spent == 0
+
+
+def test_short_retry_after_is_retried(monkeypatch):
+    transport, sent = make_transport(monkeypatch, response(503, '2'), response(200), max_retry_after=60)
+
+    assert transport.get('https://api.example.com/jobs').status_code == 200
+    assert len(sent) == 2
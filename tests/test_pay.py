@@ -0,0 +1,97 @@
+import math
+import random
+from array import array
+
+import numpy as np
+
+from app.core.job_record import JobRecord, StringTable
+from app.core.job_store import JobStore
+from app.core.pay import PayIntervalIndex, annualize, annualize_batch, annualize_codes
+
+NAN = float('nan')
+
+
+def test_annualize_batch_matches_annualize():
+    pay_min = [40, None, 5000, 120000, None, 30, 25]
+    pay_max = [60, 90000, None, 150000, None, 45, 35]
+    periods = ['hour', 'year', 'month', None, 'year', 'fortnight', 'HOURLY']
+
+    annual_min, annual_max = annualize_batch(pay_min, pay_max, periods)
+
+    for i, row in enumerate(zip(pay_min, pay_max, periods)):
+        expected_min, expected_max = annualize(*row)
+        if expected_min is None:
+            assert math.isnan(annual_min[i]) and math.isnan(annual_max[i])
+        else:
+            assert (annual_min[i], annual_max[i]) == (expected_min, expected_max)
+    # An unknown period is guessed from the amount, like a missing one
+    assert annual_max[5] == 45 * 2080
+
+
+def test_annualize_codes_handles_missing_and_unknown_periods():
+    strings = StringTable()
+    codes = array('i', [strings.code('hour'), -1, strings.code('per fortnight'), strings.code('year'), -1])
+    pay_min = array('d', [50, 8000, 3000, NAN, NAN])
+    pay_max = array('d', [70, NAN, 4000, 200000, NAN])
+
+    annual_min, annual_max = annualize_codes(pay_min, pay_max, codes, strings)
+
+    assert annual_min[:4].tolist() == [50 * 2080, 8000 * 12, 3000 * 12, 200000]
+    assert annual_max[:4].tolist() == [70 * 2080, 8000 * 12, 4000 * 12, 200000]
+    assert np.isnan(annual_min[4]) and np.isnan(annual_max[4])
+
+
+def random_ranges(count, seed):
+    rng = random.Random(seed)
+    ids, low, high = [], [], []
+    for i in range(count):
+        ids.append(f'job-{i}')
+        if rng.random() < 0.1:
+            low.append(NAN)
+            high.append(NAN)
+            continue
+        start = rng.uniform(30000, 250000)
+        low.append(start)
+        high.append(start + rng.choice([0, rng.uniform(0, 80000)]))
+    return ids, np.array(low), np.array(high)
+
+
+def test_interval_queries_match_brute_force():
+    ids, low, high = random_ranges(2000, seed=3)
+    index = PayIntervalIndex(ids, low, high)
+    known = ~np.isnan(low)
+
+    assert len(index) == int(known.sum())
+    for query_low, query_high in [(0, 10), (100000, 100000), (120000, 140000), (200000, 400000), (0, 1e9)]:
+        expected = {ids[i] for i in np.flatnonzero(known & (low <= query_high) & (high >= query_low))}
+        found = index.overlapping(query_low, query_high)
+        assert len(found) == len(set(found))
+        assert set(found) == expected
+    for amount in (50000, 150000, 400000):
+        assert set(index.min_pay_at_least(amount)) == {ids[i] for i in np.flatnonzero(known & (low >= amount))}
+        assert set(index.max_pay_at_least(amount)) == {ids[i] for i in np.flatnonzero(known & (high >= amount))}
+
+
+def test_empty_index_answers_queries():
+    index = PayIntervalIndex(['a'], [NAN], [NAN])
+
+    assert len(index) == 0
+    assert index.overlapping(0, 1e9) == []
+    assert index.min_pay_at_least(0) == []
+
+
+def test_store_pay_queries_see_new_jobs():
+    store = JobStore(':memory:')
+    store.add_jobs([
+        JobRecord('hourly', pay_min=40.0, pay_max=60.0, pay_period='hour'),
+        JobRecord('yearly', pay_min=90000.0, pay_max=110000.0, pay_period='year'),
+        JobRecord('unpaid'),
+    ])
+
+    assert set(store.jobs_paying_at_least(100000)) == {'hourly', 'yearly'}
+    assert store.jobs_paying_between(115000, 120000) == ['hourly']
+
+    store.add_jobs([JobRecord('monthly', pay_min=15000.0, pay_period='month')])
+
+    assert set(store.jobs_paying_at_least(150000)) == {'monthly'}
+    store.close()
@@ -0,0 +1,45 @@
+import logging
+import threading
+
+from app.utils import profiling
+from app.utils.profiling import Profiler
+
+
+def busy_stage(n):
+    profiling.checkpoint()
+    return sum(i * i for i in range(n))
+
+
+def run_in_worker(n):
+    worker = threading.Thread(target=busy_stage, args=(n,), name='search-worker')
+    worker.start()
+    worker.join()
+
+
+def test_cprofile_sessions_can_be_restarted(tmp_path):
+    profiler = Profiler({'profiling': {'mode': 'cprofile'}}, logging.getLogger('test'), log_dir=tmp_path)
+
+    reports = []
+    for _ in range(2):
+        profiler.start()
+        assert profiler.running
+        busy_stage(20000)
+        run_in_worker(20000)
+        reports.append(profiler.stop())
+        assert not profiler.running
+    # The main thread detaches from the stopped session at its next checkpoint
+    profiling.checkpoint()
+
+    for path in reports:
+        text = path.read_text()
+        # Calls made after the checkpoint in busy_stage
+        assert 'test_profiling.py' in text
+        assert path.with_suffix('.pstats').exists()
+    assert reports[0] != reports[1]
+
+
+def test_stop_without_a_session_writes_nothing(tmp_path):
+    profiler = Profiler({}, logging.getLogger('test'), log_dir=tmp_path)
+
+    assert profiler.stop() is None
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,15 @@
+import pytest
+
+from app.utils.rate_limit import TokenBucket
+
+
+def test_acquire_more_than_capacity_raises():
+    bucket = TokenBucket(rate=10, capacity=5)
+
+    with pytest.raises(ValueError):
+        bucket.acquire(6)
+    assert bucket.acquire(5)
+
+
+def test_unlimited_bucket_grants_any_amount():
+    assert TokenBucket(rate=0).acquire(100)
@@ -0,0 +1,107 @@
+import logging
+
+import pytest
+
+from app.core.gmail_monitor import GmailMonitor
+from app.core.ziprecruiter_client import ZipRecruiterClient
+from benchmarks.fakes import gmail_server, ziprecruiter_server
+from benchmarks.fakes.common import FaultInjector, start_in_thread
+
+
+@pytest.fixture
+def gmail(tmp_path):
+    servers = gmail_server.create_servers(size=40, job_ratio=0.5)
+    for server in servers.values():
+        start_in_thread(server)
+    imap_host, imap_port = servers['imap'].server_address
+    smtp_host, smtp_port = servers['smtp'].server_address
+    config = {'gmail': {
+        'email': 'candidate@example.com', 'password': 'secret',
+        'imap_host': imap_host, 'imap_port': imap_port, 'imap_ssl': False,
+        'smtp_host': smtp_host, 'smtp_port': smtp_port, 'smtp_starttls': False,
+        'auto_reply': True, 'response_template': 'Thank you for reaching out.',
+        'initial_sync_days': 36500, 'fetch_batch_size': 15, 'checkpoint_dir': str(tmp_path),
+    }}
+    monitor = GmailMonitor(config, logging.getLogger('test'))
+    yield monitor, servers
+    monitor._disconnect()
+    for server in servers.values():
+        server.shutdown()
+        server.server_close()
+
+
+def test_scan_finds_job_emails_and_replies_once(gmail):
+    monitor, servers = gmail
+
+    jobs = monitor.scan_emails()
+
+    assert jobs and all(job['is_job'] for job in jobs)
+    assert monitor.last_uid == 40
+    answered = [job for job in jobs if job['reply_to'] and job['reply_to'] != 'candidate@example.com']
+    assert servers['smtp'].messages_received == len(answered)
+    # The next scan only lists messages that arrived since
+    assert monitor.fetch_new_message_uids() == []
+    assert monitor.scan_emails() == []
+    assert servers['smtp'].messages_received == len(answered)
+
+
+def test_fetch_messages_returns_raw_messages_by_uid(gmail):
+    monitor, servers = gmail
+
+    messages = monitor.fetch_messages([3, 1, 2])
+
+    assert sorted(uid for uid, _ in messages) == [1, 2, 3]
+    assert all(raw == servers['imap'].mailbox.raw(uid) for uid, raw in messages)
+
+
+@pytest.fixture
+def ziprecruiter(tmp_path):
+    servers = ziprecruiter_server.create_servers(jobs_per_query=45)
+    server = servers['ziprecruiter']
+    start_in_thread(server)
+    host, port = server.server_address
+    config = {'ziprecruiter': {
+        'api_base_url': f'http://{host}:{port}', 'keywords': ['python'], 'locations': ['Austin, TX'],
+        'jobs_per_page': 20, 'max_pages': 5, 'checkpoint_dir': str(tmp_path),
+    }}
+    client = ZipRecruiterClient(config, logging.getLogger('test'))
+    yield client, server
+    server.shutdown()
+    server.server_close()
+
+
+def test_search_sweep_pages_through_results_once(ziprecruiter):
+    client, server = ziprecruiter
+
+    jobs = client.run_search_sweep()
+
+    assert len(jobs) == 45
+    assert len({job['id'] for job in jobs}) == 45
+    # Three pages, the last one short
+    assert server.requests == 3
+    assert client.run_search_sweep() == []
+
+
+def test_search_retries_rate_limited_requests(ziprecruiter):
+    client, server = ziprecruiter
+    server.faults = FaultInjector(rate_limit=2)
+
+    jobs = client.run_search_sweep()
+
+    assert len(jobs) == 45
+    assert server.rate_limited >= 1
+
+
+def test_checkpoint_keeps_the_most_recent_seen_postings(ziprecruiter):
+    client, _ = ziprecruiter
+    client.max_seen_jobs = 30
+
+    jobs = client.run_search_sweep()
+
+    assert len(jobs) == 45
+    assert list(client.seen_job_ids) == [job['id'] for job in jobs[-30:]]
+    assert client.checkpoint.load()['seen_job_ids'] == [job['id'] for job in jobs[-30:]]
+
+    client.run_search_sweep()
+
+    assert len(client.seen_job_ids) == 30
@@ -0,0 +1,74 @@
+import pytest
+
+from app.core.templates import TemplateError, compile_template, render_batch, reply_context
+
+
+def test_fields_defaults_and_literal_braces():
+    render = compile_template("Hi {name|there}, the {role} role at {company} ({{pay}}: {pay|n/a}).")
+
+    assert render({'name': 'Alex', 'role': 'Backend', 'company': 'Acme', 'pay': '$150,000'}) == \
+        "Hi Alex, the Backend role at Acme ({pay}: $150,000)."
+    # Missing and empty values fall back to the default
+    assert render({'role': 'Backend', 'company': 'Acme', 'name': ''}) == \
+        "Hi there, the Backend role at Acme ({pay}: n/a)."
+
+
+def test_templates_are_compiled_once():
+    template = "Dear {full_name|hiring team},"
+
+    assert compile_template(template) is compile_template(template)
+    assert render_batch(template, [{'full_name': 'Alex Smith'}, {}]) == ["Dear Alex Smith,", "Dear hiring team,"]
+    assert compile_template("")({}) == ""
+
+
+@pytest.mark.parametrize('template, message', [
+    ("Hi {recruiter}", "Unknown reply template field 'recruiter'"),
+    ("Hi {__class__}", "Unknown reply template field '__class__'"),
+    ("Hi {name", "Unmatched '{'"),
+    ("Hi name}", "Unmatched '}'"),
+    ("Hi {Name}", "Unmatched '{'"),
+])
+def test_malformed_templates_are_rejected(template, message):
+    with pytest.raises(TemplateError, match=message):
+        compile_template(template)
+
+
+@pytest.mark.parametrize('template', [
+    "'); open('marker', 'w') #",
+    '" + str(open("marker", "w")) + "',
+    "{name|'); open('marker', 'w') #}",
+    "{name|\\'),open('marker', 'w'),('}",
+    "\\x27 \\\\ \n\t {{'}} \"\"\" ''' open('marker', 'w')",
+])
+def test_template_text_is_never_executed(template, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    rendered = compile_template(template)({})
+
+    assert not (tmp_path / 'marker').exists()
+    # Literal text comes out unchanged, a default is used for the missing name
+    expected = template.replace('{{', '{').replace('}}', '}')
+    if template.startswith('{name|'):
+        expected = template[len('{name|'):-1]
+    assert rendered == expected
+
+
+def test_render_has_no_builtins():
+    render = compile_template("{name}")
+
+    assert render.__globals__['__builtins__'] == {}
+    # Values are inserted as they are, never evaluated
+    assert render({'name': "__import__('os')"}) == "__import__('os')"
+
+
+def test_reply_context_from_an_analysis():
+    context = reply_context({
+        'from': '"Alex Smith" <alex@careers.globex.com>', 'subject': 'Re: Data Engineer opportunity at Globex',
+        'pay': (60.0, 75.5, 'hour'), 'location': 'Remote',
+    })
+
+    assert context['name'] == 'Alex'
+    assert context['full_name'] == 'Alex Smith'
+    assert (context['role'], context['company']) == ('Data Engineer', 'Globex')
+    assert context['pay'] == '$60 - $75.50 per hour'
+    assert context['employment_type'] == ''